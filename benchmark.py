@@ -0,0 +1,464 @@
+# --- Standard Libraries ---
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# --- Cards ---
+from merge_sim.cards import (
+    Card,
+    CARD_STATS
+)
+from merge_sim.deck import DeckManager
+
+# --- Combat ---
+from merge_sim.battle import Battle, DEFAULT_DT, DEFAULT_MAX_TIME
+from merge_sim.batch_combat import simulate_combat_batched
+
+# --- Combat / Player Units ---
+from merge_sim.player import Player
+from merge_sim.combat_unit import CombatUnit
+
+# --- Random Streams ---
+from merge_sim.rng import RandomStream, DECK_STREAM, PLAYER_STREAM, BATTLE_STREAM
+
+# --- Game Snapshots ---
+from merge_sim.snapshot import GameSnapshot
+
+# --- Game Loop ---
+from main_sim import create_players, play_round
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_SEED = 0
+BATTLE_ROUND = 6        # Round passed to benchmark battles (goblin rewards, bench size)
+MAX_ROUNDS = 20         # Same cap as main_sim
+MEMORY_SAMPLES = 5      # Matchups per scenario re-run under tracemalloc for peak memory
+BATCH_MEMORY_SAMPLE = 64  # Matchups in the one batch re-run under tracemalloc
+BATCH_OBJECT_SAMPLE = 256  # Matchups the object engine plays for the batched scenario's comparison
+SNAPSHOT_ROUNDS = 4     # Rounds played before the snapshot scenario's mid-game state is captured
+
+# --- Boards ---
+SPLASH_BOARD = [("bomber", 2), ("valkyrie", 2), ("executioner", 2), ("princess", 2), ("bomber", 2), ("valkyrie", 2)]
+SWARM_BOARD = [("knight", 2), ("barbarian", 2), ("goblin", 2), ("prince", 2), ("skeleton-king", 2), ("giant-skeleton", 2)]
+
+# Six units have 12 trait slots but the traits need 26 to all activate, so
+# no single matchup can have every synergy on. These three boards have 4-5
+# synergies each and 11 between them, so playing every pairing covers them all.
+LATE_GAME_BOARDS = [
+    [("archer", 3), ("barbarian", 3), ("giant-skeleton", 3), ("mega-knight", 3), ("skeleton-king", 3), ("pekka", 3)],
+    [("archer", 3), ("princess", 3), ("golden-knight", 3), ("goblin", 3), ("dart-goblin", 3), ("royal-ghost", 3)],
+    [("valkyrie", 3), ("archer-queen", 3), ("spear-goblin", 3), ("executioner", 3), ("bomber", 3), ("bandit", 3)],
+]
+
+
+# Two boards the batched kernel runs whole: supported units only, no Clan pair or other mid-combat synergy
+BATCH_BOARDS = [
+    [("knight", 2), ("archer", 2), ("bomber", 2), ("goblin", 2)],
+    [("pekka", 2), ("princess", 2), ("dart-goblin", 2), ("valkyrie", 2)],
+]
+
+
+def duel_matchups(repeats):
+    """One 2-star unit of each card against its mirror."""
+    return [([(name, 2)], [(name, 2)]) for name in CARD_STATS for _ in range(repeats)]
+
+
+def splash_matchups(repeats):
+    """Splash attackers against a clumped melee front line, from both sides."""
+    return [(SPLASH_BOARD, SWARM_BOARD), (SWARM_BOARD, SPLASH_BOARD)] * repeats
+
+
+def late_game_matchups(repeats):
+    """Full 6v6 3-star boards, every pairing of LATE_GAME_BOARDS."""
+    pairings = [(LATE_GAME_BOARDS[i], LATE_GAME_BOARDS[j])
+                for i in range(len(LATE_GAME_BOARDS)) for j in range(len(LATE_GAME_BOARDS)) if i != j]
+    return pairings * repeats
+
+
+def batched_matchups(repeats):
+    """BATCH_BOARDS against each other from both sides, all run in one batched kernel call."""
+    return [(BATCH_BOARDS[0], BATCH_BOARDS[1]), (BATCH_BOARDS[1], BATCH_BOARDS[0])] * repeats
+
+
+def build_players(board, opponent_board, rng):
+    """
+    Places two boards on fresh players, exactly as the shop would leave them.
+
+    Args:
+        board (list): (card name, star) pairs for the first player.
+        opponent_board (list): (card name, star) pairs for the second player.
+        rng (RandomStream): Stream for the deck and both players' placements.
+
+    Returns:
+        list: The two players, set as each other's opponent.
+    """
+    deck = DeckManager(rng.derive(DECK_STREAM))
+    players = [Player("Home", deck, None, rng.derive(PLAYER_STREAM, 0)),
+               Player("Away", deck, None, rng.derive(PLAYER_STREAM, 1))]
+    for player, units in zip(players, (board, opponent_board)):
+        for name, star in units:
+            unit = CombatUnit(None, None, Card(name, CARD_STATS[name], star), owner=player)
+            player.field.append(unit)
+            player.place_on_grid_random(unit)
+    players[0].opponent, players[1].opponent = players[1], players[0]
+    return players
+
+
+def run_battle(players, rng, event_driven):
+    """
+    Runs one battle through setup (which combines the grids), run and finish.
+
+    Returns:
+        int: Steps the battle took.
+    """
+    battle = Battle(players, BATTLE_ROUND, rng)
+    if battle.setup():
+        battle.run(DEFAULT_DT, DEFAULT_MAX_TIME, event_driven)
+        battle.finish()
+    return battle.steps
+
+
+def run_game(rng, event_driven):
+    """
+    Plays one headless 4-player game with the standard bots.
+
+    Returns:
+        tuple: (rounds played, battles fought)
+    """
+    players = create_players(rng)
+    rounds = battles = 0
+    for round_num in range(1, MAX_ROUNDS + 1):
+        alive = sum(1 for p in players if p.hp > 0)
+        if not play_round(players, round_num, headless=True, event_driven=event_driven, rng=rng):
+            break
+        rounds += 1
+        battles += alive // 2
+    return rounds, battles
+
+
+def peak_kib(run, samples):
+    """Largest tracemalloc peak, in KiB, over calling run(sample) for each sample."""
+    tracemalloc.start()
+    peak = 0
+    try:
+        for sample in samples:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            run(sample)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - start)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def bench_battles(matchups, stream, event_driven):
+    """
+    Times the combat path of every matchup, then re-runs a few under tracemalloc.
+
+    Player construction is not timed; everything from Battle() to finish() is.
+
+    Args:
+        matchups (list): (board, opponent_board) pairs.
+        stream (RandomStream): Scenario stream; matchup i uses stream.derive(i).
+        event_driven (bool): Use the event-driven engine instead of fixed steps.
+
+    Returns:
+        dict: Metrics for the scenario.
+    """
+    def prepare(i):
+        rng = stream.derive(i)
+        board, opponent_board = matchups[i]
+        return build_players(board, opponent_board, rng), rng.derive(BATTLE_STREAM)
+
+    seconds = 0.0
+    ticks = 0
+    for i in range(len(matchups)):
+        players, battle_rng = prepare(i)
+        start = time.perf_counter()
+        ticks += run_battle(players, battle_rng, event_driven)
+        seconds += time.perf_counter() - start
+
+    prepared = [prepare(i) for i in range(min(MEMORY_SAMPLES, len(matchups)))]
+    peak = peak_kib(lambda sample: run_battle(*sample, event_driven), prepared)
+
+    return {
+        "battles": len(matchups),
+        "ticks": ticks,
+        "seconds": round(seconds, 4),
+        "battles_per_sec": round(len(matchups) / seconds, 2),
+        "ticks_per_sec": round(ticks / seconds, 1),
+        "mean_tick_us": round(seconds / ticks * 1e6, 2),
+        "peak_kib": peak,
+    }
+
+
+def bench_batched(matchups, stream, event_driven):
+    """
+    Times every matchup in one simulate_combat_batched call, then the first BATCH_OBJECT_SAMPLE of them one by one
+    on the object engine. The kernel's throughput grows with the batch, so the batch is much larger than the sample.
+
+    The kernel only runs fixed steps; event_driven applies to the object-engine comparison.
+
+    Args:
+        matchups (list): (board, opponent_board) pairs the kernel supports.
+        stream (RandomStream): Scenario stream; matchup i places its boards from stream.derive(i).
+        event_driven (bool): Use the event-driven engine for the object-engine comparison.
+
+    Returns:
+        dict: Metrics for the scenario.
+    """
+    def prepare(count):
+        return [build_players(board, opponent_board, stream.derive(i))
+                for i, (board, opponent_board) in enumerate(matchups[:count])]
+
+    pairs = prepare(len(matchups))
+    start = time.perf_counter()
+    simulate_combat_batched(pairs, BATTLE_ROUND, rng=stream)
+    seconds = time.perf_counter() - start
+
+    object_seconds = 0.0
+    object_battles = min(BATCH_OBJECT_SAMPLE, len(matchups))
+    for i, players in enumerate(prepare(object_battles)):
+        start = time.perf_counter()
+        run_battle(players, stream.derive(BATTLE_STREAM, i), event_driven)
+        object_seconds += time.perf_counter() - start
+
+    sample = prepare(min(BATCH_MEMORY_SAMPLE, len(matchups)))
+    peak = peak_kib(lambda pairs: simulate_combat_batched(pairs, BATTLE_ROUND, rng=stream), [sample])
+
+    return {
+        "battles": len(matchups),
+        "seconds": round(seconds, 4),
+        "battles_per_sec": round(len(matchups) / seconds, 2),
+        "object_battles_per_sec": round(object_battles / object_seconds, 2),
+        "speedup": round(object_seconds / object_battles * len(matchups) / seconds, 2),
+        "peak_kib": peak,
+    }
+
+
+def bench_games(games, stream, event_driven):
+    """
+    Times whole headless games, shop phases included.
+
+    Battles run inside play_round, so per-tick numbers are not available here.
+
+    Returns:
+        dict: Metrics for the scenario.
+    """
+    seconds = 0.0
+    rounds = battles = 0
+    for i in range(games):
+        start = time.perf_counter()
+        game_rounds, game_battles = run_game(stream.derive(i), event_driven)
+        seconds += time.perf_counter() - start
+        rounds += game_rounds
+        battles += game_battles
+
+    peak = peak_kib(lambda i: run_game(stream.derive(i), event_driven), range(min(MEMORY_SAMPLES, games)))
+
+    return {
+        "games": games,
+        "rounds": rounds,
+        "battles": battles,
+        "seconds": round(seconds, 4),
+        "games_per_sec": round(games / seconds, 3),
+        "battles_per_sec": round(battles / seconds, 2),
+        "peak_kib": peak,
+    }
+
+
+def bench_rng(draws, stream, event_driven):
+    """
+    Times single draws from a RandomStream, one call per roll as crits and goblin rewards make them,
+    against a plain random.Random, plus the getstate()/setstate() round trip every game snapshot makes:
+    once with nothing drawn in between (the cached state is reused) and once with a draw in between.
+
+    Returns:
+        dict: Metrics for the scenario.
+    """
+    def draw_ns(rng):
+        rng.random()    # Leave any snapshot state behind, as a battle's first roll does
+        draw = rng.random
+        start = time.perf_counter()
+        for _ in range(draws):
+            draw()
+        return round((time.perf_counter() - start) / draws * 1e9, 1)
+
+    def round_trip_us(rng, draw_between):
+        round_trips = max(1, draws // 100)
+        start = time.perf_counter()
+        for _ in range(round_trips):
+            state = rng.getstate()
+            if draw_between:
+                rng.random()
+            rng.setstate(state)
+        return round((time.perf_counter() - start) / round_trips * 1e6, 2)
+
+    rng = stream.derive(0)
+    return {
+        "draws": draws,
+        "draw_ns": draw_ns(rng),
+        "reference_draw_ns": draw_ns(random.Random(0)),
+        "state_round_trip_us": round_trip_us(rng, False),
+        "drawn_round_trip_us": round_trip_us(rng, True),
+    }
+
+
+def bench_snapshot(takes, stream, event_driven):
+    """
+    Times GameSnapshot take() and restore() on a mid-game 4-player state, as a search bot makes them between
+    shop decisions: first with no stream drawn in between, then with every stream drawing once before each
+    restore, the worst case, where each twister state has to be copied again.
+
+    Returns:
+        dict: Metrics for the scenario.
+    """
+    players = create_players(stream)
+    for round_num in range(1, SNAPSHOT_ROUNDS + 1):
+        play_round(players, round_num, headless=True, event_driven=event_driven, rng=stream)
+    snapshot = GameSnapshot(players, stream)
+    streams = [stream, players[0].deck_manager.rng] + [player.rng for player in players]
+
+    start = time.perf_counter()
+    for _ in range(takes):
+        state = snapshot.take()
+    take_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(takes):
+        snapshot.restore(state)
+    restore_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(takes):
+        for rng in streams:
+            rng.random()
+        snapshot.restore(state)
+    drawn_seconds = time.perf_counter() - start
+
+    return {
+        "takes": takes,
+        "takes_per_sec": round(takes / take_seconds),
+        "restores_per_sec": round(takes / restore_seconds),
+        "drawn_restores_per_sec": round(takes / drawn_seconds),
+    }
+
+
+# name -> (benchmark, matchup builder or None, repeats); without a builder the benchmark gets the repeat count
+SCENARIOS = {
+    "duel": (bench_battles, duel_matchups, 5),
+    "splash": (bench_battles, splash_matchups, 25),
+    "late_game": (bench_battles, late_game_matchups, 10),
+    "full_game": (bench_games, None, 5),
+    "batched": (bench_batched, batched_matchups, 2048),
+    "rng": (bench_rng, None, 1_000_000),
+    "snapshot": (bench_snapshot, None, 20_000),
+}
+
+
+def run_benchmarks(seed=DEFAULT_SEED, event_driven=False, scale=1.0, only=None):
+    """
+    Runs every scenario (or just `only`) from a fixed seed.
+
+    Args:
+        seed (int): Root seed; scenario i uses RandomStream(seed).derive(i).
+        event_driven (bool): Use the event-driven engine instead of fixed steps.
+        scale (float): Multiplier on each scenario's repeat count.
+        only (list, optional): Scenario names to run.
+
+    Returns:
+        dict: {"meta": {...}, "scenarios": {name: metrics}}
+    """
+    root = RandomStream(seed)
+    results = {}
+    for index, (name, (benchmark, matchup_builder, repeats)) in enumerate(SCENARIOS.items()):
+        if only and name not in only:
+            continue
+        repeats = max(1, int(repeats * scale))
+        stream = root.derive(index)
+        start = time.perf_counter()
+        results[name] = benchmark(matchup_builder(repeats) if matchup_builder else repeats, stream, event_driven)
+        print(f"  {name}: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    meta = {
+        "seed": seed,
+        "event_driven": event_driven,
+        "scale": scale,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "scenarios": results}
+
+
+# Metrics shown in the report; True where a higher number is better
+REPORT_METRICS = {
+    "battles_per_sec": True,
+    "ticks_per_sec": True,
+    "mean_tick_us": False,
+    "games_per_sec": True,
+    "object_battles_per_sec": True,
+    "speedup": True,
+    "draw_ns": False,
+    "reference_draw_ns": False,
+    "state_round_trip_us": False,
+    "drawn_round_trip_us": False,
+    "takes_per_sec": True,
+    "restores_per_sec": True,
+    "drawn_restores_per_sec": True,
+    "peak_kib": False,
+}
+
+
+def format_report(results, baseline=None):
+    """
+    One line per scenario metric, with the change against a baseline if given.
+
+    Changes are signed so that positive always means faster or smaller.
+    """
+    lines = []
+    for name, metrics in results["scenarios"].items():
+        base = (baseline or {}).get("scenarios", {}).get(name, {})
+        for metric, higher_is_better in REPORT_METRICS.items():
+            if metric not in metrics:
+                continue
+            value = metrics[metric]
+            line = f"{name:<10} {metric:<24} {value:>12}"
+            if base.get(metric):
+                change = (value - base[metric]) / base[metric] * 100
+                if not higher_is_better:
+                    change = -change
+                line += f"   baseline {base[metric]:>12}   {change:+7.1f}%"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    # --- OPTIONS ---
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else DEFAULT_SEED
+    baseline_path = sys.argv[sys.argv.index("--baseline") + 1] if "--baseline" in sys.argv else DEFAULT_BASELINE
+    only = sys.argv[sys.argv.index("--only") + 1].split(",") if "--only" in sys.argv else None
+    event_driven = "--events" in sys.argv  # Benchmark the event-driven engine
+    scale = 0.2 if "--quick" in sys.argv else 1.0  # Fewer repeats, for a fast sanity check
+    save = "--save" in sys.argv  # Write this run as the new baseline instead of comparing
+
+    results = run_benchmarks(seed, event_driven, scale, only)
+
+    baseline = None
+    if not save and os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["seed"] != seed or baseline["meta"]["event_driven"] != event_driven:
+            print(f"⚠️  {baseline_path} was recorded with seed={baseline['meta']['seed']}, "
+                  f"event_driven={baseline['meta']['event_driven']}; the numbers are not comparable.")
+
+    print(format_report(results, baseline))
+
+    if save:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {baseline_path}")
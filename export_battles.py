@@ -0,0 +1,147 @@
+# --- Standard Libraries ---
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Render offscreen: no window, no display needed (workers inherit both)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# --- Pygame ---
+import pygame
+
+# --- NumPy ---
+import numpy as np
+
+# --- Replays ---
+from merge_sim.replay import Replay
+
+# --- Visualisation / Graphics ---
+from merge_sim.visualise import render_replay
+
+FORMATS = ("gif", "mp4", "avi", "png")  # png: a folder of numbered frames
+DEFAULT_FPS = 20
+
+
+def frame_array(surface):
+    """A surface as an (height, width, 3) RGB array."""
+    return pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+
+
+def write_gif(frames, path, fps):
+    from PIL import Image  # Pillow comes with ultralytics; only GIF export needs it
+
+    images = [Image.fromarray(frame_array(frame)).quantize(colors=128) for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=round(1000 / fps), loop=0)
+    return len(images)
+
+
+def write_video(frames, path, fps):
+    import cv2  # Same OpenCV build frame_splitter uses
+
+    fourcc = cv2.VideoWriter_fourcc(*("mp4v" if path.endswith(".mp4") else "MJPG"))
+    writer = None
+    count = 0
+    try:
+        for frame in frames:
+            rgb = frame_array(frame)
+            if writer is None:
+                writer = cv2.VideoWriter(path, fourcc, fps, (rgb.shape[1], rgb.shape[0]))
+                if not writer.isOpened():
+                    raise RuntimeError(f"OpenCV cannot write {path}")
+            writer.write(np.ascontiguousarray(rgb[:, :, ::-1]))  # RGB -> BGR
+            count += 1
+    finally:
+        if writer is not None:
+            writer.release()
+    return count
+
+
+def write_png_frames(frames, path, fps):
+    os.makedirs(path, exist_ok=True)
+    count = 0
+    for count, frame in enumerate(frames, 1):
+        pygame.image.save(frame, os.path.join(path, f"frame_{count:05d}.png"))
+    return count
+
+
+WRITERS = {"gif": write_gif, "mp4": write_video, "avi": write_video, "png": write_png_frames}
+
+
+def export_replay(replay_path, out_path, fmt="gif", fps=DEFAULT_FPS, speed=1.0):
+    """
+    Renders one replay file to a clip, without a window.
+
+    Args:
+        replay_path (str): A replay saved by `main_sim.py --headless --replays DIR`.
+        out_path (str): Output file, or folder for "png".
+        fmt (str): One of FORMATS.
+        fps (int): Frames per second of the clip; one frame per speed / fps simulated seconds.
+        speed (float): Simulated seconds per clip second.
+
+    Returns:
+        tuple: (out_path, frames written)
+    """
+    replay = Replay.load(replay_path)
+    return out_path, WRITERS[fmt](render_replay(replay, fps, speed), out_path, fps)
+
+
+def export_replays(replay_paths, out_dir, fmt="gif", fps=DEFAULT_FPS, speed=1.0, workers=None, progress=True):
+    """
+    Renders many replays to clips in out_dir over a process pool, one replay per task.
+
+    Args:
+        replay_paths (list): Replay files.
+        out_dir (str): Folder for the clips, named after their replays.
+        fmt (str): One of FORMATS.
+        fps (int): Frames per second of each clip.
+        speed (float): Simulated seconds per clip second.
+        workers (int, optional): Worker processes; os.cpu_count() if None, in-process if 1.
+        progress (bool): Print a line to stderr as each clip is written.
+
+    Returns:
+        list: (clip path, frames) per replay, in completion order.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {FORMATS}")
+    os.makedirs(out_dir, exist_ok=True)
+    extension = "" if fmt == "png" else "." + fmt
+    jobs = [(path, os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + extension))
+            for path in replay_paths]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = []
+
+    def collect(result):
+        results.append(result)
+        if progress:
+            print(f"  {len(results)}/{len(jobs)} {result[0]} ({result[1]} frames, "
+                  f"{time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+    if workers == 1:
+        for replay_path, out_path in jobs:
+            collect(export_replay(replay_path, out_path, fmt, fps, speed))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(export_replay, replay_path, out_path, fmt, fps, speed)
+                   for replay_path, out_path in jobs]
+        for future in as_completed(futures):
+            collect(future.result())
+    return results
+
+
+if __name__ == '__main__':
+    # --- OPTIONS ---
+    replay_dir = sys.argv[sys.argv.index("--replays") + 1] if "--replays" in sys.argv else "replays"
+    out_dir = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else os.path.join(replay_dir, "clips")
+    fmt = sys.argv[sys.argv.index("--format") + 1] if "--format" in sys.argv else "gif"
+    fps = int(sys.argv[sys.argv.index("--fps") + 1]) if "--fps" in sys.argv else DEFAULT_FPS
+    speed = float(sys.argv[sys.argv.index("--speed") + 1]) if "--speed" in sys.argv else 1.0
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+
+    replay_paths = sorted(glob.glob(os.path.join(replay_dir, "*.mtr")))
+    results = export_replays(replay_paths, out_dir, fmt, fps, speed, workers)
+    print(f"Exported {len(results)} battles ({sum(frames for _, frames in results)} frames) to {out_dir}")
@@ -1,429 +1,334 @@
 # --- Standard Libraries ---
-import random
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # --- Pygame ---
 import pygame
 
-# --- Globals / Shared State ---
-from merge_sim.constants import BOARD_ROWS, BOARD_COLS, bombs, rn
+# --- Event Log ---
+from merge_sim.event_log import log, ConsoleConsumer, JsonlConsumer, RingBufferConsumer, DEBUG, INFO, GAME
 
 # --- Cards ---
-from merge_sim.cards import (
-    Card,
-    CARD_STATS
-)
+from merge_sim.deck import DeckManager
 
-# --- Modifiers / Synergies ---
-from merge_sim.modifiers import (
-    ClanSynergyManager,
-    BrawlerSynergyManager,
-    NobleSynergyManager,
-    GoblinSynergyManager,
-    ThrowerSynergyManager,
-    UndeadSynergyManager,
-    AvengerSynergyManager,
-    RangerSynergyManager,
-    AceSynergyManager,
-    AssassinSynergyManager,
-    JuggernautSynergyManager
-)
+# --- Combat ---
+from merge_sim.battle import Battle, simulate_combat_headless, DEFAULT_DT, DEFAULT_MAX_TIME
+from merge_sim.matchup_pool import submit_matchup
+from merge_sim.combat_cache import CombatCache
 
 # --- Visualisation / Graphics ---
-from merge_sim.visualise import draw_grid, hex_to_pixel, PLAYER_COLOURS
+from merge_sim.visualise import (
+    draw_grid,
+    draw_projectiles,
+    draw_status,
+    hex_to_pixel,
+    PLAYER_COLOURS,
+    BOARD_VIEW_SIZE,
+    WIDTH,
+    HEIGHT,
+)
 
 # --- Combat / Player Units ---
-from merge_sim.combat_unit import spawn_skeleton
 from merge_sim.player import Player
 
 # --- Board / Hex Utilities ---
 from merge_sim.board_utils import (
-    get_occupied_positions,
     combine_grids,
     print_combined_grid
 )
-from merge_sim.hex_utils import (
-    hex_neighbors,
-    hex_distance,
-    find_path_bfs_to_range,
-)
 
 # --- Projectiles ---
 from merge_sim.projectile import Projectile
 
+# --- Simulation Clock ---
+from merge_sim.clock import FixedStepClock
+
+# --- Random Streams ---
+from merge_sim.rng import RandomStream, DECK_STREAM, PLAYER_STREAM, BATTLE_STREAM
+
 # --- Bots ---
 from merge_sim.player import get_player_colour
 from merge_sim.bot import *
 
 
-def simulate_and_visualize_combat_live(players):
+# Live viewer speeds (simulated seconds per real second), slowest first
+LIVE_SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16, 32)
+live_speed = 1  # Kept between battles, so a whole game can be watched at one speed
+MAX_FRAME_TIME = 0.1  # Real seconds one frame may simulate, so a slow frame cannot snowball
+
+class LiveControls:
+    """
+    Keyboard controls and frame pacing shared by the live viewers.
+
+    Space pauses, up/down (or right/left) change the speed between 0.25x and
+    32x, N or period steps a single tick, Enter or End skips to the end, and
+    Esc or closing the window quits. The speed is kept in the module's
+    live_speed, so a whole game can be watched at one speed.
+
+    Args:
+        tick (callable): Advances the battle (or every running battle) by one DEFAULT_DT tick.
+        running (callable): True while anything is left to simulate.
+    """
+
+    def __init__(self, tick, running):
+        self.tick = tick
+        self.running = running
+        self.paused = False
+        self.lag = 0.0  # Simulated seconds the renderer trails the battles by
+
+    def handle_events(self):
+        """
+        Applies the pending pygame events.
+
+        Returns:
+            bool: False once Esc was pressed or the window closed.
+        """
+        global live_speed
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return False
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key in (pygame.K_UP, pygame.K_RIGHT):
+                live_speed = min((s for s in LIVE_SPEEDS if s > live_speed), default=live_speed)
+            elif event.key in (pygame.K_DOWN, pygame.K_LEFT):
+                live_speed = max((s for s in LIVE_SPEEDS if s < live_speed), default=live_speed)
+            elif event.key in (pygame.K_n, pygame.K_PERIOD):
+                self.paused = True
+                self.lag = 0.0
+                self.tick()
+            elif event.key in (pygame.K_RETURN, pygame.K_END):
+                while self.running():
+                    self.tick()
+        return True
+
+    def advance(self, frame_time):
+        """Runs the ticks that frame_time real seconds cover at the current speed, unless paused."""
+        if self.paused:
+            return
+        self.lag += min(frame_time, MAX_FRAME_TIME) * live_speed
+        while self.lag >= DEFAULT_DT and self.running():
+            self.tick()
+            self.lag -= DEFAULT_DT
+
+    def status(self, render_time):
+        return f"{render_time:.2f}s   x{live_speed:g}" + ("   (paused)" if self.paused else "")
+
+def simulate_and_visualize_combat_live(players, round_number=None, rng=None):
     """
     Simulates a live combat round between two players and visualizes it using pygame.
     Restores all units to full HP before starting, places missing-position units,
     and shows debug information throughout the battle.
 
+    The battle runs on its own FixedStepClock, exactly as headless combat does,
+    and the renderer draws the latest state at display rate, so a seeded battle
+    has the same result at any speed. Projectiles follow simulation time,
+    interpolated between ticks. Controls are LiveControls'.
+
     Args:
         players (list): A list containing the two players.
+        round_number (int, optional): Current round, forwarded to end-of-combat synergies.
+        rng (RandomStream, optional): The battle's random stream; fresh entropy if None.
     
     Returns:
         tuple: ([], winner_player_object_or_None, remaining_units_count_or_None)
     """
-
-    if not players or len(players) < 2 or not players[0].opponent:
-        return [], None, None
-
-    # --- INITIAL UNIT RESET & PLACEMENT ---
-    for player in players:
-        for unit in player.field:
-            unit.restore_full_health()
-            if unit.row is None or unit.col is None:
-                player.place_on_grid_random(unit)
-
-    # --- COMBINE PLAYER GRIDS ---
-    p1, p2 = players[0], players[0].opponent
-    combined = combine_grids(p1, p2)
-
-    # Gather all units into a flat list
-    units = []
-    seen_units = set()
-    for r in range(BOARD_ROWS):
-        for c in range(BOARD_COLS):
-            unit = combined[r][c]
-            if unit and unit not in seen_units:
-                units.append(unit)
-                seen_units.add(unit)
-
-    if not units:
+    battle = Battle(players, round_number, rng)
+    if not battle.setup():
         return [], None, None
-    
-    p1.clan_manager = ClanSynergyManager(p1)  # pass all units on the board
-    p2.clan_manager = ClanSynergyManager(p2)  # pass all units on the board
-    p1.clan_manager.setup_round()  # counts Clan cards at start of round
-    p2.clan_manager.setup_round()  # counts Clan cards at start of round
-    p1.brawler_manager = BrawlerSynergyManager(p1)
-    p2.brawler_manager = BrawlerSynergyManager(p2)
-    p1.brawler_manager.setup_round()
-    p2.brawler_manager.setup_round()
-    p1.noble_manager = NobleSynergyManager(p1, False)
-    p2.noble_manager = NobleSynergyManager(p2, True)
-    p1.noble_manager.setup_round()
-    p2.noble_manager.setup_round()
-    p1.goblin_manager = GoblinSynergyManager(p1)
-    p2.goblin_manager = GoblinSynergyManager(p2)
-    p1.goblin_manager.setup_round()
-    p2.goblin_manager.setup_round()
-    p1.thrower_synergy = ThrowerSynergyManager(p1)
-    p2.thrower_synergy = ThrowerSynergyManager(p2)
-    p1.thrower_synergy.setup_round()
-    p2.thrower_synergy.setup_round()
-    p1.undead_manager = UndeadSynergyManager(p1)
-    p2.undead_manager = UndeadSynergyManager(p2)
-    p1.undead_manager.setup_round()
-    p2.undead_manager.setup_round()
-    p1.avenger_manager = AvengerSynergyManager(p1)
-    p2.avenger_manager = AvengerSynergyManager(p2)
-    p1.avenger_manager.setup_round()
-    p2.avenger_manager.setup_round()
-    p1.ranger_manager = RangerSynergyManager(p1)
-    p2.ranger_manager = RangerSynergyManager(p2)
-    p1.ranger_manager.setup_round()
-    p2.ranger_manager.setup_round()
-    p1.ace_manager = AceSynergyManager(p1)
-    p2.ace_manager = AceSynergyManager(p2)
-    p1.ace_manager.setup_round()
-    p2.ace_manager.setup_round()
-    p1.assassin_manager = AssassinSynergyManager(p1)
-    p2.assassin_manager = AssassinSynergyManager(p2)
-    p1.assassin_manager.setup_round(units, combined, False)
-    p2.assassin_manager.setup_round(units, combined, True)
-    p1.juggernaut_manager = JuggernautSynergyManager(p1)
-    p2.juggernaut_manager = JuggernautSynergyManager(p2)
-    p1.juggernaut_manager.setup_round(combined, False)
-    p2.juggernaut_manager.setup_round(combined, True)
-
-    # --- CLEAR ANY EXISTING BOMBS AT ROUND START ---
-    bombs.clear()
 
     # --- PYGAME INITIALIZATION ---
     pygame.init()
     screen = pygame.display.set_mode((1200, 1000))
     pygame.display.set_caption("MergeTacticsBot Combat Visualization (Live)")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont('Arial', 30)
     FPS = 60
-    projectiles = []
 
-    start_ticks = pygame.time.get_ticks()
-    total_paused_time = 0
-    paused = False
+    tile = _live_tile(battle)
+    controls = LiveControls(lambda: _tick_tile(tile), lambda: _tile_running(tile))
 
-    round_count = 0
-    winner = None
-    remaining_units = None
+    # --- MAIN SIMULATION LOOP ---
+    while _tile_running(tile):
+        if not controls.handle_events():
+            pygame.quit()
+            return [], None, None
 
-    for unit in units:
-        if getattr(unit.card, "name", "").lower() == "prince":
-            unit.prince_combat_start_ability([u for u in units if u.alive], combined)
+        # --- ADVANCE THE SIMULATION ---
+        controls.advance(clock.get_time() / 1000.0)
+        render_time = _advance_projectiles(tile, controls.lag)
 
+        # --- RENDER FRAME ---
+        screen.fill((30, 30, 30))
+        draw_grid(screen, battle.combined, units=battle.units)
+        draw_projectiles(screen, tile["projectiles"])
+        draw_status(screen, [controls.status(render_time)])
 
-    # --- MAIN SIMULATION LOOP ---
-    while True:
-        round_count += 1
+        pygame.display.flip()
+        clock.tick(FPS)
 
-        # Update living units
-        living_units = [u for u in units if u.alive]
-        if not living_units:
-            break
+    battle.finish()
+    pygame.quit()
+    return [], battle.winner, battle.remaining_units
 
-        # Check if both players still have alive units
-        p1_alive = any(u.alive and u.owner == p1 for u in units)
-        p2_alive = any(u.alive and u.owner == p2 for u in units)
-        if not p1_alive or not p2_alive:
-            break
+class LiveMatchup:
+    """A matchup already fought on the round dashboard, merged back in matchup order with result()."""
 
-        # --- HANDLE PYGAME EVENTS ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return [], None, None
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    return [], None, None
-                elif event.key == pygame.K_SPACE:
-                    paused = not paused
-                    if paused:
-                        pause_start_time = pygame.time.get_ticks()
-                    else:
-                        pause_end_time = pygame.time.get_ticks()
-                        total_paused_time += (pause_end_time - pause_start_time)
-
-        # --- TIME CALCULATIONS ---
-        current_ticks = pygame.time.get_ticks()
-        if paused:
-            current_time = (pause_start_time - start_ticks - total_paused_time) / 1000.0
-        else:
-            current_time = (current_ticks - start_ticks - total_paused_time) / 1000.0
+    def __init__(self, battle, capture):
+        self.battle = battle
+        self.capture = capture
 
-        dt = clock.get_time() / 1000.0
+    def result(self):
+        """Replay the battle's log events and return its winner (None for a draw)."""
+        for event in self.capture.events:
+            log.emit(event.kind, event.message, event.level, **event.fields)
+        return self.battle.winner
 
-        # --- UNIT LOGIC LOOP (handle newly spawned units dynamically) ---
-        i = 0
-        while i < len(units):
-            unit = units[i]
+def simulate_and_visualize_round_live(pairs, round_number=None, rngs=None):
+    """
+    Fights every matchup of a round at once, tiled in one pygame window.
 
-            if not unit.alive:
-                i += 1
-                continue
+    Each battle runs on its own FixedStepClock and all of them tick
+    together, so the round takes as long to watch as its longest battle.
+    Matchups share no state, so every battle ends exactly as it would on
+    its own; each one's log events are held back and replayed by
+    LiveMatchup.result() in matchup order, so the game log matches a
+    round watched one battle at a time.
 
-            # ✅ Clan synergy check  
-            unit.owner.clan_manager.trigger(unit)
-            unit.owner.avenger_manager.update_last_standing()
+    Controls are LiveControls': Enter skips to the end of the round, and Esc
+    closes the window, calling the battles still running draws.
 
-            # Update status effects
-            time_step = current_time - getattr(unit, 'last_update_time', current_time)
-            unit.update_status_effects(time_step)
-            unit.last_update_time = current_time
+    Args:
+        pairs (list): The round's (player, opponent) matchups.
+        round_number (int, optional): Current round, forwarded to end-of-combat synergies.
+        rngs (list, optional): Each matchup's random stream; fresh entropy if None.
 
-            if not unit.can_act():
-                i += 1
-                continue
+    Returns:
+        list: A LiveMatchup per pair, in the same order.
+    """
+    rngs = rngs or [None] * len(pairs)
+    matchups, tiles = [], []
+    for pair, rng in zip(pairs, rngs):
+        battle = Battle(list(pair), round_number, rng)
+        capture = RingBufferConsumer(capacity=None, level=log.level)
+        with log.redirected(capture):
+            ready = battle.setup()
+        if not ready:
+            battle.finished = True
+        matchups.append(LiveMatchup(battle, capture))
+        if ready:
+            tiles.append(_live_tile(battle, capture))
+
+    def tick():
+        for tile in tiles:
+            if _tile_running(tile):
+                _tick_tile(tile)
 
-            # Target acquisition
-            if not unit.current_target or not unit.current_target.alive or getattr(unit.current_target, 'invisible', False):
-                # Only consider alive and visible enemies
-                visible_enemies = [u for u in units if u.alive and not getattr(u, 'invisible', False) and u.owner != unit.owner]
-                if visible_enemies:
-                    closest_enemy, _ = unit.find_closest_enemy(visible_enemies)
-                    unit.current_target = closest_enemy
-                    unit.is_attacking = False
-                    unit.last_attack_time = None
-
-            # Retargeting
-            else:
-                new_target = unit.should_retarget(units, combined)
-                if new_target and new_target != unit.current_target and not getattr(new_target, 'invisible', False):
-                    print(f"🔄 {unit.card.name} is retargeting from {unit.current_target.card.name} to {new_target.card.name}")
-                    unit.current_target = new_target
-                    unit.last_attack_time = None
-
-            # ATTACK LOGIC
-            if unit.current_target is not None and unit.is_in_range_of(unit.current_target):
-                unit.is_attacking = True
-                if unit.last_attack_time is None:
-                    unit.last_attack_time = current_time
-                elif unit.can_attack(current_time):
-                    if unit is not None and unit.current_target is not None and unit.alive and unit.current_target.alive and not getattr(unit.current_target, 'invisible', False):
-                        # safe to attack
-                        # Perform unit-specific attack
-                        try:
-                            attacker_pos = hex_to_pixel(*unit.get_position())
-                            target_pos = hex_to_pixel(*unit.current_target.get_position())
-                            attack_result = unit.attack(unit.current_target, current_time, units, combined)
-                            unit.owner.ranger_manager.on_attack(unit)
-                            if attack_result:
-                                unit.last_attack_time = current_time
-                                print(f"Position of {unit.card.name} [{unit.owner.name}]: {unit.get_position()}")
-                                colour = PLAYER_COLOURS.get(unit.owner.name, (255, 255, 255))
-                                projectiles.append(Projectile(attacker_pos, target_pos, colour))
-
-                        except Exception as e:
-                            attacker_name = getattr(unit.card, 'name', 'Unknown')
-                            target_name = getattr(unit.current_target.card, 'name', 'Unknown') if unit.current_target else 'None'
-                            attacker_pos = unit.get_position() if hasattr(unit, 'get_position') else ('?', '?')
-                            target_pos = unit.current_target.get_position() if unit.current_target and hasattr(unit.current_target, 'get_position') else ('?', '?')
-                            attacker_owner = getattr(unit.owner, 'name', 'Unknown')
-                            target_owner = getattr(unit.current_target.owner, 'name', 'Unknown') if unit.current_target else 'None'
-                            attacker_hp = getattr(unit, 'current_hp', 'Unknown')
-                            target_hp = getattr(unit.current_target, 'current_hp', 'Unknown') if unit.current_target else 'None'
-
-                            print("⚠️ Attack error:", e)
-                            print(f"Attacker: {attacker_name} (Owner: {attacker_owner}, HP: {attacker_hp}, Pos: {attacker_pos})")
-                            print(f"Target: {target_name} (Owner: {target_owner}, HP: {target_hp}, Pos: {target_pos})")
-
-                            # Optional: prevent further crashing by only calling take_damage if current_target is valid
-                            if unit.current_target and getattr(unit.current_target, 'alive', False):
-                                unit.current_target.take_damage(unit.get_damage(), combined, all_units=units, attacker=unit)
-          
-                    unit.last_attack_time = current_time
+    # --- PYGAME INITIALIZATION ---
+    pygame.init()
+    columns = math.ceil(math.sqrt(len(tiles))) if tiles else 1
+    rows = math.ceil(len(tiles) / columns) if tiles else 1
+    tile_width, tile_height = BOARD_VIEW_SIZE
+    scale = min(1.0, WIDTH / (columns * tile_width), HEIGHT / (rows * tile_height))
+    cell_size = (int(tile_width * scale), int(tile_height * scale))
+    screen = pygame.display.set_mode((cell_size[0] * columns, cell_size[1] * rows))
+    pygame.display.set_caption(f"MergeTacticsBot Round {round_number} Dashboard (Live)")
+    clock = pygame.time.Clock()
+    FPS = 60
+    controls = LiveControls(tick, lambda: any(_tile_running(tile) for tile in tiles))
 
-            else:
-                unit.is_attacking = False
-
-            # MOVEMENT LOGIC
-            if unit.current_target and unit.current_target.alive and unit.alive:
-                target_pos = unit.current_target.get_position()
-                if target_pos is None:
-                    continue
-                if not unit.is_in_range_of(unit.current_target) and unit.can_move(current_time):
-                    
-                    current_pos = unit.get_position()
-                    occupied = get_occupied_positions(units, reserved_positions=None, excluding_unit=unit)
-
-                    best_move = None
-                    best_dist = float('inf')
-                    for move_pos in hex_neighbors(current_pos[0], current_pos[1]):
-                        
-                        if move_pos not in occupied:
-                            path = find_path_bfs_to_range(move_pos, target_pos, unit.card.range, occupied_positions=occupied)
-                            if path:
-                                dist = len(path) - 1
-                            else:
-                                dist = float('inf')
-                            if dist < best_dist:
-                                best_dist = dist
-                                best_move = move_pos
-                
-                    if best_move:
-                        unit.move_to(*best_move, combined)
-                        unit.move_cooldown = current_time
-                        unit.last_move_time = current_time
-                        unit.last_position = best_move
-
-            # --- inside the main loop, after unit actions ---
-            for bomb in bombs[:]:  # iterate over a copy
-                bomb["timer"] -= dt  # dt = time step per frame
-
-                # Print countdown (rounded to 2 decimals for readability)
-                print(f"⏳ Bomb at {bomb['pos']} exploding in {bomb['timer']:.2f}s")
-
-                if bomb["timer"] <= 0:
-                    # Trigger explosion
-                    bomb_pos = bomb["pos"]
-                    radius = bomb["radius"]
-                    damage = bomb["damage"]
-                    stun_duration = bomb["stun"]
-
-                    for unit in units:
-                        if unit.alive and unit.owner != bomb["owner"] and hex_distance(unit.get_position(), bomb_pos) <= radius:
-                            unit.take_damage(damage, combined, units)
-                            unit.status_effects["stunned"] = max(unit.status_effects.get("stunned", 0), stun_duration)
-                            print(f"💥 Bomb hits {unit.card.name} (Owner: {unit.owner.name}) for {damage} damage and {stun_duration}s stun!")
-
-
-                    bombs.remove(bomb)
-       
-
-            # AFTER ATTACK/MOVE: newly spawned units are already in 'units', so they'll be processed in subsequent iterations
-            i += 1  # increment manually to include new units
-
-        # Spawn skeletons for positions recorded by Skeleton King
-        for unit in units:
-            if unit.card.name.lower() == "skeleton-king":
-                if hasattr(unit, "killed_enemy_this_round"):
-                    for idx, killed_info in enumerate(unit.killed_enemy_this_round):
-                        print("Entered loop for Skeleton King kills")
-                        pos = killed_info.get("pos")
-                        level = killed_info.get("level")
-                        owner = killed_info.get("owner")
-                        
-                        print(f"🔹 Attempting spawn {idx+1}: pos={pos}, level={level}, owner={owner.name if owner else 'None'}")
-                        
-                        if pos is None or owner is None:
-                            print(f"⚠️ Skipping spawn: invalid position or owner!")
-                            continue
-
-                        # Check if tile is already occupied
-                        occupied_positions = {(u.row, u.col) for u in units if u.alive}
-                        if pos in occupied_positions:
-                            print(f"⚠️ Cannot spawn skeleton at {pos}, tile is occupied!")
-                            continue
-
-                        # Spawn skeleton
-                        skeleton_unit = spawn_skeleton(pos, level, owner, units, combined)
-                        if skeleton_unit:
-                            print(f"✅ Spawned skeleton at {pos} for {owner.name} (level {level})")
-                        else:
-                            print(f"❌ Failed to spawn skeleton at {pos}")
-                    
-                    # Clear after processing
-                    unit.killed_enemy_this_round = []
-                else:
-                    print(f"ℹ️ Skeleton King {unit.card.name} has no recorded kills")
-
-
-        # --- UPDATE PROJECTILES ---
-        for projectile in projectiles[:]:
-            projectile.update(dt)
-            if projectile.is_finished():
-                projectiles.remove(projectile)
+    # --- MAIN SIMULATION LOOP ---
+    while controls.running():
+        if not controls.handle_events():
+            for tile in tiles:
+                tile["battle"].finished = True  # Anything still fighting is a draw
+
+        # --- ADVANCE EVERY BATTLE TOGETHER ---
+        controls.advance(clock.get_time() / 1000.0)
 
         # --- RENDER FRAME ---
-        screen.fill((30, 30, 30))
-        draw_grid(screen, combined, units=units)
-        for projectile in projectiles:
-            pos = projectile.get_position()
-            pygame.draw.circle(screen, projectile.colour, (int(pos[0]), int(pos[1])), 8)
+        for i, tile in enumerate(tiles):
+            battle = tile["battle"]
+            render_time = _advance_projectiles(tile, controls.lag)
+
+            surface = tile["surface"]
+            surface.fill((30, 30, 30))
+            draw_grid(surface, battle.combined, units=battle.units)
+            draw_projectiles(surface, tile["projectiles"])
+            status = controls.status(render_time)
+            if not _tile_running(tile):
+                status += "   Winner: " + (battle.winner.name if battle.winner else "draw")
+            draw_status(surface, [f"{battle.p1.name} vs {battle.p2.name}", status])
+            cell = (i % columns * cell_size[0], i // columns * cell_size[1])
+            screen.blit(surface if scale == 1.0 else pygame.transform.smoothscale(surface, cell_size), cell)
 
         pygame.display.flip()
         clock.tick(FPS)
 
-        # --- CHECK FOR END CONDITION ---
-        p1_alive = any(u.alive and u.owner == p1 for u in units)
-        p2_alive = any(u.alive and u.owner == p2 for u in units)
-        if not p1_alive and not p2_alive:
-            winner = None
-            remaining_units = None
-            break
-        elif not p1_alive:
-            winner = p2
-            remaining_units = len([u for u in units if u.alive and u.owner == p2])
-            break
-        elif not p2_alive:
-            winner = p1
-            remaining_units = len([u for u in units if u.alive and u.owner == p1])
-            break
-
-    p1.goblin_manager.on_buy_phase_start(rn)
-    p2.goblin_manager.on_buy_phase_start(rn) 
-    p1.thrower_synergy.reset_synergy()
-    p2.thrower_synergy.reset_synergy()
+    for tile in tiles:
+        with log.redirected(tile["capture"]):
+            tile["battle"].finish()
     pygame.quit()
-    return [], winner, remaining_units
+    return matchups
 
-def assign_opponents(players):
+def _live_tile(battle, capture=None):
+    """
+    Live viewer state of one set-up battle: its own clock, projectiles and offscreen surface.
+
+    Args:
+        battle (Battle): A battle whose setup() has already run.
+        capture (RingBufferConsumer, optional): Where the battle's log events go; the usual consumers if None.
+    """
+    battle_clock = battle.context.clock = FixedStepClock(DEFAULT_DT)
+    projectiles = []
+
+    def spawn_projectile(unit, attacker_pos, target_pos):
+        colour = PLAYER_COLOURS.get(unit.owner.name, (255, 255, 255))
+        projectile = Projectile(hex_to_pixel(*attacker_pos), hex_to_pixel(*target_pos), colour)
+        projectile.start_time = battle_clock.now
+        projectiles.append(projectile)
+
+    battle.on_attack = spawn_projectile
+    return {"battle": battle, "capture": capture, "projectiles": projectiles,
+            "surface": pygame.Surface(BOARD_VIEW_SIZE)}
+
+def _tile_running(tile):
+    battle = tile["battle"]
+    return not battle.finished and battle.context.clock.now < DEFAULT_MAX_TIME
+
+def _tick_tile(tile):
+    """One battle tick, with the battle's log events sent to its capture if it has one."""
+    battle = tile["battle"]
+    if tile["capture"] is None:
+        battle.step()
+    else:
+        with log.redirected(tile["capture"]):
+            battle.step()
+    battle.context.clock.advance()
+
+def _advance_projectiles(tile, lag):
+    """
+    Moves a tile's projectiles to the time the renderer shows, between the battle's last tick and its next.
+
+    Returns:
+        float: That render time, in simulated seconds.
+    """
+    running = _tile_running(tile)
+    render_time = tile["battle"].context.clock.now + (min(lag, DEFAULT_DT) if running else 0.0)
+    for projectile in tile["projectiles"][:]:
+        projectile.advance_to(render_time)
+        if projectile.is_finished() or not running:
+            tile["projectiles"].remove(projectile)
+    return render_time
+
+def assign_opponents(players, rng):
     alive_players = [p for p in players if p.hp > 0]
     players_shuffled = alive_players[:]
-    random.shuffle(players_shuffled)
+    rng.shuffle(players_shuffled)
     for p in players_shuffled:
         p.opponent = None
     for i in range(0, len(players_shuffled) - 1, 2):
@@ -431,27 +336,72 @@ def assign_opponents(players):
         p2 = players_shuffled[i + 1]
         p1.opponent = p2
         p2.opponent = p1
-        print(f"{p1.name} ❤️{p1.hp} will fight {p2.name} ❤️{p2.hp} in combat phase.")
+        log.emit(GAME, "{player} ❤️{hp} will fight {opponent} ❤️{opponent_hp} in combat phase.",
+                 player=p1.name, hp=p1.hp, opponent=p2.name, opponent_hp=p2.hp)
     if len(players_shuffled) % 2 == 1:
         last_player = players_shuffled[-1]
         last_player.opponent = None
-        print(f"{last_player.name} ❤️{last_player.hp} has no opponent this round.")
+        log.emit(GAME, "{player} ❤️{hp} has no opponent this round.", player=last_player.name, hp=last_player.hp)
+
+def play_round(players, round_number, headless=False, event_driven=False, rng=None, executor=None,
+               combat_cache=None, replays=None, dashboard=False):
+    """
+    Plays one round: pairings, the shop phase, every matchup's combat and the damage step.
+
+    Every player must have bot logic; see play_round_steps() for players driven from outside.
+
+    Args:
+        players (list): Every player in the game.
+        round_number (int): The round being played.
+        headless (bool): Simulate combat without the pygame window.
+        event_driven (bool): Headless only: step combat on scheduled events instead of every tick.
+        rng (RandomStream, optional): The game's root stream; fresh entropy if None.
+        executor (ProcessPoolExecutor, optional): Headless only: run the round's battles in parallel on this pool.
+            Results are merged back in matchup order, so a seeded game plays out the same either way.
+        combat_cache (CombatCache, optional): Headless only: settle each matchup by sampling its cached
+            outcome distribution instead of simulating it.
+        replays (list, optional): Headless only: record every simulated battle and append its Replay here.
+        dashboard (bool): Live only: watch all of the round's battles at once, tiled in one window.
 
-def play_round(players, round_number):
-    print(f"\n=== ROUND {round_number} ===")
+    Returns:
+        bool: False once the game is over.
+    """
+    round_steps = play_round_steps(players, round_number, headless, event_driven, rng, executor, combat_cache, replays,
+                                   dashboard)
+    try:
+        player = next(round_steps)
+    except StopIteration as done:
+        return done.value
+    raise ValueError(f"{player.name} has no bot logic; drive the round with play_round_steps()")
+
+def play_round_steps(players, round_number, headless=False, event_driven=False, rng=None, executor=None,
+                     combat_cache=None, replays=None, dashboard=False):
+    """
+    play_round() as a generator that hands shop turns of players without bot logic to the caller.
+
+    Each such turn yields the player; the caller makes its move (e.g. player.buy_card())
+    and sends back whether it acted, exactly what bot logic would have returned.
+    Takes the same arguments as play_round().
+
+    Returns:
+        bool: False once the game is over (as the StopIteration value).
+    """
+    if rng is None:
+        rng = RandomStream()
+    log.emit(GAME, "\n=== ROUND {round} ===", round=round_number)
     alive_players = [p for p in players if p.hp > 0]
     if len(alive_players) <= 1:
         if len(alive_players) == 1:
-            print(f"🏆 GAME OVER: {alive_players[0].name} is the last player standing!")
+            log.emit(GAME, "🏆 GAME OVER: {player} is the last player standing!", winner=alive_players[0].name, player=alive_players[0].name)
         else:
-            print("🏆 GAME OVER: No players remaining!")
+            log.emit(GAME, "🏆 GAME OVER: No players remaining!", winner=None)
         return False
     
-    assign_opponents(alive_players)
+    assign_opponents(alive_players, rng)
     for p in alive_players:
         p.elixir += 4
     turn_order = alive_players[:]
-    random.shuffle(turn_order)
+    rng.shuffle(turn_order)
     passes_in_a_row = 0
     total_players = len(alive_players)
     
@@ -459,110 +409,224 @@ def play_round(players, round_number):
         for player in turn_order:
             if player.hp <= 0:
                 continue
-            acted = player.act(round_number)
+            if player.bot_logic is None:
+                acted = yield player  # Decided outside, e.g. by the RL environment
+            else:
+                acted = player.act(round_number)
             if acted and player.has_space(round_number):
                 passes_in_a_row = 0
-                print(f"{player.name} acted and has {player.elixir}💧 left.")
+                log.emit(GAME, "{player} acted and has {elixir}💧 left.", player=player.name, elixir=player.elixir)
             else:
-                print(f"{player.name} passes.")
+                log.emit(GAME, "{player} passes.", action="pass", player=player.name)
                 passes_in_a_row += 1
             if passes_in_a_row >= total_players:
                 break
     
-    print(f"\n--- Round {round_number} Combat Phase ---")
+    log.emit(GAME, "\n--- Round {round} Combat Phase ---", round=round_number)
     matched_pairs = set()
-    
+    matchups = []
+
+    # Pairs share no state, so with an executor every battle starts before any is resolved
     for p in alive_players:
         opponent = p.opponent
         if opponent and opponent.hp > 0 and (p, opponent) not in matched_pairs and (opponent, p) not in matched_pairs:
             combined = combine_grids(p, opponent)
-            p_colour = get_player_colour(p.name)
-            o_colour = get_player_colour(opponent.name)
-            print(f"\nMatchup: {p_colour}{p.name} ❤️{p.hp}\033[0m VS {o_colour}{opponent.name} ❤️{opponent.hp}\033[0m")
-            print_combined_grid(combined)
             matched_pairs.add((p, opponent))
-            
-            # Run combat simulation
-            combat_grids_and_arrows, winner, remaining_units = simulate_and_visualize_combat_live([p, opponent])
-            
-            # Only count original units for end-of-round damage
+
+            # Each matchup gets its own stream, keyed by round and matchup order
+            battle_rng = rng.derive(BATTLE_STREAM, round_number, len(matched_pairs) - 1)
+            pending = None
+            if headless and executor is not None and combat_cache is None and replays is None:
+                pending = submit_matchup(executor, [p, opponent], round_number, event_driven, battle_rng)
+            matchups.append((p, opponent, combined, battle_rng, pending))
+
+    # The dashboard fights every live battle up front; each is merged back like a pending one
+    if dashboard and not headless and matchups:
+        fought = simulate_and_visualize_round_live([(p, opponent) for p, opponent, *_ in matchups], round_number,
+                                                   [battle_rng for _, _, _, battle_rng, _ in matchups])
+        matchups = [matchup[:4] + (live,) for matchup, live in zip(matchups, fought)]
+
+    # Resolve in matchup order, so damage, eliminations and the log match a serial round
+    for p, opponent, combined, battle_rng, pending in matchups:
+        p_colour = get_player_colour(p.name)
+        o_colour = get_player_colour(opponent.name)
+        log.emit(GAME, "\nMatchup: {colour}{player} ❤️{hp}\033[0m VS {opponent_colour}{opponent} ❤️{opponent_hp}\033[0m",
+                 player=p.name, hp=p.hp, opponent=opponent.name, opponent_hp=opponent.hp,
+                 colour=p_colour, opponent_colour=o_colour)
+        print_combined_grid(combined)
+
+        # Run combat simulation
+        remaining_units_count = None
+        if pending is not None:
+            winner = pending.result()
+        elif headless and combat_cache is not None:
+            winner, remaining_units_count = combat_cache.resolve([p, opponent], round_number, battle_rng)
+        elif headless:
+            combat_grids_and_arrows, winner, remaining_units = simulate_combat_headless(
+                [p, opponent], round_number, event_driven=event_driven, rng=battle_rng, replays=replays)
+        else:
+            combat_grids_and_arrows, winner, remaining_units = simulate_and_visualize_combat_live([p, opponent], round_number, battle_rng)
+        
+        # Only count original units for end-of-round damage
+        if remaining_units_count is None:
             original_units_remaining = [
                 u for u in (p.field + opponent.field)
                 if u.alive and u.card.name.lower() != "skeleton"
             ]
             remaining_units_count = len(original_units_remaining)
 
-            # Apply damage based on original units only
-            if winner == p:
-                opponent.take_damage(remaining_units_count + 1)
-            elif winner == opponent:
-                p.take_damage(remaining_units_count + 1)
-            else:  # Draw
-                print("🤝 No damage dealt due to draw!")
+        # Apply damage based on original units only
+        if winner == p:
+            opponent.take_damage(remaining_units_count + 1)
+        elif winner == opponent:
+            p.take_damage(remaining_units_count + 1)
+        else:  # Draw
+            log.emit(GAME, "🤝 No damage dealt due to draw!", winner=None)
     
-    print(f"\n--- Round {round_number} Summary ---")
+    log.emit(GAME, "\n--- Round {round} Summary ---", round=round_number)
     for player in alive_players:
         if player.hp > 0:
             player.display_zone(round_number)
     
     return True
 
-if __name__ == '__main__':
-    class DeckManager:
-        def __init__(self):
-            self.card_pool = [Card(name, cost) for name, cost in CARD_STATS.items() for _ in range(4)]
-            random.shuffle(self.card_pool)
-
-        def draw_hand(self, n=3):
-            hand = []
-            used_names = set()
-            i = 0
-            while len(hand) < n and i < len(self.card_pool):
-                card = self.card_pool[i]
-                if card.name not in used_names:
-                    hand.append(card)
-                    used_names.add(card.name)
-                    self.card_pool.pop(i)
-                else:
-                    i += 1
-            return hand
-
-        def return_cards(self, cards):
-            self.card_pool.extend(cards)
-            random.shuffle(self.card_pool)
-
-        def deal_hand(self, n=3):
-            return self.draw_hand(n)
-
-    deck = DeckManager()
+# The standard 4-player lobby: (player name, bot logic)
+DEFAULT_LINEUP = [
+    ("Greedy", greedy_bot_logic),
+    ("Efficient", efficient_bot_logic),
+    ("ComboSeeker", combo_seeker_bot_logic),
+    ("Random", random_bot_logic),
+]
+
+def create_players(game_rng, lineup=DEFAULT_LINEUP):
+    """
+    Deals a new game: a shared deck and one player per lineup entry, each with a starting unit.
+
+    Args:
+        game_rng (RandomStream): The game's root stream; the deck and each player get their own child.
+        lineup (list): (player name, bot logic) per seat.
+
+    Returns:
+        list: The Player objects, in seat order.
+    """
+    deck = DeckManager(game_rng.derive(DECK_STREAM))
     players = [
-        Player("Greedy", deck, greedy_bot_logic),
-        Player("Efficient", deck, efficient_bot_logic),
-        Player("ComboSeeker", deck, combo_seeker_bot_logic),
-        Player("Random", deck, random_bot_logic)
+        Player(name, deck, bot_logic, game_rng.derive(PLAYER_STREAM, seat))
+        for seat, (name, bot_logic) in enumerate(lineup)
     ]
 
     for player in players:
         player.give_starting_unit()
+    return players
 
-    rn = 1
+def placements(players, eliminated_round):
+    """
+    Final placement of every player.
+
+    Survivors rank above eliminated players, by HP. Eliminated players rank by
+    how late they went out, then by HP. Equal players share a placement.
+
+    Args:
+        players (list): Every player in the game.
+        eliminated_round (dict): Player -> round they were eliminated in.
+
+    Returns:
+        dict: Player -> placement, 1 being best.
+    """
+    def standing(p):
+        return (p not in eliminated_round, eliminated_round.get(p, 0), p.hp)
+
+    return {p: 1 + sum(1 for other in players if standing(other) > standing(p)) for p in players}
+
+def play_game(players, game_rng, max_rounds=20, headless=False, event_driven=False, executor=None,
+              combat_cache=None, replays=None, dashboard=False):
+    """
+    Plays rounds until one player is left or max_rounds have been played.
+
+    Args:
+        players (list): Players from create_players().
+        game_rng (RandomStream): The game's root stream, used for pairings and battle streams.
+        max_rounds (int): Last round to play.
+        headless (bool): Simulate combat without the pygame window.
+        event_driven (bool): Headless only: step combat on scheduled events instead of every tick.
+        executor (ProcessPoolExecutor, optional): Headless only: pool to run each round's battles on.
+        combat_cache (CombatCache, optional): Headless only: sample each matchup's outcome from this cache.
+        replays (list, optional): Headless only: collects a Replay of every simulated battle.
+        dashboard (bool): Live only: tile each round's battles in one window.
+
+    Returns:
+        int: Number of rounds played.
+    """
     round_num = 1
-    while round_num <= 20:  # Max 10 rounds
-        if not play_round(players, round_num):
+    while round_num <= max_rounds:
+        if not play_round(players, round_num, headless=headless, event_driven=event_driven, rng=game_rng,
+                          executor=executor, combat_cache=combat_cache, replays=replays, dashboard=dashboard):
             break
         round_num += 1
-        rn += 1
+    return round_num - 1
+
+if __name__ == '__main__':
+    # --- EVENT LOG CONSUMERS ---
+    if "--quiet" not in sys.argv:  # Pretty-print every event, as the simulator always has
+        log.add_consumer(ConsoleConsumer(level=DEBUG))
+    json_log = None
+    if "--log-file" in sys.argv:  # Also write combat and game events as JSON lines
+        json_log = log.add_consumer(JsonlConsumer(sys.argv[sys.argv.index("--log-file") + 1], level=INFO))
+
+    # --- RANDOM STREAMS ---
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else None  # Replay a game exactly
+    game_rng = RandomStream(seed)
+
+    players = create_players(game_rng)
+
+    headless = "--headless" in sys.argv  # Skip the pygame window and simulate combat as fast as possible
+    if "--speed" in sys.argv:  # Live viewer only: starting speed, from 0.25 to 32
+        live_speed = float(sys.argv[sys.argv.index("--speed") + 1])
+    event_driven = "--events" in sys.argv  # Headless only: step combat on scheduled events instead of every tick
+
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 0  # Headless only: battle processes per round
+    executor = ProcessPoolExecutor(max_workers=workers) if headless and workers > 1 else None
+
+    # Headless only: sample each matchup from a cache of this many simulated battles per board
+    cache_samples = int(sys.argv[sys.argv.index("--cache") + 1]) if "--cache" in sys.argv else 0
+    verify_cache = "--verify-cache" in sys.argv  # Re-simulate every cache hit and check it matches
+    combat_cache = (CombatCache(samples=cache_samples, event_driven=event_driven, verify=verify_cache)
+                    if headless and cache_samples else None)
+
+    # Headless only: save a replay of every battle into this directory (view with `python -m merge_sim.visualise`)
+    replay_dir = sys.argv[sys.argv.index("--replays") + 1] if "--replays" in sys.argv else None
+    replays = [] if headless and replay_dir else None
+
+    dashboard = "--dashboard" in sys.argv  # Live only: watch every battle of a round at once, tiled in one window
+
+    play_game(players, game_rng, headless=headless, event_driven=event_driven, executor=executor,
+              combat_cache=combat_cache, replays=replays, dashboard=dashboard)
+    if executor:
+        executor.shutdown()
     
     # Final standings
     alive_players = [p for p in players if p.hp > 0]
     alive_players.sort(key=lambda p: p.hp, reverse=True)
     
-    print(f"\n🏆 FINAL STANDINGS:")
+    log.emit(GAME, "\n🏆 FINAL STANDINGS:")
     for i, player in enumerate(alive_players, 1):
-        print(f"{i}. {player.name} - ❤️{player.hp} HP")
+        log.emit(GAME, "{place}. {player} - ❤️{hp} HP", place=i, player=player.name, hp=player.hp)
     
     dead_players = [p for p in players if p.hp <= 0]
     if dead_players:
-        print(f"\n💀 ELIMINATED:")
+        log.emit(GAME, "\n💀 ELIMINATED:")
         for player in dead_players:
-            print(f"   {player.name} - ❤️{player.hp} HP")
\ No newline at end of file
+            log.emit(GAME, "   {player} - ❤️{hp} HP", player=player.name, hp=player.hp)
+
+    if combat_cache is not None:
+        log.emit(GAME, "\nCombat cache: {hits} hits, {misses} misses ({hit_rate:.0%}), {entries} boards",
+                 **combat_cache.stats())
+
+    if replays:
+        os.makedirs(replay_dir, exist_ok=True)
+        for i, replay in enumerate(replays):
+            bottom, top = replay.players
+            replay.save(os.path.join(replay_dir, f"{i:03d}_round{replay.round_number}_{bottom}_vs_{top}.mtr"))
+
+    if json_log:
+        json_log.close()
@@ -0,0 +1,505 @@
+# --- Standard Libraries ---
+import os
+import sys
+import time
+import traceback
+from multiprocessing import Pipe, Process
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # main_sim imports pygame; the env never opens a window
+
+# --- Cards ---
+from merge_sim.cards import CARD_STATS, CARD_MODIFIERS
+
+# --- Random Streams ---
+from merge_sim.rng import RandomStream
+
+# --- Game Loop ---
+from main_sim import DEFAULT_LINEUP, create_players, placements, play_round_steps
+
+MAX_ROUNDS = 20         # Same cap as main_sim
+HAND_SIZE = 3           # Cards in a shop hand (DeckManager.draw_hand)
+PASS = HAND_SIZE        # Action index for passing; 0..HAND_SIZE-1 buy that hand slot
+MAX_HP = 10             # Player starting HP
+MAX_FIELD = 6           # Player.max_field_slots cap
+MAX_BENCH = 5
+
+CARD_NAMES = list(CARD_STATS)
+CARD_INDEX = {name: i for i, name in enumerate(CARD_NAMES)}
+TRAITS = sorted({trait for traits in CARD_MODIFIERS.values() for trait in traits})
+TRAIT_INDEX = {trait: i for i, trait in enumerate(TRAITS)}
+
+# --- Observation layout ---
+GLOBAL_FEATURES = 6                                 # round, hp, elixir, field count, bench count, field slots
+SLOT_FEATURES = len(CARD_NAMES) + 2                 # card one-hot, cost, affordable
+OPPONENT_FEATURES = 3 + len(CARD_NAMES)             # alive, hp, is this round's opponent, field power per card
+
+
+def observation_size(seats):
+    """Length of an observation in a game with `seats` players."""
+    return (GLOBAL_FEATURES + HAND_SIZE * SLOT_FEATURES + 2 * len(CARD_NAMES)
+            + len(TRAITS) + (seats - 1) * OPPONENT_FEATURES)
+
+
+def zone_power(units, out):
+    """Adds each unit's strength to its card's entry: 1 per 1-star copy, so a 2-star counts 2 and a 3-star 4."""
+    for unit in units:
+        out[CARD_INDEX[unit.card.name]] += 2 ** (unit.card.star - 1)
+
+
+class MergeTacticsEnv:
+    """
+    Gym-style environment for the buy phase, one shop decision per step.
+
+    The agent takes seat 0 against bot opponents. Each step buys one hand
+    slot (actions 0..HAND_SIZE-1) or passes (PASS); the rest of the game,
+    opponents' turns and headless combat included, runs inside step() until
+    the agent's next decision. Rounds are played by main_sim's
+    play_round_steps(), so a seeded episode plays out exactly as a game where
+    the agent's moves came from bot logic.
+
+    Observations and action masks are written into arrays allocated once in
+    __init__ and returned on every call; copy them to keep one past the next
+    step.
+
+    Reward is the agent's HP change / MAX_HP after each step, plus a final
+    placement score from +1 (first) to -1 (last) when the episode ends.
+
+    Args:
+        opponents (list, optional): (player name, bot logic) per opponent seat; main_sim's bots if None.
+        max_rounds (int): Last round to play; the episode is truncated after it.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+        observation (np.ndarray, optional): float32 array to write observations into, e.g. a row of a batch.
+        action_mask (np.ndarray, optional): bool array to write action masks into.
+    """
+
+    def __init__(self, opponents=None, max_rounds=MAX_ROUNDS, event_driven=True, observation=None, action_mask=None):
+        self.lineup = [("Agent", None)] + list(opponents if opponents is not None else DEFAULT_LINEUP[1:])
+        self.max_rounds = max_rounds
+        self.event_driven = event_driven
+
+        self.action_count = HAND_SIZE + 1
+        self.observation_size = observation_size(len(self.lineup))
+        self.observation = observation if observation is not None else np.zeros(self.observation_size, dtype=np.float32)
+        self.action_mask = action_mask if action_mask is not None else np.zeros(self.action_count, dtype=bool)
+
+        self.players = None
+        self.agent = None
+        self.rng = None
+        self.round_number = 0
+        self.eliminated_round = {}
+        self._round_steps = None    # The current round's play_round_steps() generator
+        self.done = True
+
+    def reset(self, seed=None):
+        """
+        Deals a new game and plays up to the agent's first decision.
+
+        Args:
+            seed (int, optional): The game's root seed; fresh entropy if None.
+
+        Returns:
+            tuple: (observation, info), info holding "action_mask" and "round".
+        """
+        self.rng = RandomStream(seed)
+        self.players = create_players(self.rng, self.lineup)
+        self.agent = self.players[0]
+        self.round_number = 1
+        self.eliminated_round = {}
+        self._round_steps = None
+        self.done = False
+
+        terminated, truncated = self._advance(None)
+        return self._observe(), self._info(terminated or truncated)
+
+    def step(self, action):
+        """
+        Makes the agent's move and plays on to its next decision or the end of the game.
+
+        Args:
+            action (int): Hand slot to buy, or PASS.
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info)
+        """
+        if self.done:
+            raise RuntimeError("The episode is over; call reset()")
+        if not 0 <= action < self.action_count or not self.action_mask[action]:
+            raise ValueError(f"Illegal action {action}; legal actions are {np.flatnonzero(self.action_mask).tolist()}")
+
+        hp_before = self.agent.hp
+        acted = False
+        if action != PASS:
+            acted = self.agent.buy_card(self.agent.hand[action].name, self.round_number)
+
+        terminated, truncated = self._advance(acted)
+        reward = (self.agent.hp - hp_before) / MAX_HP
+        info = self._info(terminated or truncated)
+        if "placement" in info:
+            reward += 1 - 2 * (info["placement"] - 1) / (len(self.players) - 1)
+        return self._observe(), reward, terminated, truncated, info
+
+    def _advance(self, acted):
+        """
+        Plays until the agent has a decision to make or the episode ends.
+
+        Args:
+            acted (bool | None): The agent's last move, sent back into the round; None if there was none.
+
+        Returns:
+            tuple: (terminated, truncated)
+        """
+        while True:
+            if self._round_steps is None:
+                if self.round_number > self.max_rounds:
+                    self.done = True
+                    return False, True
+                self._round_steps = play_round_steps(self.players, self.round_number, headless=True,
+                                                     event_driven=self.event_driven, rng=self.rng)
+                acted = None
+
+            try:
+                self._round_steps.send(acted)
+                return False, False
+            except StopIteration as done:
+                self._round_steps = None
+                if not done.value:
+                    self.done = True
+                    return True, False
+
+            for p in self.players:
+                if p.hp <= 0 and p not in self.eliminated_round:
+                    self.eliminated_round[p] = self.round_number
+            if self.agent.hp <= 0 or sum(1 for p in self.players if p.hp > 0) <= 1:
+                self.done = True
+                return True, False
+            self.round_number += 1
+
+    def _info(self, episode_over):
+        self._update_mask()
+        info = {"action_mask": self.action_mask, "round": self.round_number}
+        if episode_over:
+            info["placement"] = placements(self.players, self.eliminated_round)[self.agent]
+        return info
+
+    def _update_mask(self):
+        mask = self.action_mask
+        mask[:] = False
+        if self.done:
+            return
+        agent = self.agent
+        if agent.has_space(self.round_number):
+            for slot, card in enumerate(agent.hand):
+                mask[slot] = card.cost <= agent.elixir
+        mask[PASS] = True
+
+    def _observe(self):
+        """Writes the current state into self.observation."""
+        obs = self.observation
+        obs[:] = 0.0
+        agent = self.agent
+
+        obs[0] = self.round_number / self.max_rounds
+        obs[1] = agent.hp / MAX_HP
+        obs[2] = agent.elixir / MAX_HP
+        obs[3] = len(agent.field) / MAX_FIELD
+        obs[4] = len(agent.bench) / MAX_BENCH
+        obs[5] = agent.max_field_slots(self.round_number) / MAX_FIELD
+        offset = GLOBAL_FEATURES
+
+        for slot, card in enumerate(agent.hand[:HAND_SIZE]):
+            base = offset + slot * SLOT_FEATURES
+            obs[base + CARD_INDEX[card.name]] = 1.0
+            obs[base + len(CARD_NAMES)] = card.cost / 5
+            obs[base + len(CARD_NAMES) + 1] = card.cost <= agent.elixir
+        offset += HAND_SIZE * SLOT_FEATURES
+
+        zone_power(agent.field, obs[offset:offset + len(CARD_NAMES)])
+        offset += len(CARD_NAMES)
+        zone_power(agent.bench, obs[offset:offset + len(CARD_NAMES)])
+        offset += len(CARD_NAMES)
+
+        # Synergies count unique cards on the field
+        for name in {unit.card.name for unit in agent.field}:
+            for trait in CARD_MODIFIERS.get(name, ()):
+                obs[offset + TRAIT_INDEX[trait]] += 1
+        offset += len(TRAITS)
+
+        for opponent in self.players[1:]:
+            obs[offset] = opponent.hp > 0
+            obs[offset + 1] = max(opponent.hp, 0) / MAX_HP
+            obs[offset + 2] = agent.opponent is opponent
+            zone_power(opponent.field, obs[offset + 3:offset + OPPONENT_FEATURES])
+            offset += OPPONENT_FEATURES
+        return obs
+
+
+def batch_buffers(num_envs, seats):
+    """(shape, dtype) of every array a VectorMergeTacticsEnv shares with its games, by name."""
+    return {
+        "observations": ((num_envs, observation_size(seats)), np.float32),
+        "action_masks": ((num_envs, HAND_SIZE + 1), np.bool_),
+        "actions": ((num_envs,), np.int64),
+        "rewards": ((num_envs,), np.float32),
+        "terminated": ((num_envs,), np.bool_),
+        "truncated": ((num_envs,), np.bool_),
+        "placements": ((num_envs,), np.int8),  # Placement of an episode that ended this step, else 0
+    }
+
+
+class GameShard:
+    """
+    The games for rows [start, stop) of a batch, each writing straight into its rows of the shared buffers.
+
+    Game `row` plays episode k from seed + row + k * num_envs, so every
+    episode of a seeded batch has its own seed and the batch replays the
+    same way however it is sharded.
+
+    Args:
+        buffers (dict): Batch arrays by name, from batch_buffers().
+        start (int): First row this shard plays.
+        stop (int): One past the last row.
+        env_kwargs (dict): MergeTacticsEnv arguments.
+    """
+
+    def __init__(self, buffers, start, stop, env_kwargs):
+        self.buffers = buffers
+        self.start = start
+        self.num_envs = len(buffers["actions"])
+        self.envs = [MergeTacticsEnv(observation=buffers["observations"][row], action_mask=buffers["action_masks"][row],
+                                     **env_kwargs)
+                     for row in range(start, stop)]
+        self.seed = None
+        self.episodes = [0] * len(self.envs)
+
+    def _reset_env(self, i):
+        row = self.start + i
+        seed = None if self.seed is None else self.seed + row + self.episodes[i] * self.num_envs
+        self.episodes[i] += 1
+        self.envs[i].reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.episodes = [0] * len(self.envs)
+        for i in range(len(self.envs)):
+            self._reset_env(i)
+        self.buffers["placements"][self.start:self.start + len(self.envs)] = 0
+
+    def run(self, command, arg=None):
+        """Carries out a VectorMergeTacticsEnv command: ("reset", seed) or ("step", None)."""
+        if command == "reset":
+            self.reset(arg)
+        else:
+            self.step()
+
+    def step(self):
+        """Steps every game with its row of the actions buffer, resetting games whose episode ended."""
+        b = self.buffers
+        for i, env in enumerate(self.envs):
+            row = self.start + i
+            _, reward, terminated, truncated, info = env.step(int(b["actions"][row]))
+            b["rewards"][row] = reward
+            b["terminated"][row] = terminated
+            b["truncated"][row] = truncated
+            b["placements"][row] = info.get("placement", 0)
+            if terminated or truncated:
+                self._reset_env(i)
+
+
+def _shard_worker(conn, memory_names, num_envs, seats, start, stop, env_kwargs):
+    """Worker process: runs a GameShard on the batch's shared memory, one command at a time."""
+    memories = {name: SharedMemory(memory_names[name]) for name in memory_names}
+    buffers = {name: np.ndarray(shape, dtype, buffer=memories[name].buf)
+               for name, (shape, dtype) in batch_buffers(num_envs, seats).items()}
+    shard = GameShard(buffers, start, stop, env_kwargs)
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "close":
+                break
+            try:
+                shard.run(command, arg)
+                conn.send(None)
+            except Exception:
+                conn.send(traceback.format_exc())
+    finally:
+        del shard, buffers
+        for memory in memories.values():
+            memory.close()
+        conn.close()
+
+
+class VectorMergeTacticsEnv:
+    """
+    N independent games stepped in lockstep with one batched action array.
+
+    Each game has its own deck, players and random streams (it is a
+    MergeTacticsEnv), but all of them write into shared (N, ...) buffers:
+    observations is one contiguous (N, observation_size) float32 array, reused
+    on every step. A game whose episode ends is reset straight away; its row
+    then holds the new episode's first observation, while rewards,
+    terminated/truncated and placements still describe the step that ended
+    the old one.
+
+    With workers > 1 the games are split into contiguous shards, one per
+    worker process, and the buffers live in shared memory so only a short
+    command crosses the pipe each step. Close the env (or use it as a context
+    manager) to stop the workers and free the memory.
+
+    Args:
+        num_envs (int): Number of games.
+        workers (int): Worker processes; the games run in this process if 0 or 1.
+        opponents (list, optional): (player name, bot logic) per opponent seat; main_sim's bots if None.
+        max_rounds (int): Last round to play; episodes are truncated after it.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+    """
+
+    def __init__(self, num_envs, workers=0, opponents=None, max_rounds=MAX_ROUNDS, event_driven=True):
+        env_kwargs = {"opponents": opponents, "max_rounds": max_rounds, "event_driven": event_driven}
+        seats = 1 + len(opponents if opponents is not None else DEFAULT_LINEUP[1:])
+        spec = batch_buffers(num_envs, seats)
+
+        self.num_envs = num_envs
+        self.action_count = HAND_SIZE + 1
+        self.observation_size = observation_size(seats)
+        self.memories = {}
+        self.connections = []
+        self.processes = []
+        self.shard = None
+
+        workers = min(workers, num_envs)
+        if workers <= 1:
+            self.buffers = {name: np.zeros(shape, dtype) for name, (shape, dtype) in spec.items()}
+            self.shard = GameShard(self.buffers, 0, num_envs, env_kwargs)
+        else:
+            self.buffers = {}
+            for name, (shape, dtype) in spec.items():
+                memory = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                self.memories[name] = memory
+                self.buffers[name] = np.ndarray(shape, dtype, buffer=memory.buf)
+                self.buffers[name][...] = 0
+            memory_names = {name: memory.name for name, memory in self.memories.items()}
+            bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent, child = Pipe()
+                process = Process(target=_shard_worker, daemon=True,
+                                  args=(child, memory_names, num_envs, seats, int(start), int(stop), env_kwargs))
+                process.start()
+                child.close()
+                self.connections.append(parent)
+                self.processes.append(process)
+
+        self.observations = self.buffers["observations"]
+        self.action_masks = self.buffers["action_masks"]
+
+    def _run(self, command, arg=None):
+        if self.shard is not None:
+            self.shard.run(command, arg)
+            return
+        for conn in self.connections:
+            conn.send((command, arg))
+        errors = [error for error in (conn.recv() for conn in self.connections) if error]
+        if errors:
+            raise RuntimeError("Game shard failed:\n" + errors[0])
+
+    def reset(self, seed=None):
+        """
+        Deals a new game in every row.
+
+        Args:
+            seed (int, optional): Base seed; row i's first episode uses seed + i. Fresh entropy if None.
+
+        Returns:
+            tuple: (observations, info), info holding "action_mask".
+        """
+        self._run("reset", seed)
+        return self.observations, {"action_mask": self.action_masks}
+
+    def step(self, actions):
+        """
+        Makes one move in every game.
+
+        Args:
+            actions (array-like): One action per game, each legal under its row of the last action mask.
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated, info), info holding
+                "action_mask" and "placement" (the final placement where an episode ended, else 0).
+        """
+        self.buffers["actions"][:] = actions
+        self._run("step")
+        b = self.buffers
+        return b["observations"], b["rewards"], b["terminated"], b["truncated"], \
+            {"action_mask": b["action_masks"], "placement": b["placements"]}
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(("close", None))
+        for process in self.processes:
+            process.join()
+        for conn in self.connections:
+            conn.close()
+        self.connections = []
+        self.processes = []
+        self.buffers = self.observations = self.action_masks = None
+        for memory in self.memories.values():
+            memory.close()
+            memory.unlink()
+        self.memories = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def random_actions(action_masks, rng):
+    """A uniformly random legal action per row of a batch of action masks."""
+    scores = rng.random(action_masks.shape) * action_masks
+    return scores.argmax(axis=1)
+
+
+if __name__ == '__main__':
+    # Plays random legal moves and reports env steps per second
+    episodes = int(sys.argv[sys.argv.index("--episodes") + 1]) if "--episodes" in sys.argv else 20
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    fixed_step = "--fixed-step" in sys.argv  # Step combat every tick instead of on scheduled events
+    num_envs = int(sys.argv[sys.argv.index("--envs") + 1]) if "--envs" in sys.argv else 0  # Step a batch of games instead
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 0  # Batch only: worker processes
+
+    if num_envs:
+        policy_rng = np.random.default_rng(seed)
+        with VectorMergeTacticsEnv(num_envs, workers, event_driven=not fixed_step) as envs:
+            obs, info = envs.reset(seed)
+            steps = finished = placement_total = 0
+            start = time.perf_counter()
+            while finished < episodes:
+                obs, rewards, terminated, truncated, info = envs.step(random_actions(info["action_mask"], policy_rng))
+                steps += num_envs
+                finished += int(np.count_nonzero(info["placement"]))
+                placement_total += int(info["placement"].sum())
+            seconds = time.perf_counter() - start
+        print(f"{finished} episodes over {num_envs} games, {steps} steps in {seconds:.2f}s: "
+              f"{steps / seconds:.0f} steps/s, mean placement {placement_total / finished:.2f}")
+    else:
+        env = MergeTacticsEnv(event_driven=not fixed_step)
+        policy_rng = np.random.default_rng(seed)
+        steps = 0
+        placement_total = 0
+        start = time.perf_counter()
+        for episode in range(episodes):
+            obs, info = env.reset(seed + episode)
+            done = False
+            while not done:
+                action = int(policy_rng.choice(np.flatnonzero(info["action_mask"])))
+                obs, reward, terminated, truncated, info = env.step(action)
+                steps += 1
+                done = terminated or truncated
+            placement_total += info["placement"]
+        seconds = time.perf_counter() - start
+
+        print(f"{episodes} episodes, {steps} steps in {seconds:.2f}s: {steps / seconds:.0f} steps/s, "
+              f"mean placement {placement_total / episodes:.2f}")
@@ -0,0 +1,551 @@
+# --- Standard Libraries ---
+import math
+import numpy as np
+
+# --- Globals / Shared State ---
+from .constants import CRIT_CHANCE, CRIT_MULTIPLIER, TIME_EPSILON
+
+# --- Combat ---
+from .battle import Battle, DEFAULT_DT, DEFAULT_MAX_TIME
+
+# --- Board / Hex Utilities ---
+from .hex_utils import BOARD_CELLS, DISTANCES, NEIGHBORS
+
+# --- Random Streams ---
+from .rng import BATTLE_STREAM, KERNEL_STREAM, RandomStream
+
+# --- Unit kinds the kernel can run ---
+KIND_DEFAULT = 0        # Single-target hit, the object engine's _default_attack
+KIND_BOMBER = 1         # Hits the target, then splashes enemies next to it if it survived
+KIND_VALKYRIE = 2       # Hits the target, then every other enemy next to the Valkyrie
+KIND_PRINCESS = 3       # Same splash pattern as the Bomber
+
+UNIT_KINDS = {
+    "knight": KIND_DEFAULT,
+    "archer": KIND_DEFAULT,
+    "goblin": KIND_DEFAULT,
+    "barbarian": KIND_DEFAULT,
+    "pekka": KIND_DEFAULT,
+    "dart-goblin": KIND_DEFAULT,
+    "skeleton": KIND_DEFAULT,
+    "bomber": KIND_BOMBER,
+    "valkyrie": KIND_VALKYRIE,
+    "princess": KIND_PRINCESS,
+}
+
+# --- Board tables as arrays ---
+NUM_CELLS = len(BOARD_CELLS)
+OFF_BOARD = NUM_CELLS   # Padding cell for dead units: never free, FAR from everything
+NO_UNIT = -1            # Empty cell / no target; indexes the always-empty padding slot
+FAR = 1 << 20           # Stands in for an infinite distance in integer arrays
+NEVER = np.iinfo(np.int64).max  # Wake tick of a battle with nothing left to happen
+
+CELL_INDEX = {cell: i for i, cell in enumerate(BOARD_CELLS)}
+
+DIST = np.full((NUM_CELLS + 1, NUM_CELLS + 1), FAR, dtype=np.int32)
+for _a, _i in CELL_INDEX.items():
+    for _b, _j in CELL_INDEX.items():
+        DIST[_i, _j] = DISTANCES[_a][_b]
+
+NEIGHBOR_TABLE = np.full((NUM_CELLS + 1, 6), OFF_BOARD, dtype=np.int32)
+for _cell, _i in CELL_INDEX.items():
+    for _k, _nbr in enumerate(NEIGHBORS[_cell]):
+        NEIGHBOR_TABLE[_i, _k] = CELL_INDEX[_nbr]
+
+
+def kernel_supports(battle):
+    """
+    True if a set-up Battle can run in the kernel: every unit has a supported
+    attack and no synergy that changes stats mid-combat is active. Start-of-round
+    synergies (Brawler HP, Noble multipliers, Assassin placement and crits,
+    Juggernaut shields) are already baked into the units by Battle.setup().
+    """
+    for unit in battle.units:
+        if unit.card.name.lower() not in UNIT_KINDS:
+            return False
+    for player in (battle.p1, battle.p2):
+        if (
+            player.clan_manager.clan_count >= 2
+            or player.avenger_manager.active_bonus
+            or player.ranger_manager.active
+            or player.ace_manager.active
+            or player.undead_manager.cursed_enemies
+            or player.thrower_synergy.thrower_active
+        ):
+            return False
+    return True
+
+
+class BatchedCombat:
+    """
+    Struct-of-arrays state for many set-up battles, advanced in lockstep.
+
+    Row b is battle b and column j is battle.units[j], so every per-unit value
+    (HP, cell, cooldowns, target slot, stun and shield timers) is one (N, U + 1)
+    array. The extra column is an always-dead padding slot that NO_UNIT indexes,
+    which keeps "no target" and "empty cell" lookups branch-free.
+
+    Each tick walks the unit slots in order, as Battle.step does, but runs slot
+    j of every battle with one set of array operations, so units within one
+    battle still act one after another. Movement uses the same "steps to get in
+    range" distance field as the object engine; retargeting compares hex
+    distance to range instead of blocked-path distance.
+
+    Most ticks change nothing in a given battle: units wait on attack and move
+    cooldowns. run() therefore only steps a battle on the ticks where something
+    can happen in it (see _schedule), and skips ticks where no battle is due,
+    with results identical to stepping every battle on every tick.
+
+    Crit rolls come a whole array at a time from a NumPy Generator seeded
+    with the RandomStream's seed sequence. simulate_combat_batched derives
+    that stream fresh for each kernel run, so a run is reproducible without
+    the stream's own draws or state being involved.
+
+    Args:
+        battles (list): Set-up Battles that kernel_supports().
+        rng (RandomStream, optional): Stream whose seed sequence seeds the crit rolls; fresh entropy if None.
+    """
+
+    def __init__(self, battles, rng=None):
+        self.battles = battles
+        self.rng = rng if rng is not None else RandomStream()
+        self.generator = np.random.default_rng(self.rng.seed_sequence)
+
+        n = len(battles)
+        shape = (n, max(len(battle.units) for battle in battles) + 1)
+        self.kind = np.zeros(shape, dtype=np.int8)
+        self.side = np.full(shape, -1, dtype=np.int8)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.hp = np.zeros(shape)
+        self.damage = np.zeros(shape)
+        self.taken_mult = np.ones(shape)
+        self.shield_hp = np.zeros(shape)
+        self.shield_time = np.zeros(shape)
+        self.stun = np.zeros(shape)
+        self.crit_chance = np.zeros(shape)
+        self.crit_mult = np.ones(shape)
+        self.range = np.zeros(shape, dtype=np.int32)
+        self.attack_interval = np.ones(shape)
+        self.move_interval = np.ones(shape)
+        self.cell = np.full(shape, OFF_BOARD, dtype=np.int32)
+        self.target = np.full(shape, NO_UNIT, dtype=np.int32)
+        self.last_attack = np.full(shape, np.nan)     # NaN = no attack timer running
+        self.move_cooldown = np.zeros(shape)
+        self.last_update = np.zeros(shape)
+        self.cell_unit = np.full((n, NUM_CELLS + 1), NO_UNIT, dtype=np.int32)
+
+        self.finished = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, -1, dtype=np.int8)    # 0 = p1, 1 = p2, -1 = draw
+        self.remaining = np.zeros(n, dtype=np.int32)
+        self.wake = np.zeros(n, dtype=np.int64)        # Next tick the battle has to be stepped on
+        self.changed = np.zeros(n, dtype=bool)          # A unit moved or died during the current tick
+
+        for b, battle in enumerate(battles):
+            self._load(b, battle)
+        self.shielded = np.nonzero(self.shield_time > 0)  # (battles, slots) with a shield timer running
+
+    def _load(self, b, battle):
+        for j, unit in enumerate(battle.units):
+            kind = UNIT_KINDS[unit.card.name.lower()]
+            self.kind[b, j] = kind
+            self.side[b, j] = 0 if unit.owner == battle.p1 else 1
+            self.alive[b, j] = unit.alive
+            self.hp[b, j] = unit.current_hp
+            self.damage[b, j] = unit.get_damage()
+            self.taken_mult[b, j] = unit.noble_damage_taken_multiplier
+            self.shield_hp[b, j] = unit.juggernaut_shield_hp
+            self.shield_time[b, j] = unit.status_effects.get("juggernaut_shield", 0.0)
+            self.stun[b, j] = unit.status_effects.get("stunned", 0.0)
+            if kind == KIND_DEFAULT:
+                self.crit_chance[b, j] = unit.crit_chance
+                self.crit_mult[b, j] = unit.crit_mult
+            else:
+                self.crit_chance[b, j] = CRIT_CHANCE
+                self.crit_mult[b, j] = CRIT_MULTIPLIER
+            self.range[b, j] = unit.get_range()
+            self.attack_interval[b, j] = unit.get_attack_speed()
+            self.move_interval[b, j] = 1.0 / unit.get_move_speed()
+            self.move_cooldown[b, j] = unit.move_cooldown
+            self.last_update[b, j] = unit.last_update_time
+
+            pos = unit.get_position()
+            if unit.alive and pos is not None:
+                self.cell[b, j] = CELL_INDEX[pos]
+                self.cell_unit[b, CELL_INDEX[pos]] = j
+
+        self.finished[b] = battle.finished
+
+    # === STEPPING ===
+
+    def run(self, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME):
+        """Step every battle on a fixed dt clock until all end or max_time runs out."""
+        tick = 0
+        last_tick = 0
+        while tick * dt < max_time:
+            current_time = tick * dt
+            due = np.flatnonzero(~self.finished & (self.wake <= tick))
+            self._count_down(tick, current_time)
+            if tick:
+                self._catch_up(due, (tick - 1) * dt)
+            self.step(current_time, due)
+            self._schedule(due, tick, dt)
+
+            last_tick = tick
+            live = ~self.finished
+            if not live.any():
+                return
+            if self.shielded[0].size:
+                tick += 1   # Shield timers count down on every tick, asleep or not
+            else:
+                tick = max(tick + 1, int(min(self.wake[live].min(), math.ceil(max_time / dt))))
+        self._catch_up(np.flatnonzero(~self.finished), last_tick * dt)
+
+    def step(self, current_time, rows=None):
+        """Advance every unfinished battle (or just those in rows) by one tick."""
+        if rows is None:
+            rows = np.flatnonzero(~self.finished)
+        self.changed[rows] = False
+        for j in range(self.alive.shape[1] - 1):
+            slot_rows = rows[self.alive[rows, j]]
+            if slot_rows.size:
+                self._update_slot(slot_rows, j, current_time)
+        self._check_end(rows)
+
+    def _count_down(self, tick, current_time):
+        """Shield timers in battles asleep on this tick, counted down exactly as _update_slot would."""
+        rows, slots = self.shielded
+        running = self.alive[rows, slots] & ~self.finished[rows] & (self.shield_time[rows, slots] > 0)
+        rows, slots = self.shielded = rows[running], slots[running]
+        asleep = self.wake[rows] > tick
+        rows, slots = rows[asleep], slots[asleep]
+
+        time_step = current_time - self.last_update[rows, slots]
+        self.last_update[rows, slots] = current_time
+        shield_time = _tick_timer(self.shield_time[rows, slots], time_step)
+        self.shield_time[rows, slots] = shield_time
+        expired = shield_time <= 0
+        self.shield_hp[rows[expired], slots[expired]] = 0.0
+
+    def _catch_up(self, rows, previous_time):
+        """Status clocks of battles that sat out ticks, as if every living unit had been updated at previous_time."""
+        alive = self.alive[rows]
+        self.last_update[rows] = np.where(alive, previous_time, self.last_update[rows])
+
+    def _schedule(self, rows, tick, dt):
+        """
+        Sets the next tick each battle just stepped has to be stepped on again, if nothing else changes first.
+
+        A battle is due on the next tick if a unit moved or died in it, since units
+        that acted earlier in the tick may now pick another target, or while a unit
+        is stunned. Otherwise targets and ranges stay as they are, so the battle
+        sleeps until a unit's attack cooldown (in range) or move cooldown (out of
+        range) is ready. A unit whose move was ready this tick but is still out of
+        range found no free step, and will not find one until something moves.
+        Shields only absorb damage, so a sleeping battle's shield timers are
+        counted down by _count_down instead of waking it.
+        """
+        rows = rows[~self.finished[rows]]
+        if not rows.size:
+            return
+        alive = self.alive[rows]
+        target = self.target[rows]
+        cell = self.cell[rows]
+        has_target = alive & np.take_along_axis(alive, target, axis=1)
+        in_range = has_target & (DIST[cell, np.take_along_axis(cell, target, axis=1)] <= self.range[rows])
+
+        last_attack = self.last_attack[rows]
+        no_timer = np.isnan(last_attack)
+        attack = _first_ready_tick(np.where(no_timer, 0.0, last_attack), self.attack_interval[rows], dt)
+        attack[no_timer] = tick + 1
+        move = _first_ready_tick(self.move_cooldown[rows], self.move_interval[rows], dt)
+        move[move <= tick] = NEVER
+        wake = np.where(in_range, attack, np.where(has_target, move, NEVER)).min(axis=1)
+
+        stunned = alive & (self.stun[rows] > 0)
+        busy = self.changed[rows] | stunned.any(axis=1)
+        self.wake[rows] = np.where(busy, tick + 1, np.maximum(wake, tick + 1))
+
+    def _update_slot(self, rows, j, current_time):
+        # --- STATUS EFFECTS ---
+        time_step = current_time - self.last_update[rows, j]
+        self.last_update[rows, j] = current_time
+        self.stun[rows, j] = _tick_timer(self.stun[rows, j], time_step)
+        shield_time = _tick_timer(self.shield_time[rows, j], time_step)
+        self.shield_time[rows, j] = shield_time
+        self.shield_hp[rows[shield_time <= 0], j] = 0.0
+
+        rows = rows[self.stun[rows, j] <= 0]
+        if not rows.size:
+            return
+
+        # --- TARGETING ---
+        # One distance table serves target choice and the range check; nothing moves in between
+        dist = self._enemy_distances(rows, j)
+        idx = np.arange(rows.size)
+        target = self.target[rows, j]
+        has_target = self.alive[rows, target]
+        target = np.where(has_target, self._retarget(dist, rows, j, target), dist.argmin(axis=1))
+        target_dist = dist[idx, target]
+        chosen = target_dist < FAR
+        switched = chosen & (target != self.target[rows, j])
+        self.target[rows[switched], j] = target[switched]
+        self.last_attack[rows[switched], j] = np.nan
+
+        # --- ATTACK ---
+        in_range = chosen & (target_dist <= self.range[rows, j])
+
+        attackers = rows[in_range]
+        last = self.last_attack[attackers, j]
+        starting = np.isnan(last)
+        ready = ~starting & (current_time - last >= self.attack_interval[attackers, j])
+        self.last_attack[attackers[starting | ready], j] = current_time
+        if ready.any():
+            self._attack(attackers[ready], j)
+
+        # --- MOVEMENT ---
+        movers = rows[chosen & ~in_range]
+        movers = movers[current_time - self.move_cooldown[movers, j] >= self.move_interval[movers, j]]
+        if movers.size:
+            self._move(movers, j, current_time)
+
+    def _enemy_distances(self, rows, j):
+        """(len(rows), U + 1) hex distances from slot j to every unit, FAR for non-enemies."""
+        dist = DIST[self.cell[rows, j][:, None], self.cell[rows]]
+        enemy = self.alive[rows] & (self.side[rows] != self.side[rows, j][:, None])
+        return np.where(enemy, dist, FAR)
+
+    def _retarget(self, dist, rows, j, target):
+        """Current target per row, or the enemy fewer steps from range if one is strictly closer."""
+        steps = np.where(dist < FAR, np.maximum(dist - self.range[rows, j][:, None], 0), FAR)
+        idx = np.arange(rows.size)
+        best = steps.argmin(axis=1)
+        return np.where(steps[idx, best] < steps[idx, target], best, target)
+
+    # === ATTACKS ===
+
+    def _attack(self, rows, j):
+        kind = self.kind[rows, j]
+        target = self.target[rows, j]
+
+        default = kind == KIND_DEFAULT
+        if default.any():
+            r = rows[default]
+            damage = self.damage[r, j]
+            crit = self._uniform(r.size) < self.crit_chance[r, j]
+            damage = np.where(crit, np.trunc(damage * self.crit_mult[r, j]), damage)
+            self._apply_damage(r, target[default], damage)
+
+        # Bomber and Princess splash around the target, only if it survived the hit
+        target_splash = (kind == KIND_BOMBER) | (kind == KIND_PRINCESS)
+        if target_splash.any():
+            r, t = rows[target_splash], target[target_splash]
+            self._apply_damage(r, t, self._roll(r, j))
+            survived = self.alive[r, t]
+            self._splash(r[survived], j, self.cell[r[survived], t[survived]])
+
+        valkyrie = kind == KIND_VALKYRIE
+        if valkyrie.any():
+            r, t = rows[valkyrie], target[valkyrie]
+            self._apply_damage(r, t, self._roll(r, j))
+            self._splash(r, j, self.cell[r, j], exclude=t)
+
+    def _roll(self, rows, j):
+        """Damage of slot j in each row, with an independent crit roll per row."""
+        crit = self._uniform(rows.size) < self.crit_chance[rows, j]
+        return self.damage[rows, j] * np.where(crit, self.crit_mult[rows, j], 1.0)
+
+    def _uniform(self, size):
+        """`size` floats in [0, 1) from the crit generator, one per row."""
+        return self.generator.random(size)
+
+    def _splash(self, rows, j, centre, exclude=None):
+        """Hit every enemy of slot j standing next to centre, one neighbour direction at a time."""
+        side = self.side[rows, j]
+        for k in range(NEIGHBOR_TABLE.shape[1]):
+            occupant = self.cell_unit[rows, NEIGHBOR_TABLE[centre, k]]
+            hit = (occupant != NO_UNIT) & (self.side[rows, occupant] != side)
+            if exclude is not None:
+                hit &= occupant != exclude
+            if hit.any():
+                self._apply_damage(rows[hit], occupant[hit], self._roll(rows[hit], j))
+
+    def _apply_damage(self, rows, victims, damage):
+        """take_damage for one victim per row: Noble reduction, then shield, then HP."""
+        damage = damage * self.taken_mult[rows, victims]
+        absorbed = np.minimum(self.shield_hp[rows, victims], damage)
+        self.shield_hp[rows, victims] -= absorbed
+        damage = damage - absorbed
+
+        hit = damage > 0
+        rows, victims = rows[hit], victims[hit]
+        hp = self.hp[rows, victims] - damage[hit]
+        killed = (hp <= 0) & self.alive[rows, victims]
+        hp[killed] = 0.0
+        self.hp[rows, victims] = hp
+        if killed.any():
+            self._kill(rows[killed], victims[killed])
+
+    def _kill(self, rows, victims):
+        self.changed[rows] = True
+        self.alive[rows, victims] = False
+        self.cell_unit[rows, self.cell[rows, victims]] = NO_UNIT
+        self.cell[rows, victims] = OFF_BOARD
+
+        # Anyone targeting the dead unit picks a new target on its next update
+        targets = self.target[rows]
+        targets[targets == victims[:, None]] = NO_UNIT
+        self.target[rows] = targets
+
+    # === MOVEMENT ===
+
+    def _move(self, rows, j, current_time):
+        """Step slot j one cell along a shortest path into range of its target."""
+        idx = np.arange(rows.size)
+        own = self.cell[rows, j]
+        goal = self.cell[rows, self.target[rows, j]]
+
+        free = self.cell_unit[rows] == NO_UNIT
+        free[:, OFF_BOARD] = False
+        free[idx, own] = True
+
+        # Multi-source BFS from every free cell in range, relaxed until it settles
+        field = np.where(free & (DIST[goal] <= self.range[rows, j][:, None]), 0, FAR)
+        while True:
+            relaxed = np.where(free, np.minimum(field, field[:, NEIGHBOR_TABLE].min(axis=2) + 1), FAR)
+            if np.array_equal(relaxed, field):
+                break
+            field = relaxed
+
+        options = NEIGHBOR_TABLE[own]
+        steps = field[idx[:, None], options]
+        best = steps.argmin(axis=1)
+        moving = steps[idx, best] < FAR
+
+        rows, own, dest = rows[moving], own[moving], options[idx, best][moving]
+        self.changed[rows] = True
+        self.cell_unit[rows, own] = NO_UNIT
+        self.cell_unit[rows, dest] = j
+        self.cell[rows, j] = dest
+        self.move_cooldown[rows, j] = current_time
+
+    # === RESULTS ===
+
+    def _check_end(self, rows):
+        live = rows[~self.finished[rows]]
+        alive = self.alive[live]
+        side = self.side[live]
+        p1_units = (alive & (side == 0)).sum(axis=1)
+        p2_units = (alive & (side == 1)).sum(axis=1)
+
+        done = (p1_units == 0) | (p2_units == 0)
+        rows = live[done]
+        self.finished[rows] = True
+        self.winner[rows] = np.where(p1_units[done] > 0, 0, np.where(p2_units[done] > 0, 1, -1))
+        self.remaining[rows] = p1_units[done] + p2_units[done]
+
+    def write_back(self):
+        """Copy unit state and results back onto the Battle objects and their units."""
+        for b, battle in enumerate(self.battles):
+            for j, unit in enumerate(battle.units):
+                unit.alive = bool(self.alive[b, j])
+                unit.current_hp = float(self.hp[b, j])
+                unit.juggernaut_shield_hp = float(self.shield_hp[b, j])
+                _write_timer(unit, "juggernaut_shield", self.shield_time[b, j])
+                _write_timer(unit, "stunned", self.stun[b, j])
+                unit.move_cooldown = float(self.move_cooldown[b, j])
+                unit.last_update_time = float(self.last_update[b, j])
+                last_attack = self.last_attack[b, j]
+                unit.last_attack_time = None if np.isnan(last_attack) else float(last_attack)
+                target = self.target[b, j]
+                unit.current_target = battle.units[target] if target != NO_UNIT and self.alive[b, target] else None
+                unit.row, unit.col = BOARD_CELLS[self.cell[b, j]] if unit.alive else (None, None)
+
+            for row in battle.combined:
+                row[:] = [None] * len(row)
+            for unit in battle.units:
+                if unit.alive:
+                    battle.combined[unit.row][unit.col] = unit
+
+            if self.finished[b] and not battle.finished:
+                battle.finished = True
+                winner = self.winner[b]
+                if winner >= 0:
+                    battle.winner = battle.p1 if winner == 0 else battle.p2
+                    battle.remaining_units = int(self.remaining[b])
+
+
+def _tick_timer(remaining, time_step):
+    """Count running timers down; like update_status_effects, ones at or below TIME_EPSILON expire to 0."""
+    left = remaining - time_step
+    return np.where((remaining > 0) & (left > TIME_EPSILON), left, 0.0)
+
+
+def _first_ready_tick(last, interval, dt):
+    """
+    Earliest tick whose time t = tick * dt passes t - last >= interval, the check
+    _update_slot makes, starting from the nearest tick and correcting for rounding.
+    """
+    tick = np.ceil((last + interval) / dt)
+    tick = np.where((tick - 1) * dt - last >= interval, tick - 1, tick)
+    tick = np.where(tick * dt - last >= interval, tick, tick + 1)
+    return tick.astype(np.int64)
+
+
+def _write_timer(unit, effect, remaining):
+    if remaining > 0:
+        unit.status_effects[effect] = float(remaining)
+    else:
+        unit.status_effects.pop(effect, None)
+
+
+def simulate_combat_batched(matchups, round_number=None, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME, rng=None):
+    """
+    Simulates many independent combat rounds at once without any rendering.
+
+    Matchups the kernel supports (see kernel_supports) run together in one
+    BatchedCombat; the rest run one at a time on the object engine, exactly as
+    simulate_combat_headless would. The kernel does not emit per-hit events.
+    Each player may only appear in one matchup per call.
+
+    Args:
+        matchups (list): [player, opponent] pairs, with player.opponent already set.
+        round_number (int, optional): Current round, forwarded to end-of-combat synergies.
+        dt (float): Fixed simulation step in seconds.
+        max_time (float): Simulated seconds before a battle is called a draw.
+        rng (RandomStream, optional): Parent stream. Object-engine battles get the
+            child stream derive(BATTLE_STREAM, i) and the kernel draws crits from
+            derive(KERNEL_STREAM). Fresh entropy if None.
+
+    Returns:
+        list: One ([], winner_player_object_or_None, remaining_units_count_or_None)
+        tuple per matchup, in order.
+    """
+    if rng is None:
+        rng = RandomStream()
+
+    battles = []
+    batched = []
+    for i, players in enumerate(matchups):
+        battle = Battle(players, round_number, rng.derive(BATTLE_STREAM, i))
+        if not battle.setup():
+            battles.append(None)
+            continue
+        battles.append(battle)
+        if kernel_supports(battle):
+            batched.append(battle)
+        else:
+            battle.run(dt, max_time)
+
+    if batched:
+        combat = BatchedCombat(batched, rng.derive(KERNEL_STREAM))
+        combat.run(dt, max_time)
+        combat.write_back()
+
+    results = []
+    for battle in battles:
+        if battle is None:
+            results.append(([], None, None))
+            continue
+        battle.finish()
+        results.append(([], battle.winner, battle.remaining_units))
+    return results
@@ -0,0 +1,507 @@
+# --- Globals / Shared State ---
+from .constants import BOARD_ROWS, BOARD_COLS
+
+# --- Modifiers / Synergies ---
+from .modifiers import (
+    ClanSynergyManager,
+    BrawlerSynergyManager,
+    NobleSynergyManager,
+    GoblinSynergyManager,
+    ThrowerSynergyManager,
+    UndeadSynergyManager,
+    AvengerSynergyManager,
+    RangerSynergyManager,
+    AceSynergyManager,
+    AssassinSynergyManager,
+    JuggernautSynergyManager
+)
+
+# --- Combat / Player Units ---
+from .combat_unit import spawn_skeleton
+
+# --- Board / Hex Utilities ---
+from .board_utils import (
+    OccupancyIndex,
+    combine_grids,
+)
+from .hex_utils import (
+    hex_distance,
+)
+from .pathfinding import DistanceFieldCache
+from .scheduler import run_event_driven
+
+# --- Board Hashing ---
+from .zobrist import BoardHash
+
+# --- Simulation Clock ---
+from .clock import FixedStepClock
+
+# --- Battle State ---
+from .context import BattleContext
+
+# --- Replays ---
+from .replay import ReplayRecorder
+
+# --- Event Log ---
+from .event_log import (
+    log,
+    DEBUG,
+    WARNING,
+    ATTACK,
+    MOVE,
+    SPAWN,
+    STATUS,
+    TARGET,
+)
+
+DEFAULT_DT = 1 / 60         # Fixed simulation step for headless combat (seconds)
+DEFAULT_MAX_TIME = 300.0    # Simulated seconds before a headless battle is called a draw
+
+
+def place_unplaced_units(players):
+    """
+    Puts field units without a cell (those that died last battle) back on their owner's grid at random.
+
+    Battle.setup() calls it before combining the grids; doing it earlier, with
+    the same player streams, places them identically.
+    """
+    for player in players:
+        for unit in player.field:
+            if unit.row is None or unit.col is None:
+                player.place_on_grid_random(unit)
+
+
+class Battle:
+    """
+    A single combat round between two players, advanced by explicit timestamps.
+
+    The battle owns the combined grid, the unit list and the per-round synergy
+    managers, but knows nothing about rendering or wall-clock time. Callers
+    advance its clock and call step(), which lets the live pygame viewer and
+    the fixed-step engine (FixedStepClock) and the event-driven engine
+    (EventDrivenClock) share the same rules and timings.
+
+    Everything units share during the fight (bombs, occupancy, the clock and
+    the RandomStream for crits and Goblin rewards) lives in the battle's own
+    BattleContext, so a battle's result depends only on its stream and
+    battles can run side by side in one process.
+    """
+
+    def __init__(self, players, round_number=None, rng=None, clock=None):
+        self.players = players
+        self.round_number = round_number
+        self.p1 = None
+        self.p2 = None
+        self.finished = False
+        self.winner = None
+        self.remaining_units = None
+        self.on_attack = None   # Optional callback(unit, attacker_pos, target_pos) after a landed attack
+        self.on_step = None     # Optional callback(battle) after every step, e.g. a ReplayRecorder
+        self.path_cache = DistanceFieldCache()
+        self.context = BattleContext(rng, round_number, clock)
+        self.steps = 0          # step() calls that advanced the battle, for benchmarks
+
+    @property
+    def units(self):
+        """Every unit in the battle, spawns included."""
+        return self.context.units
+
+    @property
+    def combined(self):
+        """The combined 8x5 grid, once setup() has run."""
+        return self.context.combined
+
+    @property
+    def occupancy(self):
+        return self.context.occupancy
+
+    @property
+    def rng(self):
+        return self.context.rng
+
+    def setup(self):
+        """
+        Restore units, build the combined grid and apply start-of-combat synergies.
+
+        Returns:
+            bool: False if there is nothing to simulate (no opponent or no units).
+        """
+        players = self.players
+        if not players or len(players) < 2 or not players[0].opponent:
+            return False
+
+        # --- INITIAL UNIT RESET & PLACEMENT ---
+        for player in players:
+            for unit in player.field:
+                unit.restore_full_health()
+        place_unplaced_units(players)
+
+        # --- COMBINE PLAYER GRIDS ---
+        p1, p2 = players[0], players[0].opponent
+        self.p1, self.p2 = p1, p2
+        combined = combine_grids(p1, p2)
+        context = self.context
+        context.combined = combined
+
+        # Gather all units into a flat list
+        units = []
+        seen_units = set()
+        for r in range(BOARD_ROWS):
+            for c in range(BOARD_COLS):
+                unit = combined[r][c]
+                if unit and unit not in seen_units:
+                    units.append(unit)
+                    seen_units.add(unit)
+        context.units = units
+
+        if not units:
+            return False
+
+        context.occupancy = OccupancyIndex(units)
+        context.board_hash = BoardHash.combine(p1.board_hash, p2.board_hash)
+        context.top_player = p2
+        for unit in units:
+            unit.context = context
+
+        p1.clan_manager = ClanSynergyManager(p1)  # pass all units on the board
+        p2.clan_manager = ClanSynergyManager(p2)  # pass all units on the board
+        p1.clan_manager.setup_round()  # counts Clan cards at start of round
+        p2.clan_manager.setup_round()  # counts Clan cards at start of round
+        p1.brawler_manager = BrawlerSynergyManager(p1)
+        p2.brawler_manager = BrawlerSynergyManager(p2)
+        p1.brawler_manager.setup_round()
+        p2.brawler_manager.setup_round()
+        p1.noble_manager = NobleSynergyManager(p1, False)
+        p2.noble_manager = NobleSynergyManager(p2, True)
+        p1.noble_manager.setup_round()
+        p2.noble_manager.setup_round()
+        p1.goblin_manager = GoblinSynergyManager(p1, context)
+        p2.goblin_manager = GoblinSynergyManager(p2, context)
+        p1.goblin_manager.setup_round()
+        p2.goblin_manager.setup_round()
+        p1.thrower_synergy = ThrowerSynergyManager(p1)
+        p2.thrower_synergy = ThrowerSynergyManager(p2)
+        p1.thrower_synergy.setup_round()
+        p2.thrower_synergy.setup_round()
+        p1.undead_manager = UndeadSynergyManager(p1)
+        p2.undead_manager = UndeadSynergyManager(p2)
+        p1.undead_manager.setup_round()
+        p2.undead_manager.setup_round()
+        p1.avenger_manager = AvengerSynergyManager(p1)
+        p2.avenger_manager = AvengerSynergyManager(p2)
+        p1.avenger_manager.setup_round()
+        p2.avenger_manager.setup_round()
+        p1.ranger_manager = RangerSynergyManager(p1)
+        p2.ranger_manager = RangerSynergyManager(p2)
+        p1.ranger_manager.setup_round()
+        p2.ranger_manager.setup_round()
+        p1.ace_manager = AceSynergyManager(p1)
+        p2.ace_manager = AceSynergyManager(p2)
+        p1.ace_manager.setup_round()
+        p2.ace_manager.setup_round()
+        p1.assassin_manager = AssassinSynergyManager(p1)
+        p2.assassin_manager = AssassinSynergyManager(p2)
+        p1.assassin_manager.setup_round(units, combined, False)
+        p2.assassin_manager.setup_round(units, combined, True)
+        p1.juggernaut_manager = JuggernautSynergyManager(p1)
+        p2.juggernaut_manager = JuggernautSynergyManager(p2)
+        p1.juggernaut_manager.setup_round(combined, False)
+        p2.juggernaut_manager.setup_round(combined, True)
+
+        for unit in units:
+            if getattr(unit.card, "name", "").lower() == "prince":
+                unit.prince_combat_start_ability([u for u in units if u.alive], combined)
+
+        # A side that starts with nothing alive ends the battle as a draw
+        if not self._side_alive(p1) or not self._side_alive(p2):
+            self.finished = True
+
+        return True
+
+    def _side_alive(self, player):
+        return any(u.alive and u.owner == player for u in self.units)
+
+    def step(self):
+        """Advance the battle to the current time of its clock."""
+        if self.finished:
+            return
+        self.steps += 1
+        clock = self.context.clock
+        current_time = clock.now
+
+        units = self.context.units
+
+        # --- UNIT LOGIC LOOP (handle newly spawned units dynamically) ---
+        i = 0
+        while i < len(units):
+            unit = units[i]
+            if unit.alive:
+                self._update_unit(unit, current_time)
+            # AFTER ATTACK/MOVE: newly spawned units are already in 'units', so they'll be processed in subsequent iterations
+            i += 1  # increment manually to include new units
+
+        self._update_bombs(clock.elapsed)
+        self._spawn_skeletons()
+        self._check_end()
+        if self.on_step:
+            self.on_step(self)
+
+    def _update_unit(self, unit, current_time):
+        context = self.context
+        units = context.units
+        combined = context.combined
+
+        # ✅ Clan synergy check
+        unit.owner.clan_manager.trigger(unit)
+        unit.owner.avenger_manager.update_last_standing()
+
+        # Update status effects
+        time_step = current_time - getattr(unit, 'last_update_time', current_time)
+        unit.update_status_effects(time_step)
+        unit.last_update_time = current_time
+
+        if not unit.can_act():
+            return
+
+        # Target acquisition
+        if not unit.current_target or not unit.current_target.alive or getattr(unit.current_target, 'invisible', False):
+            # Only consider alive and visible enemies
+            visible_enemies = [u for u in units if u.alive and not getattr(u, 'invisible', False) and u.owner != unit.owner]
+            if visible_enemies:
+                closest_enemy, _ = unit.find_closest_enemy(visible_enemies)
+                unit.current_target = closest_enemy
+                unit.is_attacking = False
+                unit.last_attack_time = None
+
+        # Retargeting
+        else:
+            occupied, occupancy_key = self._occupancy()
+            new_target = unit.should_retarget(units, combined, self.path_cache, occupied, occupancy_key)
+            if new_target and new_target != unit.current_target and not getattr(new_target, 'invisible', False):
+                log.emit(TARGET, "🔄 {unit} is retargeting from {old_target} to {target}", DEBUG,
+                         unit=unit.card.name, old_target=unit.current_target.card.name, target=new_target.card.name)
+                unit.current_target = new_target
+                unit.last_attack_time = None
+
+        # ATTACK LOGIC
+        if unit.current_target is not None and unit.is_in_range_of(unit.current_target):
+            unit.is_attacking = True
+            if unit.last_attack_time is None:
+                unit.last_attack_time = current_time
+            elif unit.can_attack(current_time):
+                if unit.current_target.alive and not getattr(unit.current_target, 'invisible', False):
+                    self._perform_attack(unit, current_time)
+                unit.last_attack_time = current_time
+        else:
+            unit.is_attacking = False
+
+        # MOVEMENT LOGIC
+        if unit.current_target and unit.current_target.alive and unit.alive:
+            self._move_unit(unit, current_time)
+
+    def _perform_attack(self, unit, current_time):
+        context = self.context
+        units = context.units
+        combined = context.combined
+        target = unit.current_target
+
+        # Perform unit-specific attack
+        try:
+            attacker_pos = unit.get_position()
+            target_pos = target.get_position()
+            attack_result = unit.attack(target, current_time, units, combined)
+            unit.owner.ranger_manager.on_attack(unit)
+            if attack_result:
+                unit.last_attack_time = current_time
+                log.emit(MOVE, "Position of {unit} [{owner}]: {pos}", DEBUG,
+                         unit=unit.card.name, owner=unit.owner.name, pos=unit.get_position())
+                if self.on_attack:
+                    self.on_attack(unit, attacker_pos, target_pos)
+
+        except Exception as e:
+            attacker_name = getattr(unit.card, 'name', 'Unknown')
+            target_name = getattr(unit.current_target.card, 'name', 'Unknown') if unit.current_target else 'None'
+            attacker_pos = unit.get_position() if hasattr(unit, 'get_position') else ('?', '?')
+            target_pos = unit.current_target.get_position() if unit.current_target and hasattr(unit.current_target, 'get_position') else ('?', '?')
+            attacker_owner = getattr(unit.owner, 'name', 'Unknown')
+            target_owner = getattr(unit.current_target.owner, 'name', 'Unknown') if unit.current_target else 'None'
+            attacker_hp = getattr(unit, 'current_hp', 'Unknown')
+            target_hp = getattr(unit.current_target, 'current_hp', 'Unknown') if unit.current_target else 'None'
+
+            log.emit(ATTACK, "⚠️ Attack error: {error}\n"
+                             "Attacker: {unit} (Owner: {owner}, HP: {hp}, Pos: {pos})\n"
+                             "Target: {target} (Owner: {target_owner}, HP: {target_hp}, Pos: {target_pos})", WARNING,
+                     error=e, unit=attacker_name, owner=attacker_owner, hp=attacker_hp, pos=attacker_pos,
+                     target=target_name, target_owner=target_owner, target_hp=target_hp, target_pos=target_pos)
+
+            # Optional: prevent further crashing by only calling take_damage if current_target is valid
+            if unit.current_target and getattr(unit.current_target, 'alive', False):
+                unit.current_target.take_damage(unit.get_damage(), combined, all_units=units, attacker=unit)
+
+    def _move_unit(self, unit, current_time):
+        target_pos = unit.current_target.get_position()
+        if target_pos is None:
+            return
+        if unit.is_in_range_of(unit.current_target) or not unit.can_move(current_time):
+            return
+
+        occupied, occupancy_key = self._occupancy()
+        best_move = self.path_cache.next_move(
+            unit, unit.get_position(), target_pos, unit.get_range(), occupied, occupancy_key
+        )
+
+        if best_move:
+            unit.move_to(*best_move, self.combined)
+            unit.move_cooldown = current_time
+            unit.last_move_time = current_time
+            unit.last_position = best_move
+
+    def _occupancy(self):
+        """Cells held by living units, plus the occupancy version identifying that layout."""
+        occupancy = self.context.occupancy
+        return occupancy, occupancy.version
+
+    def _update_bombs(self, dt):
+        units = self.units
+        bombs = self.context.bombs
+        for bomb in bombs[:]:  # iterate over a copy
+            bomb["timer"] -= dt  # dt = time step per frame
+
+            # Print countdown (rounded to 2 decimals for readability)
+            log.emit(SPAWN, "⏳ Bomb at {pos} exploding in {timer:.2f}s", DEBUG, unit="bomb", pos=bomb['pos'], timer=bomb['timer'])
+
+            if bomb["timer"] <= 0:
+                # Trigger explosion
+                bomb_pos = bomb["pos"]
+                radius = bomb["radius"]
+                damage = bomb["damage"]
+                stun_duration = bomb["stun"]
+
+                for unit in units:
+                    if unit.alive and unit.owner != bomb["owner"] and hex_distance(unit.get_position(), bomb_pos) <= radius:
+                        unit.take_damage(damage, self.combined, units)
+                        unit.status_effects["stunned"] = max(unit.status_effects.get("stunned", 0), stun_duration)
+                        log.emit(STATUS, "💥 Bomb hits {unit} (Owner: {owner}) for {damage} damage and {duration}s stun!",
+                                 unit=unit.card.name, owner=unit.owner.name, damage=damage, effect="stunned", duration=stun_duration)
+
+                bombs.remove(bomb)
+
+    def _spawn_skeletons(self):
+        units = self.units
+        # Spawn skeletons for positions recorded by Skeleton King
+        for unit in units:
+            if unit.card.name.lower() == "skeleton-king":
+                if hasattr(unit, "killed_enemy_this_round"):
+                    for idx, killed_info in enumerate(unit.killed_enemy_this_round):
+                        log.emit(SPAWN, "Entered loop for Skeleton King kills", DEBUG)
+                        pos = killed_info.get("pos")
+                        level = killed_info.get("level")
+                        owner = killed_info.get("owner")
+
+                        log.emit(SPAWN, "🔹 Attempting spawn {attempt}: pos={pos}, level={star}, owner={owner}", DEBUG,
+                                 attempt=idx+1, pos=pos, star=level, owner=owner.name if owner else 'None')
+
+                        if pos is None or owner is None:
+                            log.emit(SPAWN, "⚠️ Skipping spawn: invalid position or owner!", WARNING)
+                            continue
+
+                        # Check if tile is already occupied
+                        if self.occupancy.is_occupied(pos):
+                            log.emit(SPAWN, "⚠️ Cannot spawn skeleton at {pos}, tile is occupied!", WARNING, pos=pos)
+                            continue
+
+                        # Spawn skeleton
+                        skeleton_unit = spawn_skeleton(pos, level, owner, self.context)
+                        if skeleton_unit:
+                            log.emit(SPAWN, "✅ Spawned skeleton at {pos} for {owner} (level {star})", DEBUG,
+                                     pos=pos, owner=owner.name, star=level)
+                        else:
+                            log.emit(SPAWN, "❌ Failed to spawn skeleton at {pos}", WARNING, pos=pos)
+
+                    # Clear after processing
+                    unit.killed_enemy_this_round = []
+                else:
+                    log.emit(SPAWN, "ℹ️ Skeleton King {unit} has no recorded kills", DEBUG, unit=unit.card.name)
+
+    def _check_end(self):
+        # --- CHECK FOR END CONDITION ---
+        p1, p2 = self.p1, self.p2
+        p1_alive = self._side_alive(p1)
+        p2_alive = self._side_alive(p2)
+        if not p1_alive and not p2_alive:
+            self.winner = None
+            self.remaining_units = None
+            self.finished = True
+        elif not p1_alive:
+            self.winner = p2
+            self.remaining_units = len([u for u in self.units if u.alive and u.owner == p2])
+            self.finished = True
+        elif not p2_alive:
+            self.winner = p1
+            self.remaining_units = len([u for u in self.units if u.alive and u.owner == p1])
+            self.finished = True
+
+    def run(self, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME, event_driven=False):
+        """
+        Step a set-up battle on a fixed dt clock until it ends or max_time runs out.
+
+        Args:
+            dt (float): Fixed simulation step in seconds.
+            max_time (float): Simulated seconds before the battle is called a draw.
+            event_driven (bool): Skip ticks where nothing can happen.
+        """
+        if event_driven:
+            run_event_driven(self, self.context.bombs, dt, max_time)
+            return
+
+        clock = self.context.clock = FixedStepClock(dt)
+        while not self.finished and clock.now < max_time:
+            self.step()
+            clock.advance()
+
+    def finish(self):
+        """End-of-combat bookkeeping: goblin rewards and thrower range reset."""
+        p1, p2 = self.p1, self.p2
+        p1.goblin_manager.on_buy_phase_start(self.round_number)
+        p2.goblin_manager.on_buy_phase_start(self.round_number)
+        p1.thrower_synergy.reset_synergy()
+        p2.thrower_synergy.reset_synergy()
+        for unit in self.units:
+            unit.context = None
+
+
+def simulate_combat_headless(players, round_number=None, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME,
+                             event_driven=False, rng=None, replays=None):
+    """
+    Simulates a combat round between two players without any rendering.
+
+    Time is an internal simulation clock advanced by a fixed dt per step, so a
+    battle runs as fast as the CPU allows instead of in real time. Battles still
+    running after max_time simulated seconds are treated as a draw.
+
+    With event_driven=True the battle only steps on ticks where a cooldown,
+    status effect or bomb can expire (see scheduler.run_event_driven) instead
+    of on every tick.
+
+    Args:
+        players (list): A list containing the two players.
+        round_number (int, optional): Current round, forwarded to end-of-combat synergies.
+        dt (float): Fixed simulation step in seconds.
+        max_time (float): Simulated seconds before the battle is called a draw.
+        event_driven (bool): Skip ticks where nothing can happen.
+        rng (RandomStream, optional): The battle's random stream; fresh entropy if None.
+        replays (list, optional): Record the battle and append its Replay here.
+
+    Returns:
+        tuple: ([], winner_player_object_or_None, remaining_units_count_or_None)
+    """
+    battle = Battle(players, round_number, rng)
+    if not battle.setup():
+        return [], None, None
+
+    recorder = ReplayRecorder(battle) if replays is not None else None
+    battle.run(dt, max_time, event_driven)
+    battle.finish()
+    if recorder:
+        replays.append(recorder.replay())
+    return [], battle.winner, battle.remaining_units
@@ -9,6 +9,9 @@ from .cards import (
     Card
 )
 
+# --- Event Log ---
+from .event_log import log, DEBUG, GAME
+
 def get_occupied_positions(units, reserved_positions=None, excluding_unit=None):
     """
     Returns a set of occupied positions on the board.
@@ -31,6 +34,83 @@ def get_occupied_positions(units, reserved_positions=None, excluding_unit=None):
     occupied.update(reserved_positions)
     return occupied
 
+class OccupancyView:
+    """
+    Read-only view of an OccupancyIndex that treats one unit's cell as free.
+
+    Supports `pos in view` like the sets returned by get_occupied_positions,
+    without copying anything. `version` is the index version it was taken at.
+    """
+    __slots__ = ("_counts", "_excluded_pos", "version")
+
+    def __init__(self, index, excluding_unit=None):
+        self._counts = index.counts
+        self._excluded_pos = excluding_unit.get_position() if excluding_unit is not None and excluding_unit.alive else None
+        self.version = index.version
+
+    def __contains__(self, pos):
+        count = self._counts.get(pos, 0)
+        if pos == self._excluded_pos:
+            count -= 1
+        return count > 0
+
+class OccupancyIndex:
+    """
+    Incrementally maintained set of cells held by living units in one battle.
+
+    Units report their own moves, deaths and spawns, so readers never have to
+    rebuild occupancy from the unit list. Every change bumps `version`, which
+    lets cached paths and distance fields tell when the board has changed.
+    Cells are appended to `freed` as their last unit leaves, so cached
+    routes can check only what opened up since they were planned. Jump
+    reservations are tracked separately and do not affect the version.
+    """
+
+    def __init__(self, units=()):
+        self.counts = {}          # (row, col) -> number of living units on that cell
+        self.reserved = set()     # Cells reserved as Mega Knight jump targets
+        self.freed = []           # Cells that became empty, oldest first
+        self.version = 0
+        for unit in units:
+            if unit.alive and unit.row is not None and unit.col is not None:
+                self.add((unit.row, unit.col))
+
+    def add(self, pos):
+        self.counts[pos] = self.counts.get(pos, 0) + 1
+        self.version += 1
+
+    def remove(self, pos):
+        count = self.counts.get(pos, 0) - 1
+        if count > 0:
+            self.counts[pos] = count
+        elif self.counts.pop(pos, None) is not None:
+            self.freed.append(pos)
+        self.version += 1
+
+    def move(self, old_pos, new_pos):
+        if old_pos is not None:
+            self.remove(old_pos)
+        self.add(new_pos)
+
+    def reserve(self, pos):
+        self.reserved.add(pos)
+
+    def release(self, pos):
+        self.reserved.discard(pos)
+
+    def is_occupied(self, pos):
+        return pos in self.counts
+
+    def is_reserved(self, pos):
+        return pos in self.reserved
+
+    def __contains__(self, pos):
+        return pos in self.counts
+
+    def view(self, excluding_unit=None):
+        """Cheap membership view, optionally ignoring one unit's own cell."""
+        return OccupancyView(self, excluding_unit)
+
 def combine_grids(p1, p2):
     combined_grid = [[None for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
 
@@ -57,6 +137,8 @@ def combine_grids(p1, p2):
     return combined_grid
 
 def print_combined_grid(combined_grid):
+    if not log.enabled(DEBUG):
+        return
     for r in range(BOARD_ROWS):
         row_str = ""
         for c in range(BOARD_COLS):
@@ -71,4 +153,4 @@ def print_combined_grid(combined_grid):
                 star = getattr(unit.card, "star", "?")
                 team = getattr(unit.owner, "name", "Unknown") if hasattr(unit, "owner") else "?"
                 row_str += f"[{name[:3]}{star}T{team[0]}] "
-        print(row_str)
\ No newline at end of file
+        log.emit(GAME, "{grid_row}", DEBUG, grid_row=row_str)
\ No newline at end of file
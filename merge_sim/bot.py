@@ -1,5 +1,3 @@
-import random
-
 def greedy_bot_logic(player, round_number):
     for card in player.hand:
         if card.cost <= player.elixir:
@@ -33,11 +31,11 @@ def combo_seeker_bot_logic(player, round_number):
     return False
 
 def random_bot_logic(player, round_number):
-    action = random.choice(["buy", "wait", "skip"])
+    action = player.rng.choice(["buy", "wait", "skip"])
     if action == "wait" or action == "skip":
         return False
     affordable = [card for card in player.hand if card.cost <= player.elixir]
     if affordable:
-        card = random.choice(affordable)
+        card = player.rng.choice(affordable)
         return player.buy_card(card.name, round_number)
     return False
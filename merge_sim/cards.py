@@ -106,29 +106,51 @@ def create_card(name, star=1):
         return card
 
 class Card:
-    def __init__(self, name, cost, star=1):
-        self.name = name
-        self.cost = cost
-        self.star = star
-        self.base_stats = BASE_TROOP_STATS.get(name, {})
-        self.range = self.base_stats.get("range", 1)
-        self.speed = self.base_stats.get("speed", 1.0)
-        self.attack_speed = self.base_stats.get("attack_speed", 1.0)
-        self.crit_chance = 0.15  # default crit chance
-        self.modifiers = CARD_MODIFIERS.get(name, [])
+    """
+    Immutable card-stat record, interned per (name, cost, star).
 
-    @property
-    def health(self):
-        return self._scaled_stat("health")
+    Card(name, cost, star) returns the one shared instance for that key, with
+    star-scaled health and damage, range, speed, attack interval (attack_speed,
+    in seconds per attack) and trait modifiers computed once. Anything that
+    changes for a single unit, like the Thrower range bonus, lives on the
+    CombatUnit instead.
+    """
+    __slots__ = ("name", "cost", "star", "base_stats", "health", "damage",
+                 "range", "speed", "attack_speed", "crit_chance", "modifiers")
 
-    @property
-    def damage(self):
-        return self._scaled_stat("damage")
+    _interned = {}
 
-    def _scaled_stat(self, key):
-        base = self.base_stats.get(key, 0)
-        multiplier = 2 ** (self.star - 1)
-        return base * multiplier
+    def __new__(cls, name, cost, star=1):
+        key = (name, cost, star)
+        card = cls._interned.get(key)
+        if card is None:
+            card = object.__new__(cls)
+            base_stats = BASE_TROOP_STATS.get(name, {})
+            multiplier = 2 ** (star - 1)
+            fields = {
+                "name": name,
+                "cost": cost,
+                "star": star,
+                "base_stats": base_stats,
+                "health": base_stats.get("health", 0) * multiplier,
+                "damage": base_stats.get("damage", 0) * multiplier,
+                "range": base_stats.get("range", 1),
+                "speed": base_stats.get("speed", 1.0),
+                "attack_speed": base_stats.get("attack_speed", 1.0),
+                "crit_chance": 0.15,  # default crit chance
+                "modifiers": frozenset(CARD_MODIFIERS.get(name, ())),
+            }
+            for attr, value in fields.items():
+                object.__setattr__(card, attr, value)
+            cls._interned[key] = card
+        return card
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"Card is shared between units and cannot be changed (tried to set {attr})")
+
+    def __reduce__(self):
+        # Re-intern on unpickle/deepcopy instead of building a private copy
+        return (Card, (self.name, self.cost, self.star))
 
     def __repr__(self):
         return f"{self.name} ({self.cost}💧, {self.star}✨)"
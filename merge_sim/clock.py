@@ -0,0 +1,40 @@
+class FixedStepClock:
+    """
+    Simulation time advanced by a fixed dt per step, as the headless engine and the live viewer run it.
+
+    Every clock exposes `now` (seconds since combat started) and `elapsed`
+    (seconds since the previous step). Battle.step() reads both, so attack
+    and move cooldowns, status effects, Mega Knight jumps and bomb timers all
+    run on the clock instead of on the machine's speed.
+
+    Args:
+        dt (float): Step length in seconds.
+    """
+
+    def __init__(self, dt=1 / 60):
+        self.dt = dt
+        self.tick = 0
+        self.now = 0.0
+        self.elapsed = 0.0
+
+    def advance(self):
+        """Move on one step."""
+        self.tick += 1
+        self.now = self.tick * self.dt
+        self.elapsed = self.dt
+
+
+class EventDrivenClock(FixedStepClock):
+    """
+    A fixed-step clock that can skip ahead to any later tick.
+
+    The event-driven engine only steps on ticks where something can happen;
+    elapsed covers every tick skipped, so timers advance exactly as if each
+    tick had been stepped.
+    """
+
+    def jump_to(self, tick):
+        """Move on to `tick`, which must not be earlier than the current one."""
+        self.elapsed = (tick - self.tick) * self.dt
+        self.tick = tick
+        self.now = tick * self.dt
@@ -0,0 +1,274 @@
+# --- Standard Libraries ---
+from collections import OrderedDict
+
+# --- Combat ---
+from .battle import Battle, DEFAULT_DT, DEFAULT_MAX_TIME, place_unplaced_units
+
+# --- Board Hashing ---
+from .zobrist import combined_board_key
+
+# --- Game Snapshots ---
+from .snapshot import GameSnapshot
+
+# --- Random Streams ---
+from .rng import RandomStream
+
+# --- Event Log ---
+from .event_log import log
+
+BOTTOM = 0              # Winner side of the matchup's first player
+TOP = 1                 # Winner side of its opponent
+DEFAULT_CAPACITY = 4096
+DEFAULT_SAMPLES = 16
+POLICIES = ("lru", "lfu")
+
+
+def surviving_units(players):
+    """Original units (no skeletons) still alive on both fields: what play_round's damage is based on."""
+    return sum(1 for player in players for unit in player.field
+               if unit.alive and unit.card.name.lower() != "skeleton")
+
+
+class CombatOutcome:
+    """
+    Outcome distribution of one matchup, from repeated seeded battles.
+
+    Each sample is (winner side, surviving units): BOTTOM when the first
+    player won, TOP when its opponent did, None for a draw. Survivors are
+    counted as play_round counts them, so the loser takes survivors + 1
+    damage.
+
+    Args:
+        samples (list): (winner side, surviving units) per battle.
+    """
+
+    __slots__ = ("samples", "win_probability", "loss_probability", "draw_probability",
+                 "expected_survivors", "expected_damage_dealt", "expected_damage_taken")
+
+    def __init__(self, samples):
+        self.samples = tuple(samples)
+        n = len(self.samples)
+        wins = [survivors for side, survivors in self.samples if side == BOTTOM]
+        losses = [survivors for side, survivors in self.samples if side == TOP]
+        self.win_probability = len(wins) / n
+        self.loss_probability = len(losses) / n
+        self.draw_probability = 1 - self.win_probability - self.loss_probability
+        self.expected_survivors = sum(survivors for _, survivors in self.samples) / n
+        self.expected_damage_dealt = sum(survivors + 1 for survivors in wins) / n
+        self.expected_damage_taken = sum(survivors + 1 for survivors in losses) / n
+
+    def sample(self, rng):
+        """One (winner side, surviving units) drawn from the distribution."""
+        return rng.choice(self.samples)
+
+    def __repr__(self):
+        return (f"CombatOutcome(win={self.win_probability:.2f}, loss={self.loss_probability:.2f}, "
+                f"draw={self.draw_probability:.2f}, survivors={self.expected_survivors:.2f}, n={len(self.samples)})")
+
+
+class CombatCache:
+    """
+    Bounded cache of combat outcome distributions, keyed by the canonical board of a matchup.
+
+    The key is the Zobrist key of the exact board combine_grids() would
+    build (card, star and cell of every unit on both sides), so a matchup
+    that meets again unchanged, in the same game or a later one, is looked
+    up instead of simulated. A miss plays `samples` battles on a snapshot
+    of the two players, each from a stream derived from the cache seed and
+    the key, and restores them afterwards; the players and the game log are
+    left exactly as they were.
+
+    Because the sample streams depend only on the key, a hit must equal a
+    fresh simulation of the board asked for. With `verify` every hit is
+    re-simulated and compared, and a mismatch (a key collision, or state
+    the key does not cover) raises RuntimeError.
+
+    When full, the least recently used entry ("lru") or the least used one,
+    ties going to the least recent ("lfu"), is evicted.
+
+    Args:
+        capacity (int): Most matchups kept.
+        samples (int): Battles simulated per new matchup.
+        policy (str): "lru" or "lfu".
+        event_driven (bool): Step the sample battles on scheduled events instead of every tick.
+        seed (int, optional): Root seed of the sample battles.
+        verify (bool): Re-simulate every hit and check it matches the cached outcome.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, samples=DEFAULT_SAMPLES, policy="lru", event_driven=True, seed=0,
+                 verify=False):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy {policy!r}; choose from {POLICIES}")
+        self.capacity = capacity
+        self.samples = samples
+        self.policy = policy
+        self.event_driven = event_driven
+        self.verify = verify
+        self.rng = RandomStream(seed)
+        self.entries = OrderedDict()    # key -> CombatOutcome, least recently used first
+        self.uses = {}                  # key -> lookups, for LFU eviction
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.verified = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def evaluate(self, player, opponent):
+        """
+        Outcome distribution of `player` (bottom) against `opponent` (top), simulating it on a miss.
+
+        Args:
+            player (Player): The first player of the matchup.
+            opponent (Player): Its opponent; need not be player.opponent.
+
+        Returns:
+            CombatOutcome: Probabilities and expectations from player's side.
+        """
+        # Key the board the battle would actually be fought on: units without a cell are placed first
+        snapshot = GameSnapshot([player, opponent])
+        saved = snapshot.take()
+        try:
+            with log.muted():
+                place_unplaced_units([player, opponent])
+            key = combined_board_key(player, opponent)
+            outcome = self.entries.get(key)
+            if outcome is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                self.uses[key] += 1
+                if self.verify:
+                    self._verify(player, opponent, key, outcome)
+                return outcome
+
+            self.misses += 1
+            outcome = self._simulate(player, opponent, key)
+        finally:
+            snapshot.restore(saved)
+        if len(self.entries) >= self.capacity:
+            self._evict()
+        self.entries[key] = outcome
+        self.uses[key] = 1
+        return outcome
+
+    def _simulate(self, player, opponent, key):
+        pair = [player, opponent]
+        snapshot = GameSnapshot(pair)
+        saved = snapshot.take()
+        stream = self.rng.derive(key >> 32, key & 0xFFFFFFFF)
+        samples = []
+        try:
+            with log.muted():
+                for i in range(self.samples):
+                    player.opponent, opponent.opponent = opponent, player
+                    battle = Battle(pair, None, stream.derive(i))
+                    if battle.setup():
+                        battle.run(DEFAULT_DT, DEFAULT_MAX_TIME, self.event_driven)
+                    survivors = surviving_units(pair)
+                    battle.finish()
+                    side = None if battle.winner is None else (BOTTOM if battle.winner is player else TOP)
+                    samples.append((side, survivors))
+                    snapshot.restore(saved)
+        finally:
+            snapshot.restore(saved)
+        return CombatOutcome(samples)
+
+    def _verify(self, player, opponent, key, outcome):
+        fresh = self._simulate(player, opponent, key)
+        if fresh.samples != outcome.samples:
+            raise RuntimeError(f"Cached outcome {outcome} for board {key:#018x} does not match "
+                               f"a fresh simulation of the board requested: {fresh}")
+        self.verified += 1
+
+    def _evict(self):
+        if self.policy == "lru":
+            victim = next(iter(self.entries))
+        else:
+            victim = min(self.entries, key=self.uses.__getitem__)
+        del self.entries[victim]
+        del self.uses[victim]
+        self.evictions += 1
+
+    def resolve(self, pair, round_number, rng):
+        """
+        Settles a play_round matchup by sampling its cached distribution instead of simulating it.
+
+        Start- and end-of-combat synergies (Goblin rewards, Thrower reset)
+        still run, on a battle that is set up and finished without being
+        stepped.
+
+        Args:
+            pair (list): The two players, the first one's opponent being the second.
+            round_number (int): Current round, forwarded to end-of-combat synergies.
+            rng (RandomStream): The matchup's battle stream.
+
+        Returns:
+            tuple: (winner or None, surviving units)
+        """
+        side, survivors = self.evaluate(*pair).sample(rng)
+        battle = Battle(pair, round_number, rng)
+        if battle.setup():
+            battle.finish()
+        return (None if side is None else pair[side]), survivors
+
+    def evaluate_buy(self, player, card_name, round_number):
+        """
+        Outcome against player.opponent if player bought card_name now; nothing is actually bought.
+
+        Returns:
+            CombatOutcome | None: None if the buy is not possible.
+        """
+        snapshot = GameSnapshot([player, player.opponent])
+        saved = snapshot.take()
+        try:
+            with log.muted():
+                if not player.buy_card(card_name, round_number):
+                    return None
+            return self.evaluate(player, player.opponent)
+        finally:
+            snapshot.restore(saved)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "verified": self.verified,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def lookahead_bot(cache):
+    """
+    Bot logic that scores every affordable buy with `cache` against this round's opponent.
+
+    It buys the card with the best win-minus-loss probability, unless
+    standing pat scores better.
+
+    Args:
+        cache (CombatCache): Evaluator shared by every decision.
+
+    Returns:
+        callable: bot_logic(player, round_number)
+    """
+    def lookahead_bot_logic(player, round_number):
+        affordable = [card for card in player.hand if card.cost <= player.elixir]
+        if not affordable or player.opponent is None or not player.has_space(round_number):
+            return False
+
+        def score(outcome):
+            return outcome.win_probability - outcome.loss_probability
+
+        best, best_score = None, score(cache.evaluate(player, player.opponent))
+        for card in affordable:
+            outcome = cache.evaluate_buy(player, card.name, round_number)
+            if outcome is not None and score(outcome) >= best_score:
+                best, best_score = card, score(outcome)
+        if best is None:
+            return False
+        return player.buy_card(best.name, round_number)
+
+    return lookahead_bot_logic
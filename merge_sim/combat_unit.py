@@ -1,6 +1,4 @@
 # --- Standard Libraries ---
-import random
-import time
 from collections import deque
 
 # --- Cards ---
@@ -9,7 +7,22 @@ from merge_sim.cards import (
 )
 
 # --- Globals / Shared State ---
-from .constants import BOARD_ROWS, BOARD_COLS, CRIT_CHANCE, CRIT_MULTIPLIER, bombs, reserved_positions
+from .constants import BOARD_ROWS, BOARD_COLS, CRIT_CHANCE, CRIT_MULTIPLIER, TIME_EPSILON
+
+# --- Event Log ---
+from .event_log import (
+    log,
+    DEBUG,
+    WARNING,
+    ATTACK,
+    DAMAGE,
+    DEATH,
+    MOVE,
+    SPAWN,
+    STATUS,
+    SYNERGY,
+    TARGET,
+)
 
 # --- Board / Hex Utilities ---
 from .board_utils import (
@@ -18,12 +31,13 @@ from .board_utils import (
 from .hex_utils import (
     hex_line,
     get_units_in_radius,
+    cells_within,
     hex_distance,
     hex_neighbors,
     find_path_bfs_to_range
 )
 
-def spawn_skeleton(pos, level, owner, all_units, combined):
+def spawn_skeleton(pos, level, owner, context):
     """
     Spawn a skeleton at the given position.
 
@@ -31,33 +45,50 @@ def spawn_skeleton(pos, level, owner, all_units, combined):
         pos (tuple): (row, col) position to spawn at.
         level (int): Skeleton star/level (matches Skeleton King).
         owner (Player): Owner of the Skeleton.
-        all_units (list): List of all units currently in the battle.
+        context (BattleContext): The battle to spawn into; its units, grid and occupancy are updated.
 
     Returns:
         CombatUnit or None: The spawned skeleton, or None if blocked.
     """
-    print(f"🪦 Attempting to spawn skeleton")
+    log.emit(SPAWN, "🪦 Attempting to spawn skeleton", DEBUG)
 
     row, col = pos
 
     # Check if tile is free
-    occupied = {(u.row, u.col) for u in all_units if u.alive}
-    if (row, col) in occupied:
-        print(f"⚠️ Cannot spawn skeleton at {pos}, tile is occupied!")
+    if (row, col) in context.occupancy:
+        log.emit(SPAWN, "⚠️ Cannot spawn skeleton at {pos}, tile is occupied!", WARNING, pos=pos)
         return None
 
     # Create skeleton card and unit
     skeleton_card = Card(name="skeleton", cost=0, star=level)  # cost can be 0 or default
     skeleton_unit = CombatUnit(row=row, col=col, card=skeleton_card, owner=owner)
+    skeleton_unit.context = context
+    context.occupancy.add((row, col))
+    context.board_hash.add((row, col), skeleton_card, owner is context.top_player)
 
     # Add to units list
-    all_units.append(skeleton_unit)
-    combined[pos[0]][pos[1]] = skeleton_unit  # <-- add this
-    print(f"☠️ Spawned skeleton at {pos} for {owner.name} with level {level}")
+    context.units.append(skeleton_unit)
+    context.combined[pos[0]][pos[1]] = skeleton_unit  # <-- add this
+    log.emit(SPAWN, "☠️ Spawned skeleton at {pos} for {owner} with level {star}",
+             unit="skeleton", pos=pos, owner=owner.name, star=level)
 
     return skeleton_unit
 
 class CombatUnit:
+    # Every per-unit field is declared here, including ability state that only
+    # some cards use, so units carry no __dict__ and nothing is added lazily.
+    __slots__ = (
+        "row", "col", "card", "owner", "current_target", "is_attacking", "alive",
+        "current_hp", "max_hp", "last_attack_time", "move_cooldown", "last_move_time",
+        "last_position", "status_effects", "ability_cooldown", "last_update_time",
+        "invisible", "attack_count", "pending_dash_path", "last_attack_target",
+        "dash_pending", "killed_enemy_this_round", "archer_queen_invis_triggered",
+        "noble_damage_taken_multiplier", "noble_damage_dealt_multiplier",
+        "_ranger_stacks", "crit_chance", "crit_mult", "juggernaut_shield_hp",
+        "range_bonus", "_thrower_buffed", "_undead_cursed", "last_jump_time",
+        "is_jumping", "jump_start_time", "jump_target_pos", "context",
+    )
+
     def __init__(self, row, col, card, owner):
         self.row = row
         self.col = col
@@ -70,6 +101,8 @@ class CombatUnit:
         self.max_hp = card.health      # Maximum health
         self.last_attack_time = None      # Time since last attack
         self.move_cooldown = 0         # Movement cooldown based on speed
+        self.last_move_time = None
+        self.last_position = None
         self.status_effects = {}       # Status effects like stun, poison, etc.
         self.ability_cooldown = 0      # Cooldown for special abilities
         self.last_update_time = 0  # Last time this unit was updated
@@ -86,6 +119,14 @@ class CombatUnit:
         self.crit_chance = 0.15
         self.crit_mult = 1.5
         self.juggernaut_shield_hp = 0
+        self.range_bonus = 0  # Added to card range, e.g. by the Thrower synergy
+        self._thrower_buffed = False
+        self._undead_cursed = False
+        self.last_jump_time = float("-inf")  # Mega Knight jump state; the first jump is ready at once
+        self.is_jumping = False
+        self.jump_start_time = 0
+        self.jump_target_pos = None
+        self.context = None  # BattleContext of the battle this unit is fighting in
 
     def restore_full_health(self):
         self.current_hp = self.card.health
@@ -109,15 +150,19 @@ class CombatUnit:
         self.crit_chance = 0.15
         self.crit_mult = 1.5
         self.juggernaut_shield_hp = 0
+        self.last_jump_time = float("-inf")  # Battle clocks restart at 0 every combat
+        self.is_jumping = False
+        self.jump_target_pos = None
 
     def take_damage(self, damage, grid=None, all_units=None, attacker=None):
         
-        effective_damage = damage * getattr(self, "noble_damage_taken_multiplier", 1.0)
+        effective_damage = damage * self.noble_damage_taken_multiplier
 
         if self.juggernaut_shield_hp > 0:
             if effective_damage <= self.juggernaut_shield_hp:
                 self.juggernaut_shield_hp -= effective_damage
-                print(f"Shield of {self.card.name} blocks {effective_damage} damage!")
+                log.emit(DAMAGE, "Shield of {unit} blocks {amount} damage!",
+                         unit=self.card.name, owner=self.owner.name, amount=effective_damage, blocked=True)
                 effective_damage = 0
             else:
                 effective_damage -= self.juggernaut_shield_hp
@@ -125,7 +170,9 @@ class CombatUnit:
 
         if effective_damage > 0:
             self.current_hp -= effective_damage
-            print(f"{self.card.name} (Owner: {self.owner.name}) takes {effective_damage} damage! HP: {self.current_hp}")
+            log.emit(DAMAGE, "{unit} (Owner: {owner}) takes {amount} damage! HP: {hp}",
+                     unit=self.card.name, owner=self.owner.name, amount=effective_damage, hp=self.current_hp,
+                     attacker=attacker.card.name if attacker else None)
 
             # --- Notify Ace manager for damage dealt (heal) ---
             if attacker and hasattr(attacker.owner, "ace_manager"):
@@ -136,7 +183,12 @@ class CombatUnit:
             if self.current_hp <= 0 and self.alive:
                 self.alive = False
                 self.current_hp = 0
-                print(f"💀 {self.card.name} (Owner: {self.owner.name}) has been eliminated!")
+                if self.context is not None and self.row is not None and self.col is not None:
+                    self.context.occupancy.remove((self.row, self.col))
+                    self.context.board_hash.remove((self.row, self.col), self.card, self.owner is self.context.top_player)
+                log.emit(DEATH, "💀 {unit} (Owner: {owner}) has been eliminated!",
+                         unit=self.card.name, owner=self.owner.name, pos=(self.row, self.col),
+                         attacker=attacker.card.name if attacker else None)
 
                 # --- Trigger Undead synergy ---
                 if getattr(self.owner.opponent, "undead_manager", None):
@@ -144,14 +196,12 @@ class CombatUnit:
 
                 # --- Notify Skeleton King if attacker exists ---
                 if attacker and attacker.card.name.lower() == "skeleton-king":
-                    if not hasattr(attacker, "killed_enemy_this_round"):
-                        attacker.killed_enemy_this_round = []
                     attacker.killed_enemy_this_round.append({
                         "pos": (self.row, self.col),
                         "level": getattr(attacker.card, "star", 1),
                         "owner": attacker.owner
                     })
-                    print(f"🪦 Recorded kill for Skeleton King at {(self.row, self.col)}")
+                    log.emit(SYNERGY, "🪦 Recorded kill for Skeleton King at {pos}", DEBUG, pos=(self.row, self.col))
 
                 # --- Notify Ace manager if attacker is Captain ---
                 if attacker and hasattr(attacker.owner, "ace_manager"):
@@ -160,13 +210,13 @@ class CombatUnit:
                         ace_manager.on_captain_kill(self)
 
                 # --- Giant Skeleton bomb ---
-                if self.card.name.lower() == "giant-skeleton" and bombs is not None:
+                if self.card.name.lower() == "giant-skeleton" and self.context is not None:
                     star = self.card.star
                     damage_table = {1: 200, 2: 400, 3: 800, 4: 1600}
                     bomb_damage = damage_table.get(star, 200)
                     bomb_radius = 1 + star  # radius scales with star level
 
-                    bombs.append({
+                    self.context.bombs.append({
                         "pos": self.get_position(),
                         "damage": bomb_damage,
                         "stun": 1.0,
@@ -174,17 +224,16 @@ class CombatUnit:
                         "radius": bomb_radius - 1, # radius checker is 1 bigger than intended
                         "owner": self.owner  # store the Giant Skeleton's owner
                     })
-                    print(f"💣 Giant Skeleton will drop a bomb "
-                        f"for {bomb_damage} damage, radius {bomb_radius}, "
-                        f"in 1s at {self.get_position()}")
+                    log.emit(SPAWN, "💣 Giant Skeleton will drop a bomb for {damage} damage, radius {radius}, in 1s at {pos}",
+                             unit="bomb", damage=bomb_damage, radius=bomb_radius, pos=self.get_position())
 
                 # --- CLEAR CURRENT_TARGET REFERENCES IN OTHER UNITS ---
                 if all_units is not None:
                     for unit in all_units:
                         if getattr(unit, 'current_target', None) == self:
                             unit.current_target = None
-                            print(f"🔹 Removed {self.card.name} (Owner: {self.owner.name}) "
-                                f"as current_target from {unit.card.name} (Owner: {unit.owner.name})")
+                            log.emit(TARGET, "🔹 Removed {target} (Owner: {target_owner}) as current_target from {unit} (Owner: {owner})", DEBUG,
+                                     target=self.card.name, target_owner=self.owner.name, unit=unit.card.name, owner=unit.owner.name)
 
                 # --- CLEAR GRID POSITION ---
                 if grid is not None and self.row is not None and self.col is not None:
@@ -192,7 +241,7 @@ class CombatUnit:
                     self.row, self.col = None, None
 
     def get_position(self):
-        if getattr(self, "row", None) is None or getattr(self, "col", None) is None:
+        if self.row is None or self.col is None:
             return None
         return (self.row, self.col)
   
@@ -202,13 +251,15 @@ class CombatUnit:
 
         # Check if new position is within bounds
         if not (0 <= new_row < rows and 0 <= new_col < cols):
-            print(f"❌ ERROR: Attempt to move {self.card.name} to out-of-bounds position ({new_row}, {new_col})")
+            log.emit(MOVE, "❌ ERROR: Attempt to move {unit} to out-of-bounds position {pos}", WARNING,
+                     unit=self.card.name, pos=(new_row, new_col))
             return False
 
         # Check if the target cell is already occupied by a different unit
         occupant = grid[new_row][new_col]
         if occupant is not None and occupant != self:
-            print(f"❌ ERROR: Attempt to move {self.card.name} to occupied cell ({new_row}, {new_col}) by {occupant.card.name}")
+            log.emit(MOVE, "❌ ERROR: Attempt to move {unit} to occupied cell {pos} by {occupant}", WARNING,
+                     unit=self.card.name, pos=(new_row, new_col), occupant=occupant.card.name)
             return False
 
         # Remove unit from old grid position if valid
@@ -217,25 +268,30 @@ class CombatUnit:
             if grid[self.row][self.col] == self:
                 grid[self.row][self.col] = None
             else:
-                print(f"⚠️ WARNING: Grid mismatch on clearing old position ({self.row}, {self.col}) for {self.card.name}")
+                log.emit(MOVE, "⚠️ WARNING: Grid mismatch on clearing old position {pos} for {unit}", WARNING,
+                         unit=self.card.name, pos=(self.row, self.col))
 
         # Update unit's internal position
+        if self.context is not None and self.alive:
+            self.context.occupancy.move(self.get_position(), (new_row, new_col))
+            self.context.board_hash.move(self.get_position(), (new_row, new_col), self.card,
+                                         self.owner is self.context.top_player)
         self.row = new_row
         self.col = new_col
 
         # Place unit in new position on the grid
         grid[new_row][new_col] = self
 
-        print(f"DEBUG: Placed {self.card.name} at ({self.row}, {self.col})")
+        log.emit(MOVE, "DEBUG: Placed {unit} at {pos}", DEBUG, unit=self.card.name, owner=self.owner.name, pos=(new_row, new_col))
 
         return True
 
     def get_range(self):
-        return getattr(self.card, 'range', 1)
+        return self.card.range + self.range_bonus
     
     def get_damage(self, target=None):
         base = self.card.damage
-        effective_damage = base * getattr(self, "noble_damage_dealt_multiplier", 1.0)
+        effective_damage = base * self.noble_damage_dealt_multiplier
 
         # --- Thrower synergy ---
         if (
@@ -247,7 +303,8 @@ class CombatUnit:
             distance = hex_distance(self.get_position(), target.get_position())
             bonus_mult = 1 + (0.1 * distance)
             effective_damage *= bonus_mult
-            print(f"🏹 {self.card.name} deals {effective_damage:.1f} damage (distance {distance}, +{int(distance*10)}%)")
+            log.emit(SYNERGY, "🏹 {unit} deals {damage:.1f} damage (distance {distance}, +{bonus}%)",
+                     synergy="thrower", unit=self.card.name, damage=effective_damage, distance=distance, bonus=int(distance*10))
 
         # --- Undead synergy ---
         if (
@@ -257,21 +314,24 @@ class CombatUnit:
             undead_mult = self.owner.undead_manager.get_damage_multiplier(self)
             effective_damage *= undead_mult
             if undead_mult > 1.0:
-                print(f"🦴 {self.card.name} damage boosted by Undead synergy x{undead_mult:.2f}")
+                log.emit(SYNERGY, "🦴 {unit} damage boosted by Undead synergy x{mult:.2f}",
+                         synergy="undead", unit=self.card.name, mult=undead_mult)
 
         # --- Avenger synergy ---
         if hasattr(self.owner, "avenger_manager"):
             avenger_mult = self.owner.avenger_manager.get_damage_multiplier(self)
             effective_damage *= avenger_mult
             if avenger_mult != 1.0:
-                print(f"🛡️ {self.card.name} Avenger bonus: x{avenger_mult:.2f}")
+                log.emit(SYNERGY, "🛡️ {unit} Avenger bonus: x{mult:.2f}",
+                         synergy="avenger", unit=self.card.name, mult=avenger_mult)
 
         # --- Ace synergy ---
         if hasattr(self.owner, "ace_manager"):
             ace_mult = self.owner.ace_manager.get_damage_multiplier(self)
             effective_damage *= ace_mult
             if ace_mult != 1.0:
-                print(f"🃏 {self.card.name} Ace bonus: x{ace_mult:.2f}")
+                log.emit(SYNERGY, "🃏 {unit} Ace bonus: x{mult:.2f}",
+                         synergy="ace", unit=self.card.name, mult=ace_mult)
 
         return effective_damage
 
@@ -296,13 +356,13 @@ class CombatUnit:
                 mult *= ranger_mult
 
         # --- Ace Captain hit speed bonus ---
-        if "ace_hit_speed_bonus" in getattr(self, "status_effects", {}):
+        if "ace_hit_speed_bonus" in self.status_effects:
             mult *= 0.8  # +20% attack speed = attacks 20% faster (interval multiplied by 0.8)
 
         return base * mult
 
     def get_move_speed(self):
-        return getattr(self.card, 'speed', 1.0)
+        return self.card.speed
     
     def can_attack(self, current_time):        
         attack_interval = self.get_attack_speed()  # seconds per attack
@@ -359,7 +419,7 @@ class CombatUnit:
         elif unit_name == "princess":
             return self._princess_attack(primary_target, all_units, combined_grid, base_damage)
         elif unit_name == "mega-knight":
-            return self._mega_knight_attack(primary_target, all_units, combined_grid, base_damage, reserved_positions)
+            return self._mega_knight_attack(primary_target, all_units, combined_grid, base_damage)
         elif unit_name == "royal-ghost":
             return self._royal_ghost_attack(primary_target, combined_grid, base_damage, all_units)
         elif unit_name == "bandit":
@@ -381,11 +441,11 @@ class CombatUnit:
     def _spear_goblin_attack(self, target, all_units, combined_grid):
         """Spear Goblin throws a spear at a single target (ranged)."""
         base_damage = self.get_damage(target)   # ✅ synergy applies
-        is_crit = random.random() < CRIT_CHANCE
+        is_crit = self.context.rng.random() < CRIT_CHANCE
         damage = base_damage * (CRIT_MULTIPLIER if is_crit else 1)
 
-        print(f"🗡️ Spear Goblin throws spear at {target.card.name} for {damage:.1f} damage"
-            + (" (CRIT!)" if is_crit else ""))
+        log.emit(ATTACK, "🗡️ Spear Goblin throws spear at {target} for {damage:.1f} damage{crit_text}",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=" (CRIT!)" if is_crit else "")
 
         target.take_damage(damage, combined_grid, all_units, attacker=self)
         return True
@@ -393,11 +453,11 @@ class CombatUnit:
     def _bomber_attack(self, target, all_units, combined_grid):
         # --- MAIN ATTACK ---
         base_damage = self.get_damage(target)   # ✅ use synergy-aware damage
-        is_crit_main = random.random() < CRIT_CHANCE
+        is_crit_main = self.context.rng.random() < CRIT_CHANCE
         damage = base_damage * (CRIT_MULTIPLIER if is_crit_main else 1)
 
-        print(f"💣 {self.card.name} strikes {target.card.name} for {damage:.1f} damage"
-            + (" (CRIT!)" if is_crit_main else ""))
+        log.emit(ATTACK, "💣 {unit} strikes {target} for {damage:.1f} damage{crit_text}",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=" (CRIT!)" if is_crit_main else "")
         target.take_damage(damage, combined_grid, all_units, attacker=self)
 
         # --- SPLASH DAMAGE ---
@@ -410,20 +470,21 @@ class CombatUnit:
 
         for unit in splash_targets:
             splash_damage = self.get_damage(unit)   # ✅ synergy with each splash target
-            is_crit_splash = random.random() < CRIT_CHANCE
+            is_crit_splash = self.context.rng.random() < CRIT_CHANCE
             splash_damage *= CRIT_MULTIPLIER if is_crit_splash else 1
-            print(f"💥 Splash hits {unit.card.name} for {splash_damage:.1f} damage"
-                + (" (CRIT!)" if is_crit_splash else ""))
+            log.emit(ATTACK, "💥 Splash hits {target} for {damage:.1f} damage{crit_text}",
+                     unit=self.card.name, target=unit.card.name, damage=splash_damage, crit_text=" (CRIT!)" if is_crit_splash else "")
             unit.take_damage(splash_damage, combined_grid, all_units, attacker=self)
 
         return True
 
     def _valkyrie_attack(self, target, all_units, combined_grid, base_damage):
         # --- INITIAL TARGET ---
-        is_crit_main = random.random() < CRIT_CHANCE
+        is_crit_main = self.context.rng.random() < CRIT_CHANCE
         damage_main = base_damage * (CRIT_MULTIPLIER if is_crit_main else 1)
         crit_text_main = "💥 CRIT! " if is_crit_main else ""
-        print(f"{crit_text_main}{self.card.name} strikes initial target {target.card.name} for {damage_main} damage")
+        log.emit(ATTACK, "{crit_text}{unit} strikes initial target {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage_main, crit_text=crit_text_main)
         target.take_damage(damage_main, combined_grid, all_units, attacker=self)
 
         # --- SPLASH TARGETS ---
@@ -433,10 +494,11 @@ class CombatUnit:
                 # Check unit exists, is an enemy, and is not the initial target
                 if unit and unit.owner != self.owner and unit != target:
                     # Roll crit separately for each splash target
-                    is_crit_splash = random.random() < CRIT_CHANCE
+                    is_crit_splash = self.context.rng.random() < CRIT_CHANCE
                     damage_splash = base_damage * (CRIT_MULTIPLIER if is_crit_splash else 1)
                     crit_text_splash = "💥 CRIT! " if is_crit_splash else ""
-                    print(f"{crit_text_splash}{self.card.name} hits splash target {unit.card.name} for {damage_splash} damage")
+                    log.emit(ATTACK, "{crit_text}{unit} hits splash target {target} for {damage} damage",
+                             unit=self.card.name, target=unit.card.name, damage=damage_splash, crit_text=crit_text_splash)
                     unit.take_damage(damage_splash, combined_grid, all_units, attacker=self)
 
         return True
@@ -480,7 +542,8 @@ class CombatUnit:
         enemy_old = (closest_enemy.row, closest_enemy.col)
         prince_old = (self.row, self.col)
 
-        print("Prince star level:", getattr(self.card, "star", "NOT FOUND"), type(self.card))
+        log.emit(ATTACK, "Prince star level: {star} {card_type}", DEBUG,
+                 star=getattr(self.card, "star", "NOT FOUND"), card_type=type(self.card))
 
         # Build list of preferred fling targets along the throw direction (farthest first)
         preferred = []
@@ -544,7 +607,8 @@ class CombatUnit:
                 combined_grid[prince_old[0]][prince_old[1]] = saved_pr_cell
             if in_bounds(*enemy_old):
                 combined_grid[enemy_old[0]][enemy_old[1]] = saved_en_cell
-            print(f"⚠️ Prince dash cancelled: no valid fling destination found for {closest_enemy.card.name}.")
+            log.emit(MOVE, "⚠️ Prince dash cancelled: no valid fling destination found for {target}.", WARNING,
+                     unit=self.card.name, target=closest_enemy.card.name)
             return False
 
         fling_r, fling_c = fling_pos
@@ -560,9 +624,9 @@ class CombatUnit:
         # Apply stun
         closest_enemy.status_effects['stunned'] = 2.0
 
-        # Debug prints
-        print(f"🏇 {self.card.name} dashes from {prince_old} to {prince_dest}")
-        print(f"👊 {closest_enemy.card.name} flung from {enemy_old} to {(fling_r, fling_c)} and stunned for 2s")
+        log.emit(MOVE, "🏇 {unit} dashes from {from_pos} to {pos}", unit=self.card.name, from_pos=prince_old, pos=prince_dest)
+        log.emit(STATUS, "👊 {unit} flung from {from_pos} to {pos} and stunned for 2s",
+                 unit=closest_enemy.card.name, from_pos=enemy_old, pos=(fling_r, fling_c), effect="stunned", duration=2.0)
 
         return True
 
@@ -570,7 +634,7 @@ class CombatUnit:
         """Executioner throws axe in straight line, pierces through target for star_level tiles, then returns."""
         star_level = getattr(self.card, 'star', 1)
 
-        print(f"🪓 {self.card.name} throws axe at {target.card.name}!")
+        log.emit(ATTACK, "🪓 {unit} throws axe at {target}!", unit=self.card.name, target=target.card.name)
 
         exe_pos = self.get_position()
         target_pos = target.get_position()
@@ -618,43 +682,51 @@ class CombatUnit:
                 hit_count[unit] = 0
 
         # --- Forward pass ---
-        print(f"🪓 Axe travels forward: {' → '.join([f'({r},{c})' for r, c in complete_forward])}")
+        if log.enabled(DEBUG):
+            log.emit(ATTACK, "🪓 Axe travels forward: {path_text}", DEBUG,
+                     path=complete_forward, path_text=' → '.join([f'({r},{c})' for r, c in complete_forward]))
         for pos in complete_forward:
             if pos in units_hit:
                 for unit in units_hit[pos]:
                     if unit.alive:
                         base_damage = self.get_damage(unit)  # ✅ synergy per unit
-                        is_crit = random.random() < CRIT_CHANCE
+                        is_crit = self.context.rng.random() < CRIT_CHANCE
                         damage = base_damage * (CRIT_MULTIPLIER if is_crit else 1)
-                        print(f"{'💥 CRIT! ' if is_crit else ''}Axe hits {unit.card.name} on forward pass for {damage:.1f}!")
+                        log.emit(ATTACK, "{crit_text}Axe hits {target} on forward pass for {damage:.1f}!",
+                                 unit=self.card.name, target=unit.card.name, damage=damage, crit_text='💥 CRIT! ' if is_crit else '')
                         unit.take_damage(damage, combined_grid, all_units, attacker=self)
                         hit_count[unit] += 1
 
         # --- Return pass ---
-        print(f"🪓 Axe returns: {' → '.join([f'({r},{c})' for r, c in return_path])}")
+        if log.enabled(DEBUG):
+            log.emit(ATTACK, "🪓 Axe returns: {path_text}", DEBUG,
+                     path=return_path, path_text=' → '.join([f'({r},{c})' for r, c in return_path]))
         for pos in return_path:
             if pos in units_hit:
                 for unit in units_hit[pos]:
                     if unit.alive:
                         base_damage = self.get_damage(unit)  # ✅ synergy per unit
-                        is_crit = random.random() < CRIT_CHANCE
+                        is_crit = self.context.rng.random() < CRIT_CHANCE
                         damage = base_damage * (CRIT_MULTIPLIER if is_crit else 1)
-                        print(f"{'💥 CRIT! ' if is_crit else ''}Axe hits {unit.card.name} on return pass for {damage:.1f}!")
+                        log.emit(ATTACK, "{crit_text}Axe hits {target} on return pass for {damage:.1f}!",
+                                 unit=self.card.name, target=unit.card.name, damage=damage, crit_text='💥 CRIT! ' if is_crit else '')
                         unit.take_damage(damage, combined_grid, all_units, attacker=self)
                         hit_count[unit] += 1
 
         total_hits = sum(hit_count.values())
         unique_targets = len([u for u in hit_count if hit_count[u] > 0])
-        print(f"🪓 Executioner's axe dealt {total_hits} total hits to {unique_targets} enemies!")
+        log.emit(ATTACK, "🪓 Executioner's axe dealt {hits} total hits to {targets} enemies!",
+                 unit=self.card.name, hits=total_hits, targets=unique_targets)
 
         return True
 
     def _princess_attack(self, target, all_units, combined_grid, base_damage):
         # --- Main attack ---
-        is_crit = random.random() < CRIT_CHANCE
+        is_crit = self.context.rng.random() < CRIT_CHANCE
         damage = base_damage * CRIT_MULTIPLIER if is_crit else base_damage
         crit_text = "💥 CRIT! " if is_crit else ""
-        print(f"{crit_text}⚔️ {self.card.name} strikes {target.card.name} for {damage} damage")
+        log.emit(ATTACK, "{crit_text}⚔️ {unit} strikes {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
         target.take_damage(damage, combined_grid, all_units, attacker=self)
 
         # --- Splash damage to adjacent enemies ---
@@ -663,17 +735,18 @@ class CombatUnit:
                 unit = combined_grid[r][c]
                 if unit and unit.owner != self.owner:
                     # Roll crit per splash unit
-                    unit_crit = random.random() < CRIT_CHANCE
+                    unit_crit = self.context.rng.random() < CRIT_CHANCE
                     splash_damage = base_damage * CRIT_MULTIPLIER if unit_crit else base_damage
                     crit_text = "💥 CRIT! " if unit_crit else ""
-                    print(f"{crit_text}💥 {self.card.name} splash hits {unit.card.name} for {splash_damage} damage")
+                    log.emit(ATTACK, "{crit_text}💥 {unit} splash hits {target} for {damage} damage",
+                             unit=self.card.name, target=unit.card.name, damage=splash_damage, crit_text=crit_text)
                     unit.take_damage(splash_damage, combined_grid, all_units, attacker=self)
 
         return True
 
-    def _mega_knight_attack(self, target, all_units, combined_grid, base_damage, reserved_positions):
+    def _mega_knight_attack(self, target, all_units, combined_grid, base_damage):
 
-        current_time = time.time()
+        current_time = self.context.clock.now
         damage = base_damage
 
         star_level = getattr(self.card, "star", 1)
@@ -687,21 +760,9 @@ class CombatUnit:
 
         jump_travel_time = 1  # seconds fixed for jump animation
 
-        # Initialize last_jump_time if not set
-        if not hasattr(self, 'last_jump_time'):
-            self.last_jump_time = 0
-
-        # Initialize jump state attributes if missing
-        if not hasattr(self, 'is_jumping'):
-            self.is_jumping = False
-        if not hasattr(self, 'jump_start_time'):
-            self.jump_start_time = 0
-        if not hasattr(self, 'jump_target_pos'):
-            self.jump_target_pos = None
-
         # Helper: roll crit
         def roll_crit():
-            return random.random() < CRIT_CHANCE
+            return self.context.rng.random() < CRIT_CHANCE
 
         # If currently jumping, handle jump progress
         if self.is_jumping:
@@ -711,7 +772,8 @@ class CombatUnit:
                 old_pos = (self.row, self.col)
                 new_r, new_c = self.jump_target_pos
                 self.move_to(new_r, new_c, combined_grid)
-                print(f"🚀 {self.card.name} [{self.owner.name}] finishes jump from {old_pos} to {self.jump_target_pos}!")
+                log.emit(MOVE, "🚀 {unit} [{owner}] finishes jump from {from_pos} to {pos}!",
+                         unit=self.card.name, owner=self.owner.name, from_pos=old_pos, pos=self.jump_target_pos)
 
                 # Find the new target on the tile just landed on
                 new_target = None
@@ -723,18 +785,20 @@ class CombatUnit:
                 if new_target:
                     self.current_target = new_target
                     self.last_attack_time = None
-                    print(f"[DEBUG] {self.card.name} retargeted to {new_target.card.name} after jump.")
+                    log.emit(TARGET, "[DEBUG] {unit} retargeted to {target} after jump.", DEBUG,
+                             unit=self.card.name, target=new_target.card.name)
 
                 # Stun enemies in radius stun_radius (fixed 2 seconds)
                 stunned_units = get_units_in_radius(self.jump_target_pos, stun_radius - 1, all_units)
                 for u in stunned_units:
                     if u.alive and u.owner != self.owner:
                         u.status_effects['stunned'] = 2.0
-                        print(f"💫 {u.card.name} [{u.owner.name}] is stunned for 2 seconds by {self.card.name} [{self.owner.name}]!")
+                        log.emit(STATUS, "💫 {unit} [{owner}] is stunned for 2 seconds by {source} [{source_owner}]!",
+                                 unit=u.card.name, owner=u.owner.name, source=self.card.name, source_owner=self.owner.name,
+                                 effect="stunned", duration=2.0)
 
                 # Release reservation of the jump target tile
-                if self.jump_target_pos in reserved_positions:
-                    reserved_positions.remove(self.jump_target_pos)
+                self.context.occupancy.release(self.jump_target_pos)
 
                 self.is_jumping = False
                 self.last_jump_time = current_time
@@ -751,31 +815,30 @@ class CombatUnit:
             best_hex = None
 
             # Search hexes within range 3 for max neighbors AND free hex (no unit occupying, no reservation)
-            for r in range(max(0, self.row - 3), min(BOARD_ROWS, self.row + 4)):
-                for c in range(max(0, self.col - 3), min(BOARD_COLS, self.col + 4)):
-                    if hex_distance((self.row, self.col), (r, c)) <= 3:
-                        # Check if hex is free and not reserved
-                        if combined_grid[r][c] is not None or (r, c) in reserved_positions:
-                            continue  # Occupied or reserved, skip
-
-                        neighbors = 0
-                        for u in all_units:
-                            if u.alive and (u.row, u.col) != (r, c):
-                                if hex_distance((u.row, u.col), (r, c)) == 1:
-                                    neighbors += 1
-                        if neighbors > max_neighbors:
-                            max_neighbors = neighbors
-                            best_hex = (r, c)
+            for r, c in cells_within((self.row, self.col), 3):
+                # Check if hex is free and not reserved
+                if combined_grid[r][c] is not None or self.context.occupancy.is_reserved((r, c)):
+                    continue  # Occupied or reserved, skip
+
+                neighbors = 0
+                for u in all_units:
+                    if u.alive and (u.row, u.col) != (r, c):
+                        if hex_distance((u.row, u.col), (r, c)) == 1:
+                            neighbors += 1
+                if neighbors > max_neighbors:
+                    max_neighbors = neighbors
+                    best_hex = (r, c)
 
             if best_hex:
                 # Reserve target hex
-                reserved_positions.add(best_hex)
+                self.context.occupancy.reserve(best_hex)
 
                 # Start jump: mark state and time
                 self.is_jumping = True
                 self.jump_start_time = current_time
                 self.jump_target_pos = best_hex
-                print(f"🚀 {self.card.name} [{self.owner.name}] starts jumping towards {best_hex}!")
+                log.emit(MOVE, "🚀 {unit} [{owner}] starts jumping towards {pos}!",
+                         unit=self.card.name, owner=self.owner.name, pos=best_hex)
                 return False  # Skip attack during jump start
 
         # Normal melee attack if no jump this turn
@@ -783,8 +846,10 @@ class CombatUnit:
             crit = roll_crit()
             final_damage = damage * CRIT_MULTIPLIER if crit else damage
             if crit:
-                print(f"🔥 CRITICAL HIT! Damage multiplied to {final_damage}!")
-            print(f"⚔️ {self.card.name} [{self.owner.name}] strikes {target.card.name} [{target.owner.name}] for {final_damage} damage")
+                log.emit(ATTACK, "🔥 CRITICAL HIT! Damage multiplied to {damage}!", unit=self.card.name, damage=final_damage)
+            log.emit(ATTACK, "⚔️ {unit} [{owner}] strikes {target} [{target_owner}] for {damage} damage",
+                     unit=self.card.name, owner=self.owner.name, target=target.card.name, target_owner=target.owner.name,
+                     damage=final_damage)
             target.take_damage(final_damage, combined_grid, all_units, attacker=self)
             return True
 
@@ -792,11 +857,12 @@ class CombatUnit:
 
     def _royal_ghost_attack(self, target, combined_grid, base_damage, all_units):
         # Roll crit for this attack
-        is_crit = random.random() < self.crit_chance
+        is_crit = self.context.rng.random() < self.crit_chance
         damage = base_damage * self.crit_mult if is_crit else base_damage
         crit_text = "💥 CRIT! " if is_crit else ""
 
-        print(f"{crit_text}⚔️ {self.card.name} strikes {target.card.name} for {damage} damage")
+        log.emit(ATTACK, "{crit_text}⚔️ {unit} strikes {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
         target.take_damage(damage, combined_grid, all_units, attacker=self)
 
         # Track attack count for invisibility
@@ -812,14 +878,9 @@ class CombatUnit:
         duration = star_durations.get(self.card.star, 1.5)
         self.status_effects["invisible"] = duration
         self.invisible = True
-        print(f"👻 {self.card.name} turns invisible for {duration} seconds!")
+        log.emit(STATUS, "👻 {unit} turns invisible for {duration} seconds!", unit=self.card.name, effect="invisible", duration=duration)
     
     def _bandit_attack(self, target, all_units, combined_grid, base_damage):
-        if not hasattr(self, "last_attack_target"):
-            self.last_attack_target = None
-            self.attack_count = 0
-            self.dash_pending = False
-
         dash_thresholds = {1: 3, 2: 2, 3: 1, 4: 1}
         dash_bonus = {1: 0.5, 2: 0.5, 3: 0.8, 4: 1.5}
         stars = self.card.star
@@ -828,7 +889,10 @@ class CombatUnit:
             # Perform dash instead of attack damage, then clear flag
             self.dash_pending = False
 
-            occupied_positions = get_occupied_positions(all_units, excluding_unit=self)
+            if self.context is not None:
+                occupied_positions = self.context.occupancy.view(excluding_unit=self)
+            else:
+                occupied_positions = get_occupied_positions(all_units, excluding_unit=self)
             start_pos = self.get_position()
 
             farthest_enemy = None
@@ -858,7 +922,7 @@ class CombatUnit:
             if farthest_enemy and landing_spot:
                 path = hex_line(start_pos, landing_spot)
 
-                print(f"🏃‍♀️  {self.card.name} dashes along path: {path} to {landing_spot}")
+                log.emit(MOVE, "🏃‍♀️  {unit} dashes along path: {path} to {pos}", unit=self.card.name, path=path, pos=landing_spot)
 
                 for hex_pos in path:
                     for unit in all_units:
@@ -866,26 +930,29 @@ class CombatUnit:
                             bonus_damage = base_damage + (base_damage * dash_bonus[stars])
                             unit.take_damage(bonus_damage, combined_grid, all_units, attacker=self)
                             unit.status_effects["stunned"] = 1.0
-                            print(f"💥 {unit.card.name} is stunned and takes {bonus_damage:.1f} bonus damage!")
+                            log.emit(STATUS, "💥 {unit} is stunned and takes {damage:.1f} bonus damage!",
+                                     unit=unit.card.name, damage=bonus_damage, effect="stunned", duration=1.0)
 
                 if farthest_enemy.get_position() not in path:
                     bonus_damage = base_damage + (base_damage * dash_bonus[stars])
                     farthest_enemy.take_damage(bonus_damage, combined_grid, all_units, attacker=self)
                     farthest_enemy.status_effects["stunned"] = 1.0
-                    print(f"💥 {farthest_enemy.card.name} (final target) is stunned and takes {bonus_damage:.1f} bonus damage!")
+                    log.emit(STATUS, "💥 {unit} (final target) is stunned and takes {damage:.1f} bonus damage!",
+                             unit=farthest_enemy.card.name, damage=bonus_damage, effect="stunned", duration=1.0)
 
                 self.move_to(*landing_spot, combined_grid)
-                print(f"🏃‍♀️  {self.card.name} finishes dash at {landing_spot}!")
+                log.emit(MOVE, "🏃‍♀️  {unit} finishes dash at {pos}!", unit=self.card.name, pos=landing_spot)
 
             return True
 
         else:
             # Normal attack flow with crit chance
-            is_crit = random.random() < CRIT_CHANCE
+            is_crit = self.context.rng.random() < CRIT_CHANCE
             damage = base_damage * CRIT_MULTIPLIER if is_crit else base_damage
             crit_text = "💥 CRIT! " if is_crit else ""
 
-            print(f"{crit_text}⚔️ {self.card.name} strikes {target.card.name} for {damage} damage")
+            log.emit(ATTACK, "{crit_text}⚔️ {unit} strikes {target} for {damage} damage",
+                     unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
             target.take_damage(damage, combined_grid, all_units, attacker=self)
 
             if self.last_attack_target == target:
@@ -896,7 +963,7 @@ class CombatUnit:
 
             # If threshold reached, set dash pending flag to True
             if self.attack_count >= dash_thresholds[stars]:
-                print(f"⚡ {self.card.name} prepares to dash on next attack!")
+                log.emit(ATTACK, "⚡ {unit} prepares to dash on next attack!", unit=self.card.name)
                 self.dash_pending = True
                 self.attack_count = 0
                 self.last_attack_target = None
@@ -920,12 +987,6 @@ class CombatUnit:
         Each rocket deals 1.5x base damage and stuns for 1.5 seconds.
         """
 
-        # Initialize attack tracking if missing
-        if not hasattr(self, 'attack_count'):
-            self.attack_count = 0
-        if not hasattr(self, 'last_attack_target'):
-            self.last_attack_target = None
-
         # Determine card level
         level = getattr(self.card, "star", 1)
 
@@ -953,18 +1014,19 @@ class CombatUnit:
             targets = enemies[:rocket_count]
 
             for t in targets:
-                print(f"💥 {self.card.name} fires rocket at {t.card.name}!")
+                log.emit(ATTACK, "💥 {unit} fires rocket at {target}!", unit=self.card.name, target=t.card.name)
                 t.take_damage(base_damage * 1.5, combined_grid, all_units, attacker=self)       # 1.5x base damage
                 t.status_effects['stunned'] = 1.5      # 1.5 seconds stun
 
             return True  # Special attack executed
 
         # Normal attack with crit chance
-        is_crit = random.random() < CRIT_CHANCE
+        is_crit = self.context.rng.random() < CRIT_CHANCE
         damage = base_damage * CRIT_MULTIPLIER if is_crit else base_damage
         crit_text = "💥 CRIT! " if is_crit else ""
 
-        print(f"{crit_text}⚔️ {self.card.name} strikes {target.card.name} for {damage} damage")
+        log.emit(ATTACK, "{crit_text}⚔️ {unit} strikes {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
         target.take_damage(damage, combined_grid, all_units, attacker=self)
         self.attack_count += 1
         return True
@@ -984,10 +1046,11 @@ class CombatUnit:
             target_pos = target.get_position()  # save before damage
 
         # --- PRIMARY ATTACK WITH CRIT ---
-        is_crit = random.random() < CRIT_CHANCE
+        is_crit = self.context.rng.random() < CRIT_CHANCE
         damage = base_damage * CRIT_MULTIPLIER if is_crit else base_damage
         crit_text = "💥 CRIT! " if is_crit else ""
-        print(f"{crit_text}⚔️ {self.card.name} strikes {target.card.name} for {damage} damage")
+        log.emit(ATTACK, "{crit_text}⚔️ {unit} strikes {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
         target.take_damage(damage, combined_grid, all_units, attacker=self)
 
         # --- CONE SPLASH DAMAGE ---
@@ -1004,10 +1067,11 @@ class CombatUnit:
                 for u in all_units:
                     if u.alive and u.get_position() == (nr, nc) and u != target:
                         # Each splash unit rolls crit independently
-                        splash_crit = random.random() < CRIT_CHANCE
+                        splash_crit = self.context.rng.random() < CRIT_CHANCE
                         splash_damage = base_damage * CRIT_MULTIPLIER if splash_crit else base_damage
                         splash_crit_text = "💥 CRIT! " if splash_crit else ""
-                        print(f"{splash_crit_text}{self.card.name} hits {u.card.name} in cone for {splash_damage} damage!")
+                        log.emit(ATTACK, "{crit_text}{unit} hits {target} in cone for {damage} damage!",
+                                 unit=self.card.name, target=u.card.name, damage=splash_damage, crit_text=splash_crit_text)
                         u.take_damage(splash_damage, combined_grid, all_units, attacker=self)
 
         return True
@@ -1023,10 +1087,11 @@ class CombatUnit:
         - Continues chaining if each new target dies.
         """
         # --- NORMAL ATTACK WITH CRIT ---
-        is_crit = random.random() < self.crit_chance
+        is_crit = self.context.rng.random() < self.crit_chance
         damage = base_damage * self.crit_mult if is_crit else base_damage
         crit_text = "💥 CRIT! " if is_crit else ""
-        print(f"{crit_text}⚔️ {self.card.name} attacks {target.card.name} for {damage} damage")
+        log.emit(ATTACK, "{crit_text}⚔️ {unit} attacks {target} for {damage} damage",
+                 unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
         target.take_damage(damage, grid, all_units, attacker=self)
 
         # --- DASH DAMAGE MULTIPLIER BASED ON LEVEL ---
@@ -1043,35 +1108,42 @@ class CombatUnit:
                 break
 
             dash_count += 1
-            print(f"\n🔄 DASH CHAIN STEP {dash_count}: {self.card.name} is chaining...")
+            log.emit(MOVE, "\n🔄 DASH CHAIN STEP {step}: {unit} is chaining...", DEBUG, unit=self.card.name, step=dash_count)
 
             # Find next lowest HP enemy excluding dead ones
             living_enemies = [u for u in all_units if u.alive and u.owner != self.owner]
-            print(f"🧮 Living enemies: {[f'{u.card.name}({u.current_hp} HP)' for u in living_enemies]}")
+            if log.enabled(DEBUG):
+                log.emit(TARGET, "🧮 Living enemies: {enemies}", DEBUG,
+                         enemies=[f'{u.card.name}({u.current_hp} HP)' for u in living_enemies])
 
             if not living_enemies:
-                print("❌ No living enemies left — stopping chain.")
+                log.emit(TARGET, "❌ No living enemies left — stopping chain.", DEBUG)
                 break
 
             # Pick enemy with lowest current HP
             next_target = min(living_enemies, key=lambda u: u.current_hp)
-            print(f"🎯 Next target: {next_target.card.name} with {next_target.current_hp} HP")
+            log.emit(TARGET, "🎯 Next target: {target} with {hp} HP", DEBUG,
+                     unit=self.card.name, target=next_target.card.name, hp=next_target.current_hp)
 
             # Find available adjacent tiles
             adj_tiles = hex_neighbors(*next_target.get_position())
-            occupied = {(u.row, u.col) for u in all_units if u.alive and u != self}
+            if self.context is not None:
+                occupied = self.context.occupancy.view(excluding_unit=self)
+            else:
+                occupied = {(u.row, u.col) for u in all_units if u.alive and u != self}
             adj_free = [pos for pos in adj_tiles if pos not in occupied]
 
             if not adj_free:
-                print(f"⚠️ {self.card.name} cannot dash: no free adjacent tiles to {next_target.card.name}")
+                log.emit(MOVE, "⚠️ {unit} cannot dash: no free adjacent tiles to {target}", WARNING,
+                         unit=self.card.name, target=next_target.card.name)
                 break
 
             # Move to first free adjacent tile
             new_pos = adj_free[0]
-            print(f"💨 {self.card.name} dashes to {new_pos} adjacent to {next_target.card.name}")
+            log.emit(MOVE, "💨 {unit} dashes to {pos} adjacent to {target}", unit=self.card.name, pos=new_pos, target=next_target.card.name)
             moved = self.move_to(new_pos[0], new_pos[1], grid)
             if not moved:
-                print(f"❌ Failed to move {self.card.name} to {new_pos}")
+                log.emit(MOVE, "❌ Failed to move {unit} to {pos}", WARNING, unit=self.card.name, pos=new_pos)
                 break
 
             # Update simulation position tracking
@@ -1079,7 +1151,8 @@ class CombatUnit:
             self.current_target = next_target
 
             # Deal dash damage (unchanged, no crit)
-            print(f"💥 {self.card.name} deals {dash_damage} dash damage to {next_target.card.name}")
+            log.emit(ATTACK, "💥 {unit} deals {damage} dash damage to {target}",
+                     unit=self.card.name, target=next_target.card.name, damage=dash_damage)
             next_target.take_damage(dash_damage, grid, all_units, attacker=self)
 
             # Prepare for next chain
@@ -1111,11 +1184,11 @@ class CombatUnit:
         damage_multiplier = settings["damage_bonus"]
 
         # --- CHECK FOR INVISIBILITY TRIGGER ---
-        if not getattr(self, 'archer_queen_invis_triggered', False) and self.current_hp <= 0.5 * self.max_hp:
+        if not self.archer_queen_invis_triggered and self.current_hp <= 0.5 * self.max_hp:
             self.status_effects["invisible"] = 2.5
             self.invisible = True
             self.archer_queen_invis_triggered = True
-            print(f"🕵️ {self.card.name} becomes invisible for 2.5 seconds!")
+            log.emit(STATUS, "🕵️ {unit} becomes invisible for 2.5 seconds!", unit=self.card.name, effect="invisible", duration=2.5)
 
         # --- MAIN ATTACK ---
         total_targets = 0
@@ -1123,12 +1196,13 @@ class CombatUnit:
 
         if target.alive and self.is_in_range_of(target):
             # Roll crit for main target
-            is_crit = random.random() < CRIT_CHANCE
+            is_crit = self.context.rng.random() < CRIT_CHANCE
             damage = base_damage * (1 + damage_multiplier if self.invisible else 1)
             if is_crit:
                 damage *= CRIT_MULTIPLIER
             crit_text = "💥 CRIT! " if is_crit else ""
-            print(f"{crit_text}⚔️ {self.card.name} hits {target.card.name} for {damage} damage")
+            log.emit(ATTACK, "{crit_text}⚔️ {unit} hits {target} for {damage} damage",
+                     unit=self.card.name, target=target.card.name, damage=damage, crit_text=crit_text)
             target.take_damage(damage, grid, all_units, attacker=self)
             targets_hit.append(target)
             total_targets += 1
@@ -1145,12 +1219,13 @@ class CombatUnit:
                 break
             if self.is_in_range_of(enemy):
                 # Roll crit per bonus target
-                is_crit = random.random() < CRIT_CHANCE
+                is_crit = self.context.rng.random() < CRIT_CHANCE
                 damage = base_damage * (1 + damage_multiplier if self.invisible else 1)
                 if is_crit:
                     damage *= CRIT_MULTIPLIER
                 crit_text = "💥 CRIT! " if is_crit else ""
-                print(f"{crit_text}⚔️ {self.card.name} hits {enemy.card.name} for {damage} damage (bonus target)")
+                log.emit(ATTACK, "{crit_text}⚔️ {unit} hits {target} for {damage} damage (bonus target)",
+                         unit=self.card.name, target=enemy.card.name, damage=damage, crit_text=crit_text)
                 enemy.take_damage(damage, grid, all_units, attacker=self)
                 targets_hit.append(enemy)
                 total_targets += 1
@@ -1160,11 +1235,13 @@ class CombatUnit:
     def _default_attack(self, target, grid, base_damage, all_units):
         """Default attack for unknown units."""
         damage = base_damage
-        if random.random() < self.crit_chance:  # 15% crit chance
+        if self.context.rng.random() < self.crit_chance:  # 15% crit chance
             damage = int(damage * self.crit_mult)
-            print(f"💥 CRITICAL! {self.card.name} deals {damage} damage to {target.card.name}")
+            log.emit(ATTACK, "💥 CRITICAL! {unit} deals {damage} damage to {target}",
+                     unit=self.card.name, target=target.card.name, damage=damage, crit=True)
         else:
-            print(f"⚔️ {self.card.name} attacks {target.card.name} for {damage} damage")
+            log.emit(ATTACK, "⚔️ {unit} attacks {target} for {damage} damage",
+                     unit=self.card.name, target=target.card.name, damage=damage)
         target.take_damage(damage, grid, all_units, attacker=self)
         return True
     
@@ -1182,7 +1259,7 @@ class CombatUnit:
 
             if effect in ["stunned", "invisible", "clan_buff", "ace_hit_speed_bonus"]:
                 new_time = value - time_step
-                if new_time <= 0:
+                if new_time <= TIME_EPSILON:
                     effects_to_remove.append(effect)
                 else:
                     self.status_effects[effect] = new_time
@@ -1197,13 +1274,13 @@ class CombatUnit:
                 self.status_effects[effect] -= heal_amount
                 self.status_effects["clan_heal_duration"] -= time_step
 
-                if self.status_effects["clan_heal_duration"] <= 0:
+                if self.status_effects["clan_heal_duration"] <= TIME_EPSILON:
                     effects_to_remove.append("clan_heal")
                     effects_to_remove.append("clan_heal_duration")
 
             elif effect == "juggernaut_shield":
                 new_time = value - time_step
-                if new_time <= 0:
+                if new_time <= TIME_EPSILON:
                     effects_to_remove.append(effect)
                     self.juggernaut_shield_hp = 0
                 else:
@@ -1213,16 +1290,16 @@ class CombatUnit:
         for effect in effects_to_remove:
             del self.status_effects[effect]
             if effect == "stunned":
-                print(f"😵 {self.card.name} recovers from stun!")
+                log.emit(STATUS, "😵 {unit} recovers from stun!", unit=self.card.name, effect=effect, ended=True)
             elif effect == "invisible":
                 self.invisible = False
-                print(f"👀 {self.card.name} becomes visible again!")
+                log.emit(STATUS, "👀 {unit} becomes visible again!", unit=self.card.name, effect=effect, ended=True)
             elif effect == "clan_buff":
-                print(f"✨ {self.card.name}'s Clan buff expired")
+                log.emit(STATUS, "✨ {unit}'s Clan buff expired", unit=self.card.name, effect=effect, ended=True)
             elif effect == "ace_hit_speed_bonus":
-                print(f"🃏 {self.card.name}'s temporary Ace attack speed bonus expired")
+                log.emit(STATUS, "🃏 {unit}'s temporary Ace attack speed bonus expired", unit=self.card.name, effect=effect, ended=True)
             elif effect == "juggernaut_shield":
-                print(f"{self.card.name}'s shield has worn off!")
+                log.emit(STATUS, "{unit}'s shield has worn off!", unit=self.card.name, effect=effect, ended=True)
 
     def can_act(self):
         if 'stunned' in self.status_effects:
@@ -1258,35 +1335,9 @@ class CombatUnit:
         if self.row is None or self.col is None or target.row is None or target.col is None:
             return False
         
-        start_pos = self.get_position()
-        target_pos = target.get_position()
-        attack_range = self.get_range()
-        
-        if start_pos == target_pos:
-            return True
-        
-        # BFS to find minimum movement distance
-        queue = deque([(start_pos, 0)])
-        visited = {start_pos}
-        
-        while queue:
-            (r, c), moves = queue.popleft()
-            
-            if moves >= attack_range:
-                continue
-            
-            for nr, nc in hex_neighbors(r, c):
-                if (nr, nc) == target_pos:
-                    return True
-                
-                if ((nr, nc) not in visited and 
-                    0 <= nr < BOARD_ROWS and 0 <= nc < BOARD_COLS):
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), moves + 1))
-        
-        return False
+        return hex_distance(self.get_position(), target.get_position()) <= self.get_range()
     
-    def should_retarget(self, all_units, grid):
+    def should_retarget(self, all_units, grid, path_cache=None, occupied=None, occupancy_key=None):
         """
         Determines the best target for this unit to attack.
         Returns:
@@ -1294,27 +1345,37 @@ class CombatUnit:
         Retarget if:
             - Current target is dead
             - Or another enemy can be reached faster based on THIS unit's attack range
+
+        If a DistanceFieldCache is given (with the occupied cells of every living
+        unit and their occupancy key), step counts are read from shared distance
+        fields instead of running one BFS per enemy.
         """
         living_enemies = [u for u in all_units if u.alive and u.owner != self.owner]
         if not living_enemies:
             return None
 
-        occupied = get_occupied_positions(all_units, excluding_unit=self)
+        if path_cache is not None:
+            def steps_to(enemy):
+                return path_cache.steps_to_range(self.get_position(), enemy.get_position(), self.get_range(), occupied, occupancy_key)
+        else:
+            occupied_excluding_self = get_occupied_positions(all_units, excluding_unit=self)
+
+            def steps_to(enemy):
+                path = find_path_bfs_to_range(self.get_position(), enemy.get_position(), self.get_range(), occupied_excluding_self)
+                return len(path) - 1 if path else float('inf')
 
         # Distance to current target (steps needed to enter attack range)
         current_target = self.current_target if self.current_target and self.current_target.alive else None
         current_dist = float('inf')
         if current_target:
-            current_path = find_path_bfs_to_range(self.get_position(), current_target.get_position(), self.card.range, occupied)
-            current_dist = len(current_path) - 1 if current_path else float('inf')
+            current_dist = steps_to(current_target)
 
         # Find enemy reachable in fewest steps
         nearest_enemy = current_target
         shortest_dist = current_dist
 
         for enemy in living_enemies:
-            path = find_path_bfs_to_range(self.get_position(), enemy.get_position(), self.card.range, occupied)
-            dist = len(path) - 1 if path else float('inf')
+            dist = steps_to(enemy)
             if dist < shortest_dist:
                 shortest_dist = dist
                 nearest_enemy = enemy
@@ -5,8 +5,5 @@ BOARD_COLS = 5
 # Combat constants
 CRIT_CHANCE = 0.15
 CRIT_MULTIPLIER = 1.5
+TIME_EPSILON = 1e-9        # Remaining effect times at or below this count as expired
 
-# Shared dynamic state
-bombs = []                 # Active bombs in combat
-reserved_positions = set() # Positions reserved for movement/spawns
-rn = 0          # Current round number
@@ -0,0 +1,32 @@
+# --- Random Streams ---
+from .rng import RandomStream
+
+# --- Simulation Clock ---
+from .clock import FixedStepClock
+
+
+class BattleContext:
+    """
+    The state one battle shares between its units: bombs, occupancy, clock and randomness.
+
+    Battle.setup() binds the context to every unit (unit.context) and
+    skeletons inherit it when they spawn, so combat code reaches its own
+    battle's state instead of module globals. Any number of battles can run
+    side by side in one process.
+
+    Args:
+        rng (RandomStream, optional): The battle's random stream; fresh entropy if None.
+        round_number (int, optional): Current round.
+        clock (optional): The battle clock (see clock.py); a 1/60s FixedStepClock if None.
+    """
+
+    def __init__(self, rng=None, round_number=None, clock=None):
+        self.rng = rng if rng is not None else RandomStream()
+        self.round_number = round_number
+        self.units = []         # Every unit in the battle, spawns included
+        self.combined = None    # Combined 8x5 grid
+        self.occupancy = None   # OccupancyIndex of living units, also holding Mega Knight jump reservations
+        self.board_hash = None  # BoardHash of living units on the combined grid
+        self.top_player = None  # Player whose units are flipped onto the top half
+        self.bombs = []         # Pending bombs: {"pos", "damage", "stun", "timer", "radius", "owner"}, plus "event_seq" once the event scheduler has queued them
+        self.clock = clock if clock is not None else FixedStepClock()
@@ -0,0 +1,49 @@
+# --- Cards ---
+from .cards import (
+    Card,
+    CARD_STATS
+)
+
+
+class DeckManager:
+    """
+    The shared card pool players draw their shop hands from.
+
+    Args:
+        rng (RandomStream): Stream used to shuffle the pool.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.card_pool = [Card(name, cost) for name, cost in CARD_STATS.items() for _ in range(4)]
+        self.rng.shuffle(self.card_pool)
+
+    def snapshot(self):
+        """The card pool and shuffle stream, as a tuple for restore()."""
+        return tuple(self.card_pool), self.rng.getstate()
+
+    def restore(self, state):
+        pool, rng_state = state
+        self.card_pool = list(pool)
+        self.rng.setstate(rng_state)
+
+    def draw_hand(self, n=3):
+        hand = []
+        used_names = set()
+        i = 0
+        while len(hand) < n and i < len(self.card_pool):
+            card = self.card_pool[i]
+            if card.name not in used_names:
+                hand.append(card)
+                used_names.add(card.name)
+                self.card_pool.pop(i)
+            else:
+                i += 1
+        return hand
+
+    def return_cards(self, cards):
+        self.card_pool.extend(cards)
+        self.rng.shuffle(self.card_pool)
+
+    def deal_hand(self, n=3):
+        return self.draw_hand(n)
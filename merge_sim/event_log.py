@@ -0,0 +1,144 @@
+# --- Standard Libraries ---
+import json
+from collections import deque
+from contextlib import contextmanager
+
+# --- Levels ---
+DEBUG = 10      # Per-step chatter: placements, positions, retargets, bomb countdowns
+INFO = 20       # Combat and game events: attacks, damage, deaths, synergies, rounds
+WARNING = 30    # Things that should not happen: blocked moves, cancelled abilities
+SILENT = float('inf')
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning"}
+
+# --- Event kinds ---
+DAMAGE = "damage"       # A unit takes (or blocks) damage
+DEATH = "death"         # A unit is eliminated
+ATTACK = "attack"       # A unit attacks or uses an attack ability
+MOVE = "move"           # A unit is placed, moves, dashes or jumps
+SPAWN = "spawn"         # Skeletons and bombs appear
+STATUS = "status"       # Stuns, invisibility and buffs start or end
+SYNERGY = "synergy"     # A trait synergy triggers or modifies damage
+TARGET = "target"       # A unit picks or drops a target
+GAME = "game"           # Rounds, matchups, shop actions and standings
+
+
+class Event:
+    """
+    A single log event.
+
+    `message` is a str.format template filled from `fields`, so the text is
+    only built if a consumer actually asks for it.
+    """
+    __slots__ = ("kind", "level", "message", "fields")
+
+    def __init__(self, kind, level, message, fields):
+        self.kind = kind
+        self.level = level
+        self.message = message
+        self.fields = fields
+
+    def text(self):
+        return self.message.format(**self.fields) if self.fields else self.message
+
+    def to_dict(self):
+        return {"kind": self.kind, "level": LEVEL_NAMES.get(self.level, self.level), **self.fields}
+
+
+class ConsoleConsumer:
+    """Pretty-prints events to stdout, exactly as the simulator used to print them."""
+
+    def __init__(self, level=DEBUG):
+        self.level = level
+
+    def handle(self, event):
+        print(event.text())
+
+
+class JsonlConsumer:
+    """Writes one JSON object per event to a file (path or open file object)."""
+
+    def __init__(self, file, level=INFO):
+        self.level = level
+        self._owns_file = isinstance(file, str)
+        self.file = open(file, "w", encoding="utf-8") if self._owns_file else file
+
+    def handle(self, event):
+        self.file.write(json.dumps(event.to_dict(), default=str))
+        self.file.write("\n")
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+
+
+class RingBufferConsumer:
+    """Keeps the last `capacity` events in memory, e.g. for post-mortems of a single battle."""
+
+    def __init__(self, capacity=1000, level=DEBUG):
+        self.level = level
+        self.events = deque(maxlen=capacity)
+
+    def handle(self, event):
+        self.events.append(event)
+
+    def clear(self):
+        self.events.clear()
+
+
+class EventLog:
+    """
+    Levelled event sink shared by the combat engine, synergies and game loop.
+
+    With no consumers attached emit() returns before building anything, and
+    call sites that need to do extra work to describe an event (joining paths,
+    listing units) check enabled() first.
+    """
+
+    def __init__(self):
+        self.consumers = []
+        self.level = SILENT     # Lowest level any consumer listens to
+
+    def add_consumer(self, consumer):
+        self.consumers.append(consumer)
+        self._update_level()
+        return consumer
+
+    def remove_consumer(self, consumer):
+        if consumer in self.consumers:
+            self.consumers.remove(consumer)
+        self._update_level()
+
+    def _update_level(self):
+        self.level = min((c.level for c in self.consumers), default=SILENT)
+
+    @contextmanager
+    def redirected(self, *consumers):
+        """Send events only to `consumers` for the duration of a with block."""
+        previous = self.consumers
+        self.consumers = list(consumers)
+        self._update_level()
+        try:
+            yield
+        finally:
+            self.consumers = previous
+            self._update_level()
+
+    def muted(self):
+        """Detach every consumer for the duration of a with block, e.g. for throwaway simulations."""
+        return self.redirected()
+
+    def enabled(self, level=INFO):
+        return level >= self.level
+
+    def emit(self, kind, message, level=INFO, **fields):
+        if level < self.level:
+            return
+        event = Event(kind, level, message, fields)
+        for consumer in self.consumers:
+            if level >= consumer.level:
+                consumer.handle(event)
+
+
+# Default sink for the whole simulator; silent until a consumer is attached
+log = EventLog()
@@ -59,11 +59,7 @@ def get_units_in_radius(center, radius, units):
         cr, cc = center
         return [u for u in units if u.alive and hex_distance((u.row, u.col), (cr, cc)) <= radius]
 
-def hex_neighbors(row, col):
-    # Skip invalid positions
-    if row is None or col is None:
-        return []
-
+def _compute_neighbors(row, col, rows=BOARD_ROWS, cols=BOARD_COLS):
     if row % 2 == 0:
         directions = EVEN_ROW_OFFSETS
     else:
@@ -72,16 +68,25 @@ def hex_neighbors(row, col):
     results = []
     for dr, dc in directions:
         r, c = row + dr, col + dc
-        if 0 <= r < BOARD_ROWS and 0 <= c < BOARD_COLS:
+        if 0 <= r < rows and 0 <= c < cols:
             results.append((r, c))
     return results
 
-def hex_distance(a, b):
+def hex_neighbors(row, col):
+    # Skip invalid positions
+    if row is None or col is None:
+        return []
+
+    neighbors = NEIGHBORS.get((row, col))
+    if neighbors is None:
+        return _compute_neighbors(row, col)  # off-board cell, not in the table
+    return neighbors
+
+def _bfs_distance(a, b):
     """Compute hex distance based on movement steps (BFS distance)."""
     if a == b:
         return 0
     
-    from collections import deque
     queue = deque([(a, 0)])
     visited = {a}
     
@@ -98,6 +103,59 @@ def hex_distance(a, b):
     
     return float('inf')  # No path found
 
+def hex_distance(a, b):
+    """Return the hex distance in movement steps, looked up from the precomputed table."""
+    try:
+        return DISTANCES[a][b]
+    except KeyError:
+        return _bfs_distance(a, b)  # off-board position, fall back to a search
+
+def cells_within(center, radius):
+    """
+    Return the board cells within `radius` steps of `center` (inclusive),
+    in row-major order.
+    """
+    table = _CELLS_WITHIN.get(center)
+    if table is None:
+        return tuple(cell for cell in BOARD_CELLS if hex_distance(center, cell) <= radius)
+    if radius < 0:
+        return ()
+    return table[min(int(radius), len(table) - 1)]
+
+def _build_tables(rows, cols):
+    """
+    Precompute neighbour lists, all-pairs distances and "cells within k"
+    sets for a rows x cols board. The board is tiny (40 cells), so this
+    replaces a BFS per distance query with a dictionary lookup.
+    """
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    neighbors = {(r, c): tuple(_compute_neighbors(r, c, rows, cols)) for r, c in cells}
+
+    distances = {}
+    for source in cells:
+        dist = {source: 0}
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            for nbr in neighbors[cell]:
+                if nbr not in dist:
+                    dist[nbr] = dist[cell] + 1
+                    queue.append(nbr)
+        distances[source] = dist
+
+    # cells_within[center][k] -> cells at distance <= k, row-major
+    max_dist = max(d for dist in distances.values() for d in dist.values())
+    cells_within_table = {
+        center: [
+            tuple(cell for cell in cells if distances[center][cell] <= k)
+            for k in range(max_dist + 1)
+        ]
+        for center in cells
+    }
+    return cells, neighbors, distances, cells_within_table
+
+BOARD_CELLS, NEIGHBORS, DISTANCES, _CELLS_WITHIN = _build_tables(BOARD_ROWS, BOARD_COLS)
+
 def find_path_bfs_to_range(start_pos, target_pos, attack_range, occupied_positions):
     """
     BFS to find the shortest path from start_pos to any hex within attack_range
@@ -114,26 +172,31 @@ def find_path_bfs_to_range(start_pos, target_pos, attack_range, occupied_positio
         or None if no path exists.
     """
 
-    queue = deque()
-    queue.append((start_pos, [start_pos]))  # (current_pos, path_so_far)
-    visited = set()
-    visited.add(start_pos)
+    if target_pos is None:
+        return None
+    goals = set(cells_within(target_pos, attack_range))
+    if start_pos in goals:
+        return [start_pos]
 
-    while queue:
-        current_pos, path = queue.popleft()
-        row, col = current_pos
+    # Each cell remembers the cell it was reached from; the path is rebuilt once, at the goal
+    parents = {start_pos: None}
+    queue = deque([start_pos])
 
-        # Check if within attack range
-        distance_to_target = hex_distance(current_pos, target_pos)
-        if distance_to_target <= attack_range:
-            return path
+    while queue:
+        current_pos = queue.popleft()
 
         # Explore neighbors
-        for neighbor in hex_neighbors(row, col):
-            if neighbor in visited or neighbor in occupied_positions:
+        for neighbor in hex_neighbors(*current_pos):
+            if neighbor in parents or neighbor in occupied_positions:
                 continue
-            visited.add(neighbor)
-            queue.append((neighbor, path + [neighbor]))
+            parents[neighbor] = current_pos
+            if neighbor in goals:
+                path = [neighbor]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return path
+            queue.append(neighbor)
 
     # No path found
     return None
\ No newline at end of file
@@ -0,0 +1,166 @@
+# --- Standard Libraries ---
+import io
+import pickle
+
+# --- Combat ---
+from .battle import simulate_combat_headless
+
+# --- Combat / Player Units ---
+from .combat_unit import CombatUnit
+from .player import Player
+
+# --- Event Log ---
+from .event_log import log, SILENT
+
+
+class _External:
+    """Stand-in, inside a worker, for an object the matchup does not own (deck, other players' units)."""
+
+    def __init__(self, key):
+        self.key = key
+
+
+class _EventCapture:
+    """Collects a worker battle's events so the parent can replay them in matchup order."""
+
+    def __init__(self, level):
+        self.level = level
+        self.events = []
+
+    def handle(self, event):
+        self.events.append((event.kind, event.level, event.message, event.fields))
+
+
+class _SendPickler(pickle.Pickler):
+    """Pickles a pair, leaving out objects the pair does not own."""
+
+    def __init__(self, file, pair):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.pair = pair
+        self.external = {}
+
+    def persistent_id(self, obj):
+        first, second = self.pair
+        if isinstance(obj, Player):
+            owned = obj is first or obj is second
+        elif isinstance(obj, CombatUnit):
+            owned = obj.owner is first or obj.owner is second
+        else:
+            owned = obj is not first.deck_manager and obj is not second.deck_manager
+        if owned:
+            return None
+        self.external[id(obj)] = obj
+        return ("external", id(obj))
+
+
+class _ReturnPickler(pickle.Pickler):
+    """Pickles a worker's pair state, naming the pair players and stand-ins instead of copying them."""
+
+    def __init__(self, file, pair):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.pair = pair
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _External):
+            return obj.key
+        if obj is self.pair[0]:
+            return ("pair", 0)
+        if obj is self.pair[1]:
+            return ("pair", 1)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, resolve):
+        super().__init__(file)
+        self.resolve = resolve
+
+    def persistent_load(self, pid):
+        return self.resolve(pid)
+
+
+def run_matchup(payload, round_number, event_driven, rng, log_level):
+    """
+    Worker entry point: unpickle a pair, run its battle and pickle the pair's state back.
+
+    Args:
+        payload (bytes): The pair, from submit_matchup().
+        round_number (int): Current round, forwarded to end-of-combat synergies.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+        rng (RandomStream): The battle's random stream.
+        log_level (float): Lowest level the parent's log listens to; events at or above it are sent back.
+
+    Returns:
+        tuple: (pickled player states, winner index or None, captured events)
+    """
+    pair = _Unpickler(io.BytesIO(payload), _External).load()
+
+    # Forked workers inherit the parent's consumers; only capture here
+    log.consumers = []
+    capture = log.add_consumer(_EventCapture(log_level)) if log_level != SILENT else None
+    try:
+        _, winner, _ = simulate_combat_headless(pair, round_number, event_driven=event_driven, rng=rng)
+    finally:
+        if capture:
+            log.remove_consumer(capture)
+
+    buffer = io.BytesIO()
+    _ReturnPickler(buffer, pair).dump([vars(player) for player in pair])
+    winner_index = None if winner is None else pair.index(winner)
+    return buffer.getvalue(), winner_index, capture.events if capture else []
+
+
+class PendingMatchup:
+    """A matchup running on an executor, to be merged back with result()."""
+
+    def __init__(self, executor, pair, round_number, event_driven, rng):
+        self.pair = pair
+        buffer = io.BytesIO()
+        pickler = _SendPickler(buffer, pair)
+        pickler.dump(pair)
+        self.external = pickler.external
+        self.future = executor.submit(run_matchup, buffer.getvalue(), round_number, event_driven, rng, log.level)
+
+    def _resolve(self, pid):
+        kind, key = pid
+        return self.pair[key] if kind == "pair" else self.external[key]
+
+    def result(self):
+        """
+        Wait for the battle, copy its outcome into the original players and replay its events.
+
+        The pair's fields, benches and grids are replaced by the worker's
+        units, now owned by the original Player objects.
+
+        Returns:
+            Player | None: The winner, or None for a draw.
+        """
+        states, winner_index, events = self.future.result()
+        states = _Unpickler(io.BytesIO(states), self._resolve).load()
+        for player, state in zip(self.pair, states):
+            player.__dict__.clear()
+            player.__dict__.update(state)
+        for kind, level, message, fields in events:
+            log.emit(kind, message, level, **fields)
+        return None if winner_index is None else self.pair[winner_index]
+
+
+def submit_matchup(executor, pair, round_number, event_driven=False, rng=None):
+    """
+    Start a headless battle for `pair` on a process pool.
+
+    The pair is pickled as it is now, so the battle sees exactly the state a
+    serial simulate_combat_headless() call would. Any executor gives the same
+    results, but only a process pool runs the battles in parallel.
+
+    Args:
+        executor (concurrent.futures.Executor): Pool to run the battle on, normally a ProcessPoolExecutor.
+        pair (list): The two players.
+        round_number (int): Current round, forwarded to end-of-combat synergies.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+        rng (RandomStream, optional): The battle's random stream.
+
+    Returns:
+        PendingMatchup: Call result() to merge the battle back.
+    """
+    return PendingMatchup(executor, list(pair), round_number, event_driven, rng)
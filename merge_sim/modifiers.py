@@ -1,10 +1,10 @@
-import random
 from .cards import create_card
 from .combat_unit import CombatUnit
 from .constants import BOARD_ROWS, BOARD_COLS
 from .board_utils import (
     get_occupied_positions,
 )
+from .event_log import log, DEBUG, SYNERGY
 
 class ClanSynergyManager:
     def __init__(self, owner):
@@ -19,7 +19,7 @@ class ClanSynergyManager:
             if "clan" in getattr(u.card, "modifiers", [])
         })
 
-        print(f"🛡️ Clan units at round start: {self.clan_count}")
+        log.emit(SYNERGY, "🛡️ Clan units at round start: {count}", synergy="clan", player=self.owner.name, count=self.clan_count)
 
     def trigger(self, unit):
         """
@@ -58,8 +58,8 @@ class ClanSynergyManager:
         unit.status_effects["clan_heal"] = heal  # store total heal, spread over 3s
         unit.status_effects["clan_heal_duration"] = 3.0  # track remaining heal duration
 
-        print(f"✨ Clan synergy triggered for {unit.card.name}! "
-              f"Heal: {int(heal)}, Attack Speed buff: {int(attack_speed_buff*100)}% for 3s")
+        log.emit(SYNERGY, "✨ Clan synergy triggered for {unit}! Heal: {heal}, Attack Speed buff: {buff}% for 3s",
+                 synergy="clan", unit=unit.card.name, heal=int(heal), buff=int(attack_speed_buff*100))
 
 class BrawlerSynergyManager:
     def __init__(self, owner):
@@ -73,7 +73,7 @@ class BrawlerSynergyManager:
             if "brawler" in getattr(u.card, "modifiers", [])
         })
 
-        print(f"🤜 Brawler units at round start: {self.brawler_count}")
+        log.emit(SYNERGY, "🤜 Brawler units at round start: {count}", synergy="brawler", player=self.owner.name, count=self.brawler_count)
 
         if self.brawler_count < 2:
             return  # Not enough Brawlers for any bonus
@@ -84,7 +84,7 @@ class BrawlerSynergyManager:
                 bonus_multiplier = 0.8 if self.brawler_count >= 4 else 0.4
                 unit.max_hp = int(unit.max_hp * (1 + bonus_multiplier))
                 unit.current_hp = unit.max_hp
-                print(f"💪 {unit.card.name} HP increased by {int(bonus_multiplier*100)}%")
+                log.emit(SYNERGY, "💪 {unit} HP increased by {bonus}%", synergy="brawler", unit=unit.card.name, bonus=int(bonus_multiplier*100))
 
         # Apply team-wide bonus if 4 or more Brawlers
         if self.brawler_count >= 4:
@@ -92,7 +92,7 @@ class BrawlerSynergyManager:
                 if "brawler" not in unit.card.modifiers:
                     unit.max_hp = int(unit.max_hp * 1.3)
                     unit.current_hp = unit.max_hp
-                    print(f"✨ {unit.card.name} HP increased by 30% for team Brawler bonus")
+                    log.emit(SYNERGY, "✨ {unit} HP increased by 30% for team Brawler bonus", synergy="brawler", unit=unit.card.name)
 
 class NobleSynergyManager:
     def __init__(self, owner, is_top_player=False):
@@ -109,7 +109,7 @@ class NobleSynergyManager:
             if "noble" in getattr(u.card, "modifiers", [])
         })
 
-        print(f"👑 Noble units at round start: {self.noble_count}")
+        log.emit(SYNERGY, "👑 Noble units at round start: {count}", synergy="noble", player=self.owner.name, count=self.noble_count)
 
         # Determine bonuses based on count
         if self.noble_count >= 4:
@@ -148,14 +148,15 @@ class NobleSynergyManager:
                 unit.noble_damage_taken_multiplier = 1.0
                 unit.noble_damage_dealt_multiplier = 1.0
 
-            print(f"🛡️ {unit.card.name} (Owner: {unit.owner.name}) "
-                  f"Noble bonus applied: "
-                  f"Damage taken x{unit.noble_damage_taken_multiplier:.2f}, "
-                  f"Damage dealt x{unit.noble_damage_dealt_multiplier:.2f}")
+            log.emit(SYNERGY, "🛡️ {unit} (Owner: {owner}) Noble bonus applied: "
+                              "Damage taken x{taken:.2f}, Damage dealt x{dealt:.2f}",
+                     synergy="noble", unit=unit.card.name, owner=unit.owner.name,
+                     taken=unit.noble_damage_taken_multiplier, dealt=unit.noble_damage_dealt_multiplier)
 
 class GoblinSynergyManager:
-    def __init__(self, owner):
+    def __init__(self, owner, context):
         self.owner = owner               # reference to player
+        self.context = context           # BattleContext; its random stream picks rewards
         self.goblin_count_last_combat = 0
         self.pending_reward = None       # reward type to grant next buy phase
 
@@ -170,11 +171,11 @@ class GoblinSynergyManager:
                 goblin_names.add(unit.card.name.lower())
 
         self.goblin_count_last_combat = len(goblin_names)
-        print(f"👺 Goblins units at round start: {len(goblin_names)}")
+        log.emit(SYNERGY, "👺 Goblins units at round start: {count}", synergy="goblin", player=self.owner.name, count=len(goblin_names))
 
         # Decide what reward to prepare
         if self.goblin_count_last_combat >= 4:
-            if random.random() < 0.6:
+            if self.context.rng.random() < 0.6:
                 self.pending_reward = "high"   # Dart Goblin or Goblin Machine
             else:
                 self.pending_reward = "mid"    # Goblin or Spear Goblin
@@ -190,9 +191,9 @@ class GoblinSynergyManager:
 
         # Pick which goblin to spawn
         if self.pending_reward == "mid":
-            card_name = random.choice(["goblin", "spear-goblin"])
+            card_name = self.context.rng.choice(["goblin", "spear-goblin"])
         elif self.pending_reward == "high":
-            card_name = random.choice(["dart-goblin", "goblin-machine"])
+            card_name = self.context.rng.choice(["dart-goblin", "goblin-machine"])
         else:
             return
 
@@ -208,10 +209,12 @@ class GoblinSynergyManager:
         max_bench = 5
         if len(self.owner.bench) < max_bench:
             self.owner.bench.append(new_unit)
-            print(f"🟢 Goblin Synergy: {self.owner.name} gained a free {card_name} and placed on bench")
+            log.emit(SYNERGY, "🟢 Goblin Synergy: {player} gained a free {card} and placed on bench",
+                     synergy="goblin", player=self.owner.name, card=card_name)
         else:
             # No space anywhere, discard
-            print(f"🟡 Goblin Synergy: {self.owner.name} could not place free {card_name}, no space")
+            log.emit(SYNERGY, "🟡 Goblin Synergy: {player} could not place free {card}, no space",
+                     synergy="goblin", player=self.owner.name, card=card_name)
 
         # Reset reward so it doesn’t fire twice
         self.pending_reward = None
@@ -230,22 +233,23 @@ class ThrowerSynergyManager:
         ]
         unique_throwers = {u.card.name for u in thrower_units}
 
-        print(f"🏹 {self.owner.name} has {len(unique_throwers)} unique throwers at start of round")
+        log.emit(SYNERGY, "🏹 {player} has {count} unique throwers at start of round",
+                 synergy="thrower", player=self.owner.name, count=len(unique_throwers))
 
 
         if len(unique_throwers) >= 3:
             self.thrower_active = True
             for u in thrower_units:
-                if not getattr(u, "_thrower_buffed", False):
-                    u.card.range += 1
+                if not u._thrower_buffed:
+                    u.range_bonus += 1
                     u._thrower_buffed = True
                     self.buffed_units.append(u)
 
     def reset_synergy(self):
         """Undo thrower buffs at end of combat."""
         for unit in self.buffed_units:
-            if getattr(unit, "_thrower_buffed", False):
-                unit.card.range -= 1
+            if unit._thrower_buffed:
+                unit.range_bonus -= 1
                 unit._thrower_buffed = False
         self.buffed_units.clear()
         self.thrower_active = False
@@ -267,10 +271,11 @@ class UndeadSynergyManager:
                     undead_units.append(u)
                     seen_names.add(u.card.name.lower())
 
-        print(f"🦴 Undead units on field: {len(undead_units)} unique")
+        log.emit(SYNERGY, "🦴 Undead units on field: {count} unique", synergy="undead", player=self.owner.name, count=len(undead_units))
 
         if len(undead_units) < 2:
-            print(f"🦴 Undead synergy inactive, only {len(undead_units)} undead on field.")
+            log.emit(SYNERGY, "🦴 Undead synergy inactive, only {count} undead on field.",
+                     synergy="undead", player=self.owner.name, count=len(undead_units))
             return  # Synergy does not activate
         
         # Determine number of enemies to curse
@@ -291,15 +296,15 @@ class UndeadSynergyManager:
         for enemy in self.cursed_enemies:
             enemy.current_hp = min(enemy.current_hp, enemy.current_hp * (1 - max_hp_cut))
             enemy._undead_cursed = True  # Internal flag
-            print(f"🦴 {enemy.card.name} cursed by Undead! Max HP reduced by {int(max_hp_cut*100)}%")
+            log.emit(SYNERGY, "🦴 {unit} cursed by Undead! Max HP reduced by {cut}%", synergy="undead", unit=enemy.card.name, cut=int(max_hp_cut*100))
 
         self.active_bonus = 0.0  # Reset bonus at start
 
     def on_enemy_death(self, enemy):
         """Called when an enemy dies to check for curse triggers."""
-        if getattr(enemy, "_undead_cursed", False):
+        if enemy._undead_cursed:
             self.active_bonus += 0.3  # +30% damage
-            print(f"🦴 {enemy.card.name} died, undead units gain +30% damage!")
+            log.emit(SYNERGY, "🦴 {unit} died, undead units gain +30% damage!", synergy="undead", unit=enemy.card.name)
             # Optional: remove the cursed flag
             enemy._undead_cursed = False
 
@@ -327,14 +332,14 @@ class AvengerSynergyManager:
         self.avengers = [u for u in getattr(self.owner, "field", [])
                          if u.alive and "avenger" in getattr(u.card, "modifiers", [])]
         unique_count = len(set(self.avengers))
-        print(f"🛡️ Avenger Synergy: {unique_count} unique Avenger units on the field.")
+        log.emit(SYNERGY, "🛡️ Avenger Synergy: {count} unique Avenger units on the field.", synergy="avenger", player=self.owner.name, count=unique_count)
 
         if unique_count >= 3:
             self.active_bonus = 0.3
-            print(f"🛡️ Avenger Synergy active: all Avengers gain +30% damage!")
+            log.emit(SYNERGY, "🛡️ Avenger Synergy active: all Avengers gain +30% damage!", synergy="avenger", player=self.owner.name, active=True)
         else:
             self.active_bonus = 0.0
-            print(f"🛡️ Avenger Synergy inactive, less than 3 Avengers.")
+            log.emit(SYNERGY, "🛡️ Avenger Synergy inactive, less than 3 Avengers.", synergy="avenger", player=self.owner.name, active=False)
 
         self.update_last_standing()  # Check if last standing applies at start
 
@@ -351,7 +356,7 @@ class AvengerSynergyManager:
     def on_unit_death(self, unit):
         """Call when any Avenger dies to update last-standing logic."""
         if unit in self.avengers:
-            print(f"⚔️ Avenger {unit.card.name} died, checking last-standing bonus.")
+            log.emit(SYNERGY, "⚔️ Avenger {unit} died, checking last-standing bonus.", synergy="avenger", unit=unit.card.name)
             self.update_last_standing()
 
     def get_damage_multiplier(self, unit):
@@ -381,14 +386,15 @@ class RangerSynergyManager:
         self.rangers = [u for u in getattr(self.owner, "field", [])
                         if u.alive and "ranger" in getattr(u.card, "modifiers", [])]
         unique_count = len(set(self.rangers))
-        print(f"🏹 Ranger Synergy: {unique_count} unique Rangers on the field.")
+        log.emit(SYNERGY, "🏹 Ranger Synergy: {count} unique Rangers on the field.", synergy="ranger", player=self.owner.name, count=unique_count)
 
         if unique_count >= 3:
             self.active = True
-            print(f"🏹 Ranger Synergy active: Rangers gain +15% attack speed per attack, stacking up to {self.max_stacks}x.")
+            log.emit(SYNERGY, "🏹 Ranger Synergy active: Rangers gain +15% attack speed per attack, stacking up to {max_stacks}x.",
+                     synergy="ranger", player=self.owner.name, active=True, max_stacks=self.max_stacks)
         else:
             self.active = False
-            print(f"🏹 Ranger Synergy inactive, less than 3 Rangers.")
+            log.emit(SYNERGY, "🏹 Ranger Synergy inactive, less than 3 Rangers.", synergy="ranger", player=self.owner.name, active=False)
 
     def on_attack(self, unit):
         """Call this whenever a Ranger attacks to increment its stack."""
@@ -399,7 +405,8 @@ class RangerSynergyManager:
             current_stacks = getattr(unit, "_ranger_stacks", 0)
             if current_stacks < self.max_stacks:
                 unit._ranger_stacks = current_stacks + 1
-                print(f"🏹 {unit.card.name} attacks! Ranger stacks: {unit._ranger_stacks}/{self.max_stacks}")
+                log.emit(SYNERGY, "🏹 {unit} attacks! Ranger stacks: {stacks}/{max_stacks}",
+                         synergy="ranger", unit=unit.card.name, stacks=unit._ranger_stacks, max_stacks=self.max_stacks)
 
     def get_attack_speed_multiplier(self, unit):
         """Return multiplier for unit attack speed based on current stacks (exponential)."""
@@ -429,13 +436,13 @@ class AceSynergyManager:
         self.unique_ace_units = [u for u in getattr(self.owner, "field", [])
                                  if u.alive and "ace" in getattr(u.card, "modifiers", [])]
         unique_count = len(set(self.unique_ace_units))
-        print(f"🃏 Ace Synergy: {unique_count} unique Ace units on the field.")
+        log.emit(SYNERGY, "🃏 Ace Synergy: {count} unique Ace units on the field.", synergy="ace", player=self.owner.name, count=unique_count)
 
         if unique_count < 2:
             self.active = False
             self.captain = None
             self.captain_damage_bonus = 0.0
-            print("🃏 Ace Synergy inactive, less than 2 Ace units.")
+            log.emit(SYNERGY, "🃏 Ace Synergy inactive, less than 2 Ace units.", synergy="ace", player=self.owner.name, active=False)
             return
 
         self.active = True
@@ -448,15 +455,16 @@ class AceSynergyManager:
 
         # Sort by highest star first, then highest elixir, then first added
         self.captain = sorted(alive_units, key=lambda u: (-u.card.star, -u.card.cost))[0]
-        print(f"🃏 Captain selected: {self.captain.card.name} (Stars: {self.captain.card.star}, Cost: {self.captain.card.cost})")
+        log.emit(SYNERGY, "🃏 Captain selected: {unit} (Stars: {star}, Cost: {cost})",
+                 synergy="ace", unit=self.captain.card.name, star=self.captain.card.star, cost=self.captain.card.cost)
 
         # --- Apply Captain damage bonus ---
         if unique_count >= 4:
             self.captain_damage_bonus = 0.6
-            print("🃏 Captain gains +60% damage!")
+            log.emit(SYNERGY, "🃏 Captain gains +60% damage!", synergy="ace", bonus=0.6)
         elif unique_count >= 2:
             self.captain_damage_bonus = 0.3
-            print("🃏 Captain gains +30% damage!")
+            log.emit(SYNERGY, "🃏 Captain gains +30% damage!", synergy="ace", bonus=0.3)
 
     def get_damage_multiplier(self, unit):
         """Return damage multiplier for a given unit."""
@@ -473,20 +481,18 @@ class AceSynergyManager:
         if len(self.unique_ace_units) >= 4:
             heal_amount = 0.3 * damage_dealt
             self.captain.current_hp = min(self.captain.current_hp + heal_amount, self.captain.max_hp)
-            print(f"🃏 Captain heals for {heal_amount} HP (30% of damage dealt)")
+            log.emit(SYNERGY, "🃏 Captain heals for {heal} HP (30% of damage dealt)", synergy="ace", unit=self.captain.card.name, heal=heal_amount)
 
     def on_captain_kill(self, enemy):
         """Called whenever the Captain kills an enemy."""
         if not self.active or self.captain is None:
             return
 
-        print(f"🃏 Captain killed {enemy.card.name}, team gains +20% attack speed for 4s")
+        log.emit(SYNERGY, "🃏 Captain killed {unit}, team gains +20% attack speed for 4s", synergy="ace", unit=enemy.card.name)
 
         # Apply or refresh status effect on all alive team units
         for unit in getattr(self.owner, "field", []):
             if unit.alive:
-                if not hasattr(unit, "status_effects"):
-                    unit.status_effects = {}
                 # Set or refresh duration (seconds)
                 unit.status_effects["ace_hit_speed_bonus"] = 4.0
 
@@ -502,11 +508,11 @@ class AssassinSynergyManager:
         self.assassins = [u for u in getattr(self.owner, "field", [])
                           if u.alive and "assassin" in getattr(u.card, "modifiers", [])]
         unique_count = len(set(self.assassins))
-        print(f"🗡️ Assassin Synergy: {unique_count} unique assassins on the field.")
+        log.emit(SYNERGY, "🗡️ Assassin Synergy: {count} unique assassins on the field.", synergy="assassin", player=self.owner.name, count=unique_count)
 
         if unique_count >= 3:
             self.active = True
-            print(f"🗡️ Assassin Synergy active: +35% crit chance, +35% crit damage!")
+            log.emit(SYNERGY, "🗡️ Assassin Synergy active: +35% crit chance, +35% crit damage!", synergy="assassin", player=self.owner.name, active=True)
             self.place_assassins_backline(units, combined_grid, is_top_player)
             for assassin in self.assassins:
                 assassin.crit_chance = 0.5
@@ -539,7 +545,10 @@ class AssassinSynergyManager:
             search_cols = [c for c in search_cols if 0 <= c < len(grid[0])]
 
             while not placed and 0 <= target_row < len(grid):
-                occupied_positions = get_occupied_positions(units, reserved_positions=None, excluding_unit=assassin)
+                if assassin.context is not None:
+                    occupied_positions = assassin.context.occupancy.view(excluding_unit=assassin)
+                else:
+                    occupied_positions = get_occupied_positions(units, reserved_positions=None, excluding_unit=assassin)
                 for col in search_cols:
                     if (target_row, col) not in occupied_positions:
                         assassin.move_to(target_row, col, grid)
@@ -568,7 +577,7 @@ class JuggernautSynergyManager:
         if self.juggernaut_count == 0:
             return
 
-        print(f"🛡️ Juggernauts at round start: {self.juggernaut_count}")
+        log.emit(SYNERGY, "🛡️ Juggernauts at round start: {count}", synergy="juggernaut", player=self.owner.name, count=self.juggernaut_count)
 
         # Apply shields
         self.apply_juggernaut_shields(combined_grid, is_top_player)
@@ -598,7 +607,7 @@ class JuggernautSynergyManager:
                 if 0 <= r < len(combined_grid) and 0 <= c < len(combined_grid[r]):
                     ally = combined_grid[r][c]
                     if ally and ally.owner == self.owner:
-                        print(f"{ally.card.name} needs a shield for being behind a unit!")
+                        log.emit(SYNERGY, "{unit} needs a shield for being behind a unit!", DEBUG, synergy="juggernaut", unit=ally.card.name)
                         shield_value = ally.max_hp * shield_percent
                         self._apply_shield(ally, shield_value)
 
@@ -606,8 +615,8 @@ class JuggernautSynergyManager:
         """Give a shield to a unit (stackable)."""
         unit.status_effects["juggernaut_shield"] = 12  # lasts 12s
         unit.juggernaut_shield_hp += shield_value
-        print(f"🛡️ {unit.card.name} gains Juggernaut shield "
-              f"({shield_value:.1f}, total: {unit.juggernaut_shield_hp:.1f})")
+        log.emit(SYNERGY, "🛡️ {unit} gains Juggernaut shield ({shield:.1f}, total: {total:.1f})",
+                 synergy="juggernaut", unit=unit.card.name, shield=shield_value, total=unit.juggernaut_shield_hp)
 
     def _behind_hexes(self, jug, is_top_player):
         """Return the two hexes behind a Juggernaut based on row parity and team side."""
@@ -0,0 +1,321 @@
+# --- Standard Libraries ---
+import random
+import sys
+from collections import deque
+
+# --- Board / Hex Utilities ---
+from .hex_utils import (
+    BOARD_CELLS,
+    NEIGHBORS,
+    cells_within,
+    find_path_bfs_to_range,
+    hex_distance,
+    hex_neighbors,
+)
+
+INF = float('inf')
+
+
+def build_distance_field(target_pos, attack_range, occupied_positions):
+    """
+    Multi-source BFS giving, for every free cell, the number of steps needed
+    to reach any free cell within attack_range of target_pos.
+
+    Args:
+        target_pos (tuple): (row, col) of the unit being chased.
+        attack_range (int): Attack range of the chasing units.
+        occupied_positions (set): Cells that cannot be entered.
+
+    Returns:
+        dict mapping (row, col) -> steps. Unreachable and occupied cells are absent.
+    """
+    field = {}
+    queue = deque()
+    for cell in cells_within(target_pos, attack_range):
+        if cell not in occupied_positions:
+            field[cell] = 0
+            queue.append(cell)
+
+    while queue:
+        cell = queue.popleft()
+        next_dist = field[cell] + 1
+        for nbr in NEIGHBORS[cell]:
+            if nbr not in field and nbr not in occupied_positions:
+                field[nbr] = next_dist
+                queue.append(nbr)
+
+    return field
+
+
+class Route:
+    """
+    A unit's planned way into range of a target, reused by DistanceFieldCache.next_move.
+
+    `path` runs from the cell the unit planned from to a cell in range and
+    `step` is the unit's index on it. `freed_seen` is how much of the
+    occupancy's freed-cell log has already been checked against the route.
+    """
+
+    __slots__ = ("target_pos", "attack_range", "path", "step", "freed_seen")
+
+    def __init__(self, target_pos, attack_range, path, freed_seen):
+        self.target_pos = target_pos
+        self.attack_range = attack_range
+        self.path = path
+        self.step = 0
+        self.freed_seen = freed_seen
+
+
+class DistanceFieldCache:
+    """
+    Shares distance fields between every unit chasing the same target.
+
+    A field depends only on (target position, attack range, board occupancy),
+    so it is built once and reused until the occupancy changes. Fields treat
+    every living unit as an obstacle, including the unit asking; the helpers
+    below correct for the asking unit's own cell so their answers match a
+    BFS run with that cell free.
+
+    next_move() also keeps each unit's whole route to its target, so a unit
+    walking an unchanged route skips the field on later ticks even when
+    other units have moved elsewhere on the board.
+    """
+
+    def __init__(self):
+        self.occupancy_key = None
+        self.fields = {}
+        self.routes = {}    # unit -> Route
+
+    def get_field(self, target_pos, attack_range, occupied_positions, occupancy_key):
+        if occupancy_key != self.occupancy_key:
+            self.fields.clear()
+            self.occupancy_key = occupancy_key
+
+        key = (target_pos, attack_range)
+        field = self.fields.get(key)
+        if field is None:
+            field = build_distance_field(target_pos, attack_range, occupied_positions)
+            self.fields[key] = field
+        return field
+
+    def best_move(self, unit_pos, target_pos, attack_range, occupied_positions, occupancy_key):
+        """
+        Pick the free neighbour of unit_pos that gets closest to attack range.
+
+        Equivalent to running find_path_bfs_to_range from each free neighbour
+        and keeping the first one with the shortest path.
+
+        Returns:
+            (row, col) or None if no neighbour leads into range.
+        """
+        field = self.get_field(target_pos, attack_range, occupied_positions, occupancy_key)
+        neighbors = hex_neighbors(*unit_pos)
+
+        # Paths may double back through the unit's own cell, which is only free for itself
+        via_self = INF
+        for nbr in neighbors:
+            dist = field.get(nbr, INF)
+            if dist < via_self:
+                via_self = dist
+        via_self += 2
+
+        best_move = None
+        best_dist = INF
+        for move_pos in neighbors:
+            if move_pos in occupied_positions:
+                continue
+            dist = min(field.get(move_pos, INF), via_self)
+            if dist < best_dist:
+                best_dist = dist
+                best_move = move_pos
+        return best_move
+
+    def next_move(self, unit, unit_pos, target_pos, attack_range, occupancy, occupancy_key):
+        """
+        best_move() for `unit`, following the route it planned on an earlier tick while that is still exact.
+
+        A route is the chain of moves best_move() would pick tick after tick
+        on the board it was planned on. Units filling cells elsewhere only
+        lengthen other ways in, so it stays exact until the target moves, the
+        range changes, the unit leaves it, a cell still ahead is taken, or a
+        cell opens up close enough to offer a way in no longer than what
+        is left of it.
+
+        Args:
+            unit (CombatUnit): The moving unit; routes are kept per unit.
+            occupancy (OccupancyIndex): Living units' cells, with the log of freed cells.
+
+        Returns:
+            (row, col) or None if no neighbour leads into range.
+        """
+        route = self.routes.get(unit)
+        if route is not None and self._route_holds(route, unit_pos, target_pos, attack_range, occupancy):
+            return route.path[route.step + 1]
+
+        move = self.best_move(unit_pos, target_pos, attack_range, occupancy, occupancy_key)
+        field = self.fields[(target_pos, attack_range)]
+        if move is None or move not in field:
+            self.routes.pop(unit, None)
+            return move
+
+        # Walk down the field the way best_move() will from each cell of the route
+        path = [unit_pos, move]
+        dist = field[move]
+        while dist > 0:
+            dist -= 1
+            for nbr in hex_neighbors(*path[-1]):
+                if field.get(nbr) == dist:
+                    path.append(nbr)
+                    break
+        self.routes[unit] = Route(target_pos, attack_range, path, len(occupancy.freed))
+        return move
+
+    @staticmethod
+    def _route_holds(route, unit_pos, target_pos, attack_range, occupancy):
+        if route.target_pos != target_pos or route.attack_range != attack_range:
+            return False
+        path = route.path
+        step = route.step
+        if path[step] != unit_pos:
+            if step + 1 >= len(path) or path[step + 1] != unit_pos:
+                return False
+            step = route.step = step + 1  # Moved along the route since the last tick
+        if step + 1 >= len(path):
+            return False
+
+        for cell in path[step + 1:]:
+            if cell in occupancy:
+                return False
+
+        # A freed cell can only shorten a way in that passes through it, which takes at least
+        # hex distance to it plus its hex distance to range. Cells the unit itself left never can.
+        remaining = len(path) - 1 - step
+        freed = occupancy.freed
+        walked = path[:step]
+        for cell in freed[route.freed_seen:]:
+            if cell in walked:
+                continue
+            if hex_distance(unit_pos, cell) + max(0, hex_distance(cell, target_pos) - attack_range) <= remaining:
+                return False
+        route.freed_seen = len(freed)
+        return True
+
+    def steps_to_range(self, unit_pos, target_pos, attack_range, occupied_positions, occupancy_key):
+        """
+        Number of moves the unit at unit_pos needs to get within attack_range
+        of target_pos, or inf if it cannot get there.
+        """
+        if hex_distance(unit_pos, target_pos) <= attack_range:
+            return 0
+        field = self.get_field(target_pos, attack_range, occupied_positions, occupancy_key)
+        best = INF
+        for nbr in hex_neighbors(*unit_pos):
+            dist = field.get(nbr, INF)
+            if dist < best:
+                best = dist
+        return best + 1
+
+
+# === SELF-CHECK ===
+
+def _reference_move(unit_pos, target_pos, attack_range, occupied):
+    """The move best_move() stands in for: a BFS from each free neighbour, first shortest path wins."""
+    others = occupied - {unit_pos}
+    best_move = None
+    best_steps = INF
+    for nbr in hex_neighbors(*unit_pos):
+        if nbr in occupied:
+            continue
+        path = find_path_bfs_to_range(nbr, target_pos, attack_range, others)
+        if path is not None and len(path) - 1 < best_steps:
+            best_steps = len(path) - 1
+            best_move = nbr
+    return best_move
+
+
+def _random_board(rng):
+    """(unit cell, target cell, attack range, occupied cells), the unit out of range as when it moves."""
+    while True:
+        unit_pos, target_pos, *blockers = rng.sample(BOARD_CELLS, 2 + rng.randint(0, 20))
+        attack_range = rng.randint(1, 3)
+        if hex_distance(unit_pos, target_pos) > attack_range:
+            return unit_pos, target_pos, attack_range, {unit_pos, target_pos, *blockers}
+
+
+def check_best_move(trials=5000, seed=0):
+    """
+    Compares best_move() and steps_to_range() with find_path_bfs_to_range on random boards.
+
+    Returns:
+        int: Boards checked; raises AssertionError on the first mismatch.
+    """
+    rng = random.Random(seed)
+    for trial in range(trials):
+        unit_pos, target_pos, attack_range, occupied = _random_board(rng)
+        cache = DistanceFieldCache()
+        move = cache.best_move(unit_pos, target_pos, attack_range, occupied, trial)
+        expected = _reference_move(unit_pos, target_pos, attack_range, occupied)
+        assert move == expected, f"best_move {move} != BFS {expected} for {unit_pos} -> {target_pos}, range {attack_range}"
+
+        path = find_path_bfs_to_range(unit_pos, target_pos, attack_range, occupied - {unit_pos})
+        steps = cache.steps_to_range(unit_pos, target_pos, attack_range, occupied, trial)
+        assert steps == (len(path) - 1 if path else INF), \
+            f"steps_to_range {steps} != BFS {path} for {unit_pos} -> {target_pos}, range {attack_range}"
+    return trials
+
+
+def check_next_move(games=1000, seed=0):
+    """
+    Walks a unit to its target with next_move() while blockers and the target shuffle around it,
+    comparing every move with best_move() on a fresh cache.
+
+    Returns:
+        tuple: (moves checked, moves taken from a kept route); raises AssertionError on the first mismatch.
+    """
+    from .board_utils import OccupancyIndex
+
+    rng = random.Random(seed)
+    moves = reused = 0
+    for _ in range(games):
+        unit_pos, target_pos, attack_range, occupied = _random_board(rng)
+        occupancy = OccupancyIndex()
+        for cell in occupied:
+            occupancy.add(cell)
+        cache = DistanceFieldCache()
+        unit = object()
+
+        for _ in range(30):
+            # Other units step around, and now and then the target moves
+            for _ in range(rng.randint(0, 2)):
+                blockers = [cell for cell in occupancy.counts if cell not in (unit_pos, target_pos)]
+                free = [cell for cell in BOARD_CELLS if cell not in occupancy]
+                if blockers and free:
+                    occupancy.move(rng.choice(blockers), rng.choice(free))
+            if rng.random() < 0.1:
+                new_pos = rng.choice([cell for cell in BOARD_CELLS if cell not in occupancy])
+                occupancy.move(target_pos, new_pos)
+                target_pos = new_pos
+            if hex_distance(unit_pos, target_pos) <= attack_range:
+                break
+
+            route = cache.routes.get(unit)
+            move = cache.next_move(unit, unit_pos, target_pos, attack_range, occupancy, occupancy.version)
+            expected = DistanceFieldCache().best_move(unit_pos, target_pos, attack_range, occupancy, occupancy.version)
+            assert move == expected, f"next_move {move} != best_move {expected} for {unit_pos} -> {target_pos}"
+            moves += 1
+            reused += route is not None and cache.routes.get(unit) is route
+            if move is None:
+                break
+            occupancy.move(unit_pos, move)
+            unit_pos = move
+    return moves, reused
+
+
+if __name__ == '__main__':
+    # python -m merge_sim.pathfinding --check [--trials N] [--seed N]
+    trials = int(sys.argv[sys.argv.index("--trials") + 1]) if "--trials" in sys.argv else 5000
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    if "--check" in sys.argv:
+        print(f"best_move / steps_to_range match the BFS on {check_best_move(trials, seed)} boards")
+        moves, reused = check_next_move(max(1, trials // 5), seed)
+        print(f"next_move matches best_move on {moves} moves ({reused} from kept routes)")
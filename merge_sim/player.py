@@ -1,6 +1,6 @@
 # --- Standard Libraries ---
-import random
 from collections import deque
+from operator import attrgetter
 
 # --- Globals / Shared State ---
 from .constants import BOARD_ROWS, BOARD_COLS
@@ -14,9 +14,23 @@ from .cards import (
 # --- Combat / Player Units ---
 from .combat_unit import CombatUnit
 
+# --- Event Log ---
+from .event_log import log, DEBUG, INFO, WARNING, GAME, MOVE
+
+# --- Random Streams ---
+from .rng import RandomStream
+
+# --- Board Hashing ---
+from .zobrist import BoardHash
+
 # --- Bots ---
 from .bot import *
 
+# What a unit carries from one shop phase to the next besides its card: its cell, the HP it
+# ended its last battle on (shown by display_zone) and an Undead curse that outlives the
+# battle it was cast in. Battle.setup() resets everything else.
+unit_shop_state = attrgetter("row", "col", "current_hp", "_undead_cursed")
+
 def get_player_colour(player_name):
     """Return ANSI colour code based on player name."""
     colours = {
@@ -28,7 +42,7 @@ def get_player_colour(player_name):
     return colours.get(player_name, "\033[0m")  # Default no colour
 
 class Player:
-    def __init__(self, name, deck_manager, bot_logic):
+    def __init__(self, name, deck_manager, bot_logic, rng=None):
         self.name = name
         self.deck_manager = deck_manager
         self.bot_logic = bot_logic
@@ -38,8 +52,48 @@ class Player:
         self.elixir = 0
         self.hp = 10
         self.grid = [[None for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+        self.board_hash = BoardHash()  # Zobrist hash of the grid, kept up to date on every place and remove
+        self._grid_state = None  # (grid as tuples, board hash) for snapshot(); None once the grid has changed
         self.opponent = None
         self.team_id = None  # Add a team ID or number if needed
+        self.rng = rng if rng is not None else RandomStream()  # Placement and bot decisions
+
+    def snapshot(self):
+        """
+        The player's state between shop decisions, as a tuple for restore().
+
+        Covers HP, elixir, hand, field, bench, grid, opponent, the player's
+        random stream and the little state field units keep between battles
+        (unit_shop_state). Cards are shared and units are kept by reference;
+        the rest of a unit's combat state is not captured, since
+        Battle.setup() resets it when the next battle starts.
+
+        Only place_on_grid_random() and remove_unit_from_grid() change the
+        grid, so its tuple copy (and board hash) is kept until one of them
+        runs and shared by every snapshot in between.
+
+        Returns:
+            tuple: Opaque state for restore().
+        """
+        grid = self._grid_state
+        if grid is None:
+            grid = self._grid_state = (tuple(map(tuple, self.grid)), self.board_hash.value)
+        return (self.hp, self.elixir, tuple(self.hand), tuple(self.field), tuple(self.bench),
+                grid, tuple(map(unit_shop_state, self.field)), self.opponent, self.rng.getstate())
+
+    def restore(self, state):
+        """Puts the player back to a snapshot() taken earlier in the same game."""
+        self.hp, self.elixir, hand, field, bench, grid, unit_states, self.opponent, rng_state = state
+        self.hand = list(hand)
+        self.field = list(field)
+        self.bench = list(bench)
+        if grid is not self._grid_state:
+            rows, self.board_hash.value = grid
+            self.grid = [list(row) for row in rows]
+            self._grid_state = grid
+        for unit, (row, col, current_hp, undead_cursed) in zip(field, unit_states):
+            unit.row, unit.col, unit.current_hp, unit._undead_cursed = row, col, current_hp, undead_cursed
+        self.rng.setstate(rng_state)
 
     def max_field_slots(self, round_number):
         return min(round_number + 1, 6)
@@ -64,16 +118,20 @@ class Player:
                     self.field.append(new_unit)
                     placed = self.place_on_grid_random(new_unit)
                     if placed:
-                        print(f"{self.name} buys and places {new_unit.card.name} on the field at {placed}. Elixir left: {self.elixir}")
+                        log.emit(GAME, "{player} buys and places {card} on the field at {pos}. Elixir left: {elixir}",
+                                 action="buy", player=self.name, card=new_unit.card.name, pos=placed, elixir=self.elixir)
                     else:
-                        print(f"{self.name} buys {new_unit.card.name} but no grid space found! Placed in field list only.")
+                        log.emit(GAME, "{player} buys {card} but no grid space found! Placed in field list only.", WARNING,
+                                 action="buy", player=self.name, card=new_unit.card.name)
                 elif len(self.bench) < 5:
                     self.bench.append(new_unit)
-                    print(f"{self.name} buys and places {new_unit.card.name} on the bench. Elixir left: {self.elixir}")
+                    log.emit(GAME, "{player} buys and places {card} on the bench. Elixir left: {elixir}",
+                             action="buy", player=self.name, card=new_unit.card.name, bench=True, elixir=self.elixir)
                 else:
                     self.elixir += card.cost
                     self.deck_manager.return_cards([merged_card])
-                    print(f"{self.name} cannot place {new_unit.card.name}, no space. Refunded elixir.")
+                    log.emit(GAME, "{player} cannot place {card}, no space. Refunded elixir.",
+                             action="refund", player=self.name, card=new_unit.card.name)
                     return False
                 return True
         return False
@@ -82,11 +140,14 @@ class Player:
         positions = [(r, c) for r in range(4, 8) for c in range(BOARD_COLS) if self.grid[r][c] is None]
         if not positions:
             return None
-        row, col = random.choice(positions)
+        row, col = self.rng.choice(positions)
         self.grid[row][col] = unit
+        self.board_hash.add((row, col), unit.card)
+        self._grid_state = None
         unit.row = row
         unit.col = col
-        print(f"DEBUG: Placed {unit.card.name} at ({unit.row}, {unit.col}) on grid. Grid cell contains: {self.grid[row][col].card.name}")
+        log.emit(MOVE, "DEBUG: Placed {unit} at {pos} on grid. Grid cell contains: {occupant}", DEBUG,
+                 unit=unit.card.name, owner=self.name, pos=(row, col), occupant=self.grid[row][col].card.name)
         return (row, col)
     
     def remove_unit_from_grid(self, unit):
@@ -94,6 +155,8 @@ class Player:
             for c in range(BOARD_COLS):
                 if self.grid[r][c] == unit:
                     self.grid[r][c] = None
+                    self.board_hash.remove((r, c), unit.card)
+                    self._grid_state = None
                     unit.row = None
                     unit.col = None
 
@@ -107,19 +170,21 @@ class Player:
                     refund = 1
                     upgraded_card = Card(new_card.name, new_card.cost, new_card.star + 1)
                     self.elixir += refund
-                    print(f"⚠️  MERGE: {new_card.name} {new_card.star}✨ + {removed_unit.card.star}✨ → {upgraded_card.star}✨! +{refund}💧")
+                    log.emit(GAME, "⚠️  MERGE: {card} {star}✨ + {other_star}✨ → {new_star}✨! +{refund}💧",
+                             action="merge", player=self.name, card=new_card.name, star=new_card.star,
+                             other_star=removed_unit.card.star, new_star=upgraded_card.star, refund=refund)
                     # recursively try to merge upgraded card again
                     return self.try_merge(upgraded_card) or upgraded_card
         return new_card
 
     def give_starting_unit(self):
         two_elixir_cards = [name for name, cost in CARD_STATS.items() if cost == 2]
-        name = random.choice(two_elixir_cards)
+        name = self.rng.choice(two_elixir_cards)
         card = Card(name, 2, star=1)
         unit = CombatUnit(None, None, card, owner=self)
         self.field.append(unit)
         self.place_on_grid_random(unit)
-        print(f"{self.name} starts with {unit.card.name}")
+        log.emit(GAME, "{player} starts with {card}", action="start", player=self.name, card=unit.card.name)
 
     def give_starting_exe(self):
         starting_units = [
@@ -134,21 +199,25 @@ class Player:
             unit = CombatUnit(None, None, card, owner=self)
             self.field.append(unit)
             placed = self.place_on_grid_random(unit)
-            print(f"{self.name} starts with {unit.card.name} placed at {placed}")
+            log.emit(GAME, "{player} starts with {card} placed at {pos}", action="start", player=self.name, card=unit.card.name, pos=placed)
 
 
     def display_zone(self, round_number):
         hp_display = f"❤️{self.hp}"
-        print(f"{self.name} {hp_display} FIELD ({len(self.field)}/{self.max_field_slots(round_number)}): " +
-              ", ".join([f"{unit.card.name} {unit.card.star}✨ (HP: {unit.current_hp})" for unit in self.field]))
-        print(f"{self.name} BENCH ({len(self.bench)}/5): " +
-              ", ".join([f"{unit.card.name} {unit.card.star}✨ (HP: {unit.max_hp})" for unit in self.bench]))
+        if not log.enabled(INFO):
+            return
+        log.emit(GAME, "{player} {hp_display} FIELD ({count}/{slots}): {units}",
+                 player=self.name, hp_display=hp_display, count=len(self.field), slots=self.max_field_slots(round_number),
+                 units=", ".join([f"{unit.card.name} {unit.card.star}✨ (HP: {unit.current_hp})" for unit in self.field]))
+        log.emit(GAME, "{player} BENCH ({count}/5): {units}",
+                 player=self.name, count=len(self.bench),
+                 units=", ".join([f"{unit.card.name} {unit.card.star}✨ (HP: {unit.max_hp})" for unit in self.bench]))
 
     def take_damage(self, damage):
         self.hp -= damage
-        print(f"💀 {self.name} takes {damage} damage! HP: {self.hp}")
+        log.emit(GAME, "💀 {player} takes {damage} damage! HP: {hp}", action="damage", player=self.name, damage=damage, hp=self.hp)
         if self.hp <= 0:
-            print(f"💀 {self.name} has been eliminated!")
+            log.emit(GAME, "💀 {player} has been eliminated!", action="eliminated", player=self.name)
 
     def act(self, round_number):
         return self.bot_logic(self, round_number)
\ No newline at end of file
@@ -5,6 +5,7 @@ class Projectile:
         self.speed = speed  # pixels per second
         self.progress = 0.0  # 0.0 to 1.0
         self.colour = colour  # Store colour here
+        self.start_time = 0.0  # Clock time it was fired at, for advance_to()
 
     def update(self, dt):
         dist = ((self.end_pos[0] - self.start_pos[0])**2 + (self.end_pos[1] - self.start_pos[1])**2)**0.5
@@ -15,6 +16,14 @@ class Projectile:
         if self.progress > 1.0:
             self.progress = 1.0
 
+    def advance_to(self, now):
+        """Sets progress from a clock's time instead of accumulating frame dt."""
+        dist = ((self.end_pos[0] - self.start_pos[0])**2 + (self.end_pos[1] - self.start_pos[1])**2)**0.5
+        if dist == 0:
+            self.progress = 1.0
+            return
+        self.progress = min(1.0, max(0.0, self.speed * (now - self.start_time) / dist))
+
     def get_position(self):
         x = self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * self.progress
         y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * self.progress
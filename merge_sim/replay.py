@@ -0,0 +1,348 @@
+# --- Standard Libraries ---
+import struct
+
+# --- NumPy ---
+import numpy as np
+
+# --- Globals / Shared State ---
+from .constants import BOARD_ROWS, BOARD_COLS
+
+# --- Random Streams ---
+from .rng import RandomStream
+
+MAGIC = b"MTRP"
+VERSION = 1
+NO_VALUE = 0xFF         # Byte fields: no unit, no winner
+NO_ROUND = 0xFFFF
+
+# --- Fixed-width layouts (little-endian, no padding) ---
+HEADER = struct.Struct("<4sBBHHII")     # magic, version, winner side, round, units at start, records, duration (ms)
+SEED = struct.Struct("<16sB")           # seed entropy (128-bit), spawn key length; then one uint32 per key
+UNIT = struct.Struct("<BBBBBff")        # side, card, star, row, col, hp, max hp
+RECORD = struct.Struct("<IBBBBBBf")     # time (ms), op, unit, a, b, c, d, value
+
+# --- Record ops ---
+MOVE = 1        # a, b: new row, col
+HP = 2          # value: new hp (damage, heals and shields alike)
+DEATH = 3       # unit is eliminated
+SPAWN = 4       # a, b: row, col; c: card; d: side << 4 | star; value: hp
+STATUS = 5      # a: STUNNED | INVISIBLE | JUMPING bits now set
+ATTACK = 6      # a, b: attacker row, col; c, d: target row, col
+
+# --- Status bits ---
+STUNNED = 1
+INVISIBLE = 2
+JUMPING = 4
+
+
+def _status_bits(unit):
+    bits = STUNNED if "stunned" in unit.status_effects else 0
+    if unit.invisible:
+        bits |= INVISIBLE
+    if unit.is_jumping:
+        bits |= JUMPING
+    return bits
+
+
+def _pack_string(text):
+    data = text.encode("utf-8")
+    return struct.pack("<B", len(data)) + data
+
+
+def _unpack_string(data, offset):
+    length = data[offset]
+    return data[offset + 1:offset + 1 + length].decode("utf-8"), offset + 1 + length
+
+
+class Replay:
+    """
+    A recorded battle: the board after setup, the battle's seed, and what changed when.
+
+    Changes are fixed-width RECORDs (14 bytes each) of moves, hp changes,
+    deaths, spawns, status changes and attacks, timed in simulated
+    milliseconds. A viewer replays them without simulating anything, and
+    rng() rebuilds the battle's own stream to re-run it exactly. A full
+    battle is usually a few KB.
+
+    Sides are 0 for the bottom player and 1 for the top one; units are
+    numbered in the order they joined the battle, spawns last.
+    """
+
+    def __init__(self, players, round_number, cards, units, records, winner=None, duration=0,
+                 entropy=0, spawn_key=()):
+        self.players = players          # Player names, bottom side first
+        self.round_number = round_number
+        self.cards = cards              # Card names, indexed by unit and spawn records
+        self.units = units              # (side, card, star, row, col, hp, max hp) per unit at the start
+        self.records = records          # (time ms, op, unit, a, b, c, d, value)
+        self.winner = winner            # Winning side, or None for a draw
+        self.duration = duration        # Simulated milliseconds
+        self.entropy = entropy
+        self.spawn_key = spawn_key
+
+    def rng(self):
+        """The battle's RandomStream, as it was before the battle started."""
+        return RandomStream(np.random.SeedSequence(self.entropy, spawn_key=self.spawn_key))
+
+    def to_bytes(self):
+        winner = NO_VALUE if self.winner is None else self.winner
+        round_number = NO_ROUND if self.round_number is None else self.round_number
+        parts = [
+            HEADER.pack(MAGIC, VERSION, winner, round_number, len(self.units), len(self.records), self.duration),
+            SEED.pack(self.entropy.to_bytes(16, "little"), len(self.spawn_key)),
+            struct.pack(f"<{len(self.spawn_key)}I", *self.spawn_key),
+            _pack_string(self.players[0]),
+            _pack_string(self.players[1]),
+            struct.pack("<B", len(self.cards)),
+        ]
+        parts.extend(_pack_string(name) for name in self.cards)
+        parts.extend(UNIT.pack(*unit) for unit in self.units)
+        parts.extend(RECORD.pack(*record) for record in self.records)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, winner, round_number, unit_count, record_count, duration = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} replay")
+        offset = HEADER.size
+        entropy, key_length = SEED.unpack_from(data, offset)
+        offset += SEED.size
+        spawn_key = struct.unpack_from(f"<{key_length}I", data, offset)
+        offset += 4 * key_length
+        players = []
+        for _ in range(2):
+            name, offset = _unpack_string(data, offset)
+            players.append(name)
+        cards = []
+        card_count = data[offset]
+        offset += 1
+        for _ in range(card_count):
+            name, offset = _unpack_string(data, offset)
+            cards.append(name)
+        units = [UNIT.unpack_from(data, offset + i * UNIT.size) for i in range(unit_count)]
+        offset += unit_count * UNIT.size
+        records = list(RECORD.iter_unpack(data[offset:offset + record_count * RECORD.size]))
+        return cls(players, None if round_number == NO_ROUND else round_number, cards, units, records,
+                   None if winner == NO_VALUE else winner, duration, int.from_bytes(entropy, "little"), spawn_key)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Records a battle into a Replay as it runs.
+
+    Attach it after Battle.setup() and before the battle is stepped. It
+    hooks the battle's on_step and on_attack callbacks (keeping any already
+    set) and after every step writes a record for each unit whose cell,
+    hp (to 0.1), life or status changed, so recording does not touch the
+    combat rules and works with every clock.
+
+    Args:
+        battle (Battle): A battle whose setup() has already run.
+    """
+
+    def __init__(self, battle):
+        self.battle = battle
+        self.players = (battle.p1, battle.p2)
+        self.card_index = {}
+        self.records = []
+        self.units = []
+        self.states = []    # Last recorded (row, col, hp, alive, status) per unit
+        self.time = 0
+
+        for unit in battle.units:
+            self.units.append((self._side(unit), self._card(unit.card.name), unit.card.star,
+                               unit.row, unit.col, unit.current_hp, unit.max_hp))
+            self.states.append(self._state(unit))
+
+        self._on_attack = battle.on_attack
+        self._on_step = battle.on_step
+        battle.on_attack = self._attack
+        battle.on_step = self._step
+
+    def _side(self, unit):
+        return 0 if unit.owner is self.players[0] else 1
+
+    def _card(self, name):
+        index = self.card_index.get(name)
+        if index is None:
+            index = self.card_index[name] = len(self.card_index)
+        return index
+
+    @staticmethod
+    def _state(unit):
+        return unit.row, unit.col, round(unit.current_hp, 1), unit.alive, _status_bits(unit)
+
+    def _attack(self, unit, attacker_pos, target_pos):
+        if attacker_pos is not None and target_pos is not None:
+            now = int(round(self.battle.context.clock.now * 1000))
+            self.records.append((now, ATTACK, self.battle.units.index(unit), *attacker_pos, *target_pos, 0.0))
+        if self._on_attack:
+            self._on_attack(unit, attacker_pos, target_pos)
+
+    def _step(self, battle):
+        now = self.time = int(round(battle.context.clock.now * 1000))
+        records = self.records
+        states = self.states
+        for index, unit in enumerate(battle.units):
+            state = self._state(unit)
+            if index == len(states):
+                records.append((now, SPAWN, index, unit.row, unit.col, self._card(unit.card.name),
+                                self._side(unit) << 4 | unit.card.star, unit.current_hp))
+                states.append(state)
+                continue
+            old = states[index]
+            if state == old:
+                continue
+            row, col, hp, alive, status = state
+            if hp != old[2]:
+                records.append((now, HP, index, 0, 0, 0, 0, unit.current_hp))
+            if not alive:
+                if old[3]:
+                    records.append((now, DEATH, index, 0, 0, 0, 0, 0.0))
+            else:
+                if (row, col) != old[:2] and row is not None:
+                    records.append((now, MOVE, index, row, col, 0, 0, 0.0))
+                if status != old[4]:
+                    records.append((now, STATUS, index, status, 0, 0, 0, 0.0))
+            states[index] = state
+        if self._on_step:
+            self._on_step(battle)
+
+    def replay(self):
+        """The recording so far; call it once the battle has finished for the result."""
+        battle = self.battle
+        winner = None if battle.winner is None else (0 if battle.winner is self.players[0] else 1)
+        seed = battle.rng.seed_sequence
+        cards = sorted(self.card_index, key=self.card_index.__getitem__)
+        return Replay([player.name for player in self.players], battle.round_number, cards, list(self.units),
+                      list(self.records), winner, self.time, seed.entropy, tuple(seed.spawn_key))
+
+
+class _ReplayCard:
+    __slots__ = ("name", "star", "health")
+
+    def __init__(self, name, star, health):
+        self.name = name
+        self.star = star
+        self.health = health
+
+
+class _ReplayOwner:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ReplayUnit:
+    """A unit during playback, with the attributes draw_grid() reads from a CombatUnit."""
+
+    __slots__ = ("card", "owner", "row", "col", "current_hp", "max_hp", "alive", "invisible", "status_effects")
+
+    def __init__(self, card, owner, row, col, hp, max_hp):
+        self.card = card
+        self.owner = owner
+        self.row = row
+        self.col = col
+        self.current_hp = hp
+        self.max_hp = max_hp
+        self.alive = True
+        self.invisible = False
+        self.status_effects = {}
+
+    def set_status(self, bits):
+        self.invisible = bool(bits & INVISIBLE)
+        self.status_effects = {"stunned": True} if bits & STUNNED else {}
+
+
+class ReplayCursor:
+    """
+    The board of a Replay at any moment, found by applying its records instead of simulating.
+
+    seek() moves forward record by record and starts over from the initial
+    board to go back, so playback at any speed, in either direction, costs
+    only the records it passes.
+
+    Args:
+        replay (Replay): The recording to play.
+    """
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.owners = [_ReplayOwner(name) for name in replay.players]
+        self.reset()
+
+    def reset(self):
+        replay = self.replay
+        self.units = [
+            ReplayUnit(_ReplayCard(replay.cards[card], star, max_hp), self.owners[side], row, col, hp, max_hp)
+            for side, card, star, row, col, hp, max_hp in replay.units
+        ]
+        self.position = 0   # Next record to apply
+        self.time = 0
+
+    @property
+    def finished(self):
+        return self.time >= self.replay.duration
+
+    def seek(self, time):
+        """
+        Moves to `time` (simulated ms).
+
+        Returns:
+            list: The records applied on the way, oldest first; empty when seeking backwards.
+        """
+        if time < self.time:
+            self.reset()
+            self._apply_until(time)
+            return []
+        return self._apply_until(time)
+
+    def _apply_until(self, time):
+        records = self.replay.records
+        start = position = self.position
+        while position < len(records) and records[position][0] <= time:
+            self._apply(records[position])
+            position += 1
+        self.position = position
+        self.time = time
+        return records[start:position]
+
+    def _apply(self, record):
+        _, op, index, a, b, c, d, value = record
+        if op == SPAWN:
+            side, star = d >> 4, d & 0x0F
+            self.units.append(ReplayUnit(_ReplayCard(self.replay.cards[c], star, value), self.owners[side],
+                                         a, b, value, value))
+            return
+        if op == ATTACK:
+            return
+        unit = self.units[index]
+        if op == MOVE:
+            unit.row, unit.col = a, b
+        elif op == HP:
+            unit.current_hp = value
+        elif op == DEATH:
+            unit.alive = False
+            unit.current_hp = 0
+        elif op == STATUS:
+            unit.set_status(a)
+
+    def grid(self):
+        """The combined 8x5 grid of living units."""
+        grid = [[None] * BOARD_COLS for _ in range(BOARD_ROWS)]
+        for unit in self.units:
+            if unit.alive and unit.row is not None:
+                grid[unit.row][unit.col] = unit
+        return grid
+
@@ -0,0 +1,94 @@
+# --- Standard Libraries ---
+import random
+
+# --- NumPy ---
+import numpy as np
+
+SEED_WORDS = 8          # 32-bit words of the seed sequence used to seed the twister
+
+# --- Stream keys, so every consumer derives a different child of the game seed ---
+DECK_STREAM = 0
+PLAYER_STREAM = 1
+BATTLE_STREAM = 2
+KERNEL_STREAM = 3       # Crit rolls of a batched combat kernel run
+
+
+class RandomStream(random.Random):
+    """
+    A reproducible random stream that can hand out independent child streams.
+
+    Draws are random.Random's own C-level Mersenne Twister, so a single
+    roll (a crit, a goblin reward) costs no more than with the random
+    module. NumPy's SeedSequence only derives seeds: the twister is seeded
+    from 256 bits of this stream's sequence, and derive(*key) returns the
+    child stream for an integer key, which depends only on this stream's
+    seed and the key, not on how much either has been used. A game can
+    therefore give each battle its own stream, and a battle gives the same
+    results whether it runs first, last or in parallel.
+
+    getstate() is cached: the state tuple is copied once and handed out
+    again until the next draw, and setstate() skips the copy when given
+    that same tuple. Player and deck streams only draw on placement, shop
+    shuffles and bot decisions, so most game snapshots (snapshot.py) copy
+    no twister state at all. To spot the next draw without slowing every
+    draw, caching shadows random() and getrandbits() with instance
+    attributes that drop the cache and remove themselves, so only the
+    first draw after a snapshot goes through Python. Don't keep a bound
+    `stream.random` across a getstate() call; look it up again instead.
+
+    Args:
+        seed (int | np.random.SeedSequence, optional): Root seed; fresh OS entropy if None.
+    """
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        self._drawn()
+        self.seed_sequence = a if isinstance(a, np.random.SeedSequence) else np.random.SeedSequence(a)
+        super().seed(int.from_bytes(self.seed_sequence.generate_state(SEED_WORDS).tobytes(), "little"))
+
+    def getstate(self):
+        state = self._state
+        if state is None:
+            state = self._state = super().getstate()
+            self._watch_draws()
+        return state
+
+    def setstate(self, state):
+        if state is not self._state:
+            super().setstate(state)
+            self._state = state
+            self._watch_draws()
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        # gauss() may return its cached second value without drawing
+        self._drawn()
+        return super().gauss(mu, sigma)
+
+    def _watch_draws(self):
+        self.random = self._random_after_state
+        self.getrandbits = self._getrandbits_after_state
+
+    def _drawn(self):
+        """Forgets the cached state and puts the C-level draw methods back."""
+        self._state = None
+        self.__dict__.pop("random", None)
+        self.__dict__.pop("getrandbits", None)
+
+    def _random_after_state(self):
+        self._drawn()
+        return random.Random.random(self)
+
+    def _getrandbits_after_state(self, k):
+        self._drawn()
+        return random.Random.getrandbits(self, k)
+
+    def derive(self, *key):
+        """Child stream for a tuple of non-negative ints."""
+        seq = self.seed_sequence
+        return RandomStream(np.random.SeedSequence(seq.entropy, spawn_key=seq.spawn_key + key))
+
+    def __reduce__(self):
+        # Keep the seed sequence so a pickled stream derives the same children
+        return (RandomStream, (self.seed_sequence,), self.getstate())
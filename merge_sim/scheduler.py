@@ -0,0 +1,310 @@
+# --- Standard Libraries ---
+import heapq
+import math
+import sys
+
+# --- Simulation Clock ---
+from .clock import EventDrivenClock
+
+# --- Event kinds ---
+ATTACK = "attack"               # Unit's attack cooldown expires
+MOVE = "move"                   # Unit's movement cooldown expires
+STUN_END = "stun_end"
+INVISIBLE_END = "invisible_end"
+BUFF_END = "buff_end"           # Clan buff, Ace hit speed bonus or Juggernaut shield expires
+HEAL_END = "heal_end"           # Clan heal-over-time finishes
+BOMB = "bomb"                   # Giant Skeleton bomb detonates
+FOLLOW_UP = "follow_up"         # Something changed last step, let every unit react next tick
+
+STATUS_EVENT_KINDS = {
+    "stunned": STUN_END,
+    "invisible": INVISIBLE_END,
+    "clan_buff": BUFF_END,
+    "ace_hit_speed_bonus": BUFF_END,
+    "juggernaut_shield": BUFF_END,
+    "clan_heal_duration": HEAL_END,
+}
+
+
+class EventScheduler:
+    """
+    Priority queue of timed combat events, keyed by simulation tick.
+
+    Events are stored as (tick, seq, kind, unit). Rescheduling a unit bumps its
+    generation, and popped events from an older generation are discarded, so
+    the queue never needs to be searched or rebuilt.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+        self.generations = {}   # unit -> current generation
+        self.events_processed = 0
+
+    def push(self, tick, kind, unit=None):
+        self.seq += 1
+        generation = self.generations.get(unit, 0)
+        heapq.heappush(self.heap, (tick, self.seq, kind, unit, generation))
+
+    def invalidate(self, unit):
+        """Drop every queued event for unit (lazily, on pop)."""
+        self.generations[unit] = self.generations.get(unit, 0) + 1
+
+    def pop_next_tick(self, after_tick):
+        """
+        Remove and return the earliest live event tick after after_tick,
+        together with every other live event due on that tick.
+
+        Returns:
+            (tick, [kinds]) or (None, []) if the queue is empty.
+        """
+        heap = self.heap
+        while heap:
+            tick, _, kind, unit, generation = heap[0]
+            if tick <= after_tick or generation != self.generations.get(unit, 0):
+                heapq.heappop(heap)
+                continue
+
+            kinds = []
+            while heap and heap[0][0] == tick:
+                _, _, kind, unit, generation = heapq.heappop(heap)
+                if generation == self.generations.get(unit, 0):
+                    kinds.append(kind)
+            self.events_processed += len(kinds)
+            if kinds:
+                return tick, kinds
+        return None, []
+
+
+def _first_tick_at_or_after(after_tick, dt, threshold, ready):
+    """
+    Smallest tick > after_tick whose time satisfies ready(), starting from the
+    tick nearest to threshold. ready() must be the same comparison the
+    frame-stepped engine makes so both engines fire on the same tick.
+    """
+    tick = max(after_tick + 1, int(math.ceil(threshold / dt)))
+    while tick - 1 > after_tick and ready((tick - 1) * dt):
+        tick -= 1
+    while not ready(tick * dt):
+        tick += 1
+    return tick
+
+
+def _unit_signature(unit):
+    """Everything about a unit that can change what it does or when it next acts."""
+    target = unit.current_target
+    # Expiry times stay put as effects count down, but move when an effect is refreshed
+    expiries = tuple(
+        (effect, round(unit.last_update_time + unit.status_effects[effect], 6))
+        for effect in STATUS_EVENT_KINDS
+        if effect in unit.status_effects
+    )
+    return (
+        unit.alive,
+        unit.row,
+        unit.col,
+        target,
+        target.get_position() if target is not None else None,
+        unit.last_attack_time,
+        unit.move_cooldown,
+        tuple(sorted(unit.status_effects)),
+        expiries,
+        unit.invisible,
+        unit.dash_pending,
+        unit.attack_count,
+        getattr(unit, "is_jumping", False),
+    )
+
+
+def _schedule_unit(scheduler, unit, tick, dt):
+    """Queue the next timed events for one unit after the given tick."""
+    scheduler.invalidate(unit)
+    if not unit.alive:
+        return
+
+    # Status expiries: the frame engine removes an effect on the first step
+    # where its remaining time drops to zero. Summing many small steps can
+    # round differently from one large one, so also check the tick after.
+    for effect, kind in STATUS_EVENT_KINDS.items():
+        remaining = unit.status_effects.get(effect)
+        if remaining is None:
+            continue
+        expiry = unit.last_update_time + remaining
+        expiry_tick = max(tick + 1, int(math.ceil(expiry / dt)))
+        scheduler.push(expiry_tick, kind, unit)
+        scheduler.push(expiry_tick + 1, kind, unit)
+
+    if not unit.can_act():
+        return
+
+    target = unit.current_target
+    if target is None or not target.alive:
+        return
+
+    if unit.is_in_range_of(target):
+        if unit.last_attack_time is not None:
+            interval = unit.get_attack_speed()
+            last = unit.last_attack_time
+            attack_tick = _first_tick_at_or_after(tick, dt, last + interval, lambda t: t - last >= interval)
+            scheduler.push(attack_tick, ATTACK, unit)
+    else:
+        move_interval = 1.0 / unit.get_move_speed()
+        last = unit.move_cooldown
+        move_tick = _first_tick_at_or_after(tick, dt, last + move_interval, lambda t: t - last >= move_interval)
+        scheduler.push(move_tick, MOVE, unit)
+
+
+def run_event_driven(battle, bombs, dt, max_time):
+    """
+    Run a set-up Battle by jumping straight to the next tick where anything can happen.
+
+    Ticks are the same dt grid the fixed-step engine uses, and a full Battle.step
+    is run on each event tick, so the rules (and their order) are unchanged.
+    Ticks where no cooldown, status effect or bomb can expire and nothing
+    changed on the previous tick are skipped, except while a Clan heal over
+    time is running, since skipping would round its HP differently. Before each event tick one quiet
+    catch-up step is run on the tick just before it, so effects and bombs
+    created during the event tick see a single-tick dt exactly as they would
+    in the frame-stepped engine.
+
+    The battle's clock is replaced by an EventDrivenClock that jumps from
+    tick to tick. Mega Knight jumps are timed on it but resolved inside its
+    attack, so they progress on its attack events rather than on events of
+    their own.
+
+    Args:
+        battle (Battle): A battle whose setup() has already run.
+        bombs (list): The active bomb list the battle ticks.
+        dt (float): Simulation tick length in seconds.
+        max_time (float): Simulated seconds before giving up (draw).
+
+    Returns:
+        EventScheduler: The scheduler, with events_processed and steps counters.
+    """
+    scheduler = EventScheduler()
+    max_tick = int(math.ceil(max_time / dt))
+
+    clock = battle.context.clock = EventDrivenClock(dt)
+    tick = 0
+    battle.step()
+    steps = 1
+    signatures = {}
+    scheduled_bombs = set()
+    bomb_seq = 0
+
+    while not battle.finished:
+        # --- RESCHEDULE UNITS WHOSE STATE CHANGED ---
+        changed = False
+        for unit in battle.units:
+            signature = _unit_signature(unit)
+            if signatures.get(unit) != signature:
+                signatures[unit] = signature
+                _schedule_unit(scheduler, unit, tick, dt)
+                changed = True
+
+        # Bombs are tagged with a sequence number when first seen: an id() can be reused once a bomb is freed
+        for bomb in bombs:
+            if "event_seq" not in bomb:
+                bomb_seq += 1
+                bomb["event_seq"] = bomb_seq
+                bomb_tick = tick + max(1, int(math.ceil(bomb["timer"] / dt)))
+                scheduler.push(bomb_tick, BOMB)
+                scheduler.push(bomb_tick + 1, BOMB)
+        live_bombs = {bomb["event_seq"] for bomb in bombs}
+        if live_bombs != scheduled_bombs:
+            changed = True
+        scheduled_bombs = live_bombs
+
+        # Heal over time is summed step by step, so it only adds up to the same HP if no tick is skipped
+        if changed or any(unit.alive and "clan_heal" in unit.status_effects for unit in battle.units):
+            scheduler.push(tick + 1, FOLLOW_UP)
+
+        next_tick, _ = scheduler.pop_next_tick(tick)
+        if next_tick is None or next_tick >= max_tick:
+            break
+
+        # Quiet catch-up step so the event tick itself advances by exactly one dt
+        if next_tick - 1 > tick:
+            clock.jump_to(next_tick - 1)
+            battle.step()
+            steps += 1
+
+        clock.jump_to(next_tick)
+        battle.step()
+        steps += 1
+        tick = next_tick
+
+    scheduler.steps = steps
+    return scheduler
+
+
+# === SELF-CHECK ===
+
+CHECK_ROUND = 6         # Round passed to check battles (goblin rewards, bench size)
+
+
+def _random_matchup(seed):
+    """Two players with 1-6 random cards each, placed as the shop would, and the battle's stream."""
+    from .cards import Card, CARD_STATS
+    from .combat_unit import CombatUnit
+    from .deck import DeckManager
+    from .player import Player
+    from .rng import RandomStream, DECK_STREAM, PLAYER_STREAM, BATTLE_STREAM
+
+    rng = RandomStream(seed)
+    names = sorted(CARD_STATS)
+    deck = DeckManager(rng.derive(DECK_STREAM))
+    players = [Player("Home", deck, None, rng.derive(PLAYER_STREAM, 0)),
+               Player("Away", deck, None, rng.derive(PLAYER_STREAM, 1))]
+    for player in players:
+        for _ in range(rng.randint(1, 6)):
+            name = rng.choice(names)
+            unit = CombatUnit(None, None, Card(name, CARD_STATS[name], rng.randint(1, 3)), owner=player)
+            player.field.append(unit)
+            player.place_on_grid_random(unit)
+    players[0].opponent, players[1].opponent = players[1], players[0]
+    return players, rng.derive(BATTLE_STREAM)
+
+
+def _battle_outcome(seed, event_driven):
+    """Winner, final unit states and INFO-level log lines of one seeded battle."""
+    from .battle import Battle, DEFAULT_DT, DEFAULT_MAX_TIME
+    from .event_log import log, INFO, RingBufferConsumer
+
+    players, battle_rng = _random_matchup(seed)
+    capture = RingBufferConsumer(capacity=None, level=INFO)
+    with log.redirected(capture):
+        battle = Battle(players, CHECK_ROUND, battle_rng)
+        if battle.setup():
+            battle.run(DEFAULT_DT, DEFAULT_MAX_TIME, event_driven)
+        units = [(unit.card.name, unit.alive, round(unit.current_hp, 6), unit.get_position()) for unit in battle.units]
+        battle.finish()
+    winner = battle.winner.name if battle.winner is not None else None
+    return winner, units, [event.text() for event in capture.events]
+
+
+def check_against_fixed_step(seeds=range(12)):
+    """
+    Plays each seeded random battle on the fixed-step and the event-driven engine
+    and checks the winner, every unit's final HP and cell, and the INFO log match.
+
+    Returns:
+        int: Battles checked; raises AssertionError on the first mismatch.
+    """
+    count = 0
+    for seed in seeds:
+        fixed = _battle_outcome(seed, False)
+        events = _battle_outcome(seed, True)
+        assert fixed[:2] == events[:2], f"seed {seed}: fixed-step {fixed[:2]} != event-driven {events[:2]}"
+        for line, (a, b) in enumerate(zip(fixed[2], events[2])):
+            assert a == b, f"seed {seed}, log line {line}: {a!r} != {b!r}"
+        assert len(fixed[2]) == len(events[2]), f"seed {seed}: {len(fixed[2])} != {len(events[2])} log lines"
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    # python -m merge_sim.scheduler --check [--seeds N]
+    seeds = int(sys.argv[sys.argv.index("--seeds") + 1]) if "--seeds" in sys.argv else 12
+    if "--check" in sys.argv:
+        print(f"Event-driven battles match the fixed-step engine on {check_against_fixed_step(range(seeds))} seeds")
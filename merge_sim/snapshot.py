@@ -0,0 +1,47 @@
+class GameSnapshot:
+    """
+    Snapshot and restore of a whole game between shop decisions, for search-based bots.
+
+    A snapshot is a nested tuple of references: the shared deck's pool,
+    every player's Player.snapshot() and, optionally, the game's root stream.
+    Cards are immutable and shared and units are kept by reference, so
+    taking a snapshot copies a few short tuples and nothing is deep-copied.
+    A random stream's twister state (625 ints) is only copied again if the
+    stream drew since it was last captured (see RandomStream.getstate), and
+    restoring skips it under the same condition. Bot functions and the
+    cyclic opponent links stay where they are: restore() writes the state
+    back into the same Player objects.
+
+    A snapshot stays valid for as many restores as needed, in any order, as
+    long as the players are those it was taken from.
+
+    Args:
+        players (list): Every player in the game, sharing one DeckManager.
+        rng (RandomStream, optional): The game's root stream (pairings, battle streams), if it should be captured too.
+    """
+
+    __slots__ = ("players", "rng", "deck_manager")
+
+    def __init__(self, players, rng=None):
+        self.players = list(players)
+        self.rng = rng
+        self.deck_manager = self.players[0].deck_manager
+
+    def take(self):
+        """
+        Captures the current game state.
+
+        Returns:
+            tuple: Opaque state for restore().
+        """
+        rng_state = self.rng.getstate() if self.rng is not None else None
+        return self.deck_manager.snapshot(), tuple([player.snapshot() for player in self.players]), rng_state
+
+    def restore(self, state):
+        """Puts every player, the deck and the root stream back to a state from take()."""
+        deck_state, player_states, rng_state = state
+        self.deck_manager.restore(deck_state)
+        for player, player_state in zip(self.players, player_states):
+            player.restore(player_state)
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
@@ -1,5 +1,9 @@
 import pygame
 import math
+import sys
+
+from .projectile import Projectile
+from .replay import Replay, ReplayCursor, ATTACK
 
 BOARD_ROWS = 8
 BOARD_COLS = 5
@@ -51,11 +55,78 @@ def draw_arrow(surface, start, end, colour=(255,255,255), width=3):
         y = ey - length * math.sin(angle + side * math.pi / 6)
         pygame.draw.line(surface, colour, (ex, ey), (x, y), width)
 
+class RenderCache:
+    """
+    What draw_grid() would otherwise rebuild every frame: fonts, the empty board and text glyphs.
+
+    The board (hex outlines and coordinate labels) is drawn once onto a
+    transparent surface and blitted, and rendered text is kept by (font,
+    text, colour) up to MAX_GLYPHS, after which the glyph cache starts
+    over. Fonts do not survive pygame.quit(), which the live viewer calls
+    after every battle, so the cache empties itself then and refills on the
+    next frame.
+    """
+
+    MAX_GLYPHS = 4096
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.fonts = None
+        self.board = None
+        self.glyphs = {}
+        self.ghosts = {}
+
+    def font(self, index):
+        """0: unit names, 1: HP, 2: cell coordinates, 3: status lines."""
+        if self.fonts is None:
+            self.fonts = (
+                pygame.font.SysFont(None, 20, bold=True),
+                pygame.font.SysFont(None, 18, bold=True),
+                pygame.font.SysFont(None, 14),
+                pygame.font.SysFont(None, 28),
+            )
+            pygame.register_quit(self.clear)  # Registrations only last until the next quit
+        return self.fonts[index]
+
+    def text(self, font_index, text, colour):
+        key = (font_index, text, colour)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            if len(self.glyphs) >= self.MAX_GLYPHS:
+                self.glyphs.clear()
+            glyph = self.glyphs[key] = self.font(font_index).render(text, True, colour)
+        return glyph
+
+    def ghost(self, colour):
+        """Semi-transparent disc of an invisible unit."""
+        ghost = self.ghosts.get(colour)
+        if ghost is None:
+            ghost = self.ghosts[colour] = pygame.Surface((HEX_SIZE, HEX_SIZE), pygame.SRCALPHA)
+            pygame.draw.circle(ghost, (*colour[:3], 120), (HEX_SIZE // 2, HEX_SIZE // 2), HEX_SIZE // 2)
+        return ghost
+
+    def board_surface(self):
+        if self.board is None:
+            # Just big enough for the hexes, so the per-frame blit stays small
+            right = max(hex_to_pixel(r, BOARD_COLS - 1)[0] for r in range(2)) + HEX_SIZE + 2
+            bottom = hex_to_pixel(BOARD_ROWS - 1, 0)[1] + HEX_SIZE + 2
+            board = pygame.Surface((right, bottom), pygame.SRCALPHA)
+            for r in range(BOARD_ROWS):
+                for c in range(BOARD_COLS):
+                    x, y = hex_to_pixel(r, c)
+                    draw_hex(board, x, y, HEX_SIZE, (80, 80, 80))
+                    coord_text = self.text(2, f"{r},{c}", (150, 150, 150))
+                    board.blit(coord_text, coord_text.get_rect(center=(x, y - HEX_SIZE // 2 + 10)))
+            self.board = board.convert_alpha() if pygame.display.get_surface() else board
+        return self.board
+
+
+render_cache = RenderCache()
+
 def draw_grid(surface, grid, units=None):
-    # Create fonts for drawing unit names and HP text
-    font = pygame.font.SysFont(None, 20, bold=True)
-    hp_font = pygame.font.SysFont(None, 18, bold=True)
-    coord_font = pygame.font.SysFont(None, 14)  # Smaller font for coordinates
+    cache = render_cache
 
     # Build a lookup dictionary for units' current HP keyed by their grid position
     unit_hp_lookup = {}
@@ -64,16 +135,11 @@ def draw_grid(surface, grid, units=None):
             if u.alive:
                 unit_hp_lookup[(u.row, u.col)] = u.current_hp
 
+    # Empty board: hexes and coordinates, drawn once
+    surface.blit(cache.board_surface(), (0, 0))
+
     for r in range(BOARD_ROWS):
         for c in range(BOARD_COLS):
-            x, y = hex_to_pixel(r, c)
-
-            draw_hex(surface, x, y, HEX_SIZE, (80, 80, 80))
-
-            coord_text = coord_font.render(f"{r},{c}", True, (150, 150, 150))
-            coord_rect = coord_text.get_rect(center=(x, y - HEX_SIZE // 2 + 10))
-            surface.blit(coord_text, coord_rect)
-
             cell = grid[r][c]
             if cell:
                 unit = cell
@@ -81,14 +147,11 @@ def draw_grid(surface, grid, units=None):
                 owner = unit.owner
                 colour = PLAYER_COLOURS.get(owner.name, (200, 200, 200))
 
-                cx, cy = x, y
+                cx, cy = hex_to_pixel(r, c)
 
                 # --- INVIS EFFECT ---
                 if getattr(unit, "invisible", False):
-                    ghost_colour = (colour[0], colour[1], colour[2], 120)  # semi-transparent
-                    ghost_surface = pygame.Surface((HEX_SIZE, HEX_SIZE), pygame.SRCALPHA)
-                    pygame.draw.circle(ghost_surface, ghost_colour, (HEX_SIZE//2, HEX_SIZE//2), HEX_SIZE//2)
-                    surface.blit(ghost_surface, (cx - HEX_SIZE//2, cy - HEX_SIZE//2))
+                    surface.blit(cache.ghost(colour), (cx - HEX_SIZE//2, cy - HEX_SIZE//2))
 
                     # Glow outline
                     pygame.draw.circle(surface, (180, 220, 255), (int(cx), int(cy)), HEX_SIZE // 2, 2)
@@ -108,13 +171,164 @@ def draw_grid(surface, grid, units=None):
                 name = card.name
                 name_lines = [name[i:i+8] for i in range(0, len(name), 8)]
                 for i, line in enumerate(name_lines):
-                    text = font.render(line, True, (0, 0, 0))
+                    text = cache.text(0, line, (0, 0, 0))
                     rect = text.get_rect(center=(cx, cy + i*18 - (len(name_lines)-1)*9))
                     surface.blit(text, rect)
 
                 # Draw HP
                 hp = unit_hp_lookup.get((r, c), getattr(card, "health", 1))
                 hp = round(hp, 1)  # round to 1 decimal place
-                hp_text = hp_font.render(str(hp), True, (255, 255, 255))
+                hp_text = cache.text(1, str(hp), (255, 255, 255))
                 hp_rect = hp_text.get_rect(center=(cx, cy - HEX_SIZE // 2 - 10))
                 surface.blit(hp_text, hp_rect)
+
+def draw_projectiles(surface, projectiles):
+    for projectile in projectiles:
+        x, y = projectile.get_position()
+        pygame.draw.circle(surface, projectile.colour, (int(x), int(y)), 8)
+
+def draw_status(surface, lines):
+    """Text lines along the bottom of the surface."""
+    font = render_cache.font(3)
+    y = surface.get_height() - 10 - 30 * len(lines)
+    for line in lines:
+        surface.blit(font.render(line, True, (230, 230, 230)), (20, y))
+        y += 30
+
+
+class ReplayScene:
+    """
+    A replay drawn at any simulated time: the board from a ReplayCursor plus attack projectiles.
+
+    Projectiles are placed by simulation time, so the window and the file
+    exporter, which only differ in where time comes from, draw the same
+    frame for the same moment.
+
+    Args:
+        replay (Replay): The recording to draw.
+    """
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.cursor = ReplayCursor(replay)
+        self.projectiles = []
+        self.time_ms = 0.0
+
+    def seek(self, time_ms):
+        """Moves to `time_ms` simulated milliseconds (clamped to the battle), forwards or back."""
+        time_ms = max(0.0, min(time_ms, self.replay.duration))
+        if time_ms < self.time_ms:
+            self.projectiles.clear()
+        cursor = self.cursor
+        for record in cursor.seek(int(time_ms)):
+            if record[1] == ATTACK:
+                fired_at, _, index, row, col, target_row, target_col, _ = record
+                colour = PLAYER_COLOURS.get(cursor.units[index].owner.name, (255, 255, 255))
+                projectile = Projectile(hex_to_pixel(row, col), hex_to_pixel(target_row, target_col), colour)
+                projectile.start_time = fired_at / 1000
+                self.projectiles.append(projectile)
+        self.time_ms = time_ms
+        if cursor.finished:
+            self.projectiles.clear()  # Nothing lands once the battle is over
+        for projectile in self.projectiles[:]:
+            projectile.advance_to(time_ms / 1000)
+            if projectile.is_finished():
+                self.projectiles.remove(projectile)
+
+    def status_lines(self):
+        replay = self.replay
+        bottom, top = replay.players
+        lines = [f"Round {replay.round_number}: {bottom} vs {top}",
+                 f"{self.time_ms / 1000:.2f}s / {replay.duration / 1000:.2f}s"]
+        if self.cursor.finished:
+            lines[1] += "   Winner: " + ("draw" if replay.winner is None else replay.players[replay.winner])
+        return lines
+
+    def draw(self, surface, status_lines=()):
+        """Draws the current moment, with status lines at the bottom of the surface."""
+        surface.fill(BG_colour)
+        draw_grid(surface, self.cursor.grid(), units=self.cursor.units)
+        draw_projectiles(surface, self.projectiles)
+        draw_status(surface, status_lines)
+
+
+def play_replay(replay, speed=1.0, fps=60):
+    """
+    Plays a recorded battle in a pygame window without re-simulating it.
+
+    Controls: space pauses, up/down (or right/left) double or halve the
+    speed, R or Home restarts, Esc closes.
+
+    Args:
+        replay (Replay): The recording, e.g. Replay.load(path).
+        speed (float): Simulated seconds shown per real second.
+        fps (int): Frames drawn per second.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    bottom, top = replay.players
+    pygame.display.set_caption(f"MergeTacticsBot Replay: {bottom} vs {top}")
+    clock = pygame.time.Clock()
+    scene = ReplayScene(replay)
+    paused = False
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in (pygame.K_UP, pygame.K_RIGHT):
+                    speed *= 2
+                elif event.key in (pygame.K_DOWN, pygame.K_LEFT):
+                    speed /= 2
+                elif event.key in (pygame.K_r, pygame.K_HOME):
+                    scene.seek(0)
+
+        dt = clock.tick(fps) / 1000.0
+        if not paused:
+            scene.seek(scene.time_ms + dt * speed * 1000)
+
+        status = scene.status_lines()
+        status[-1] += f"   x{speed:g}" + ("   (paused)" if paused else "")
+        scene.draw(screen, ["   ".join(status)])
+        pygame.display.flip()
+
+
+# A single board with two status lines, as exported frames and dashboard tiles show it
+BOARD_VIEW_SIZE = (480, 600)
+
+def render_replay(replay, fps=20, speed=1.0, hold=1.0):
+    """
+    Draws a replay offscreen, one frame per `speed / fps` simulated seconds.
+
+    Needs no window: with SDL_VIDEODRIVER=dummy it runs on a machine without
+    a display. The same surface is redrawn for every frame, so copy it if
+    frames are kept.
+
+    Args:
+        replay (Replay): The recording to draw.
+        fps (int): Frames per second of the output.
+        speed (float): Simulated seconds per output second.
+        hold (float): Output seconds to linger on the final board.
+
+    Yields:
+        pygame.Surface: Each frame in turn.
+    """
+    pygame.font.init()
+    surface = pygame.Surface(BOARD_VIEW_SIZE)
+    scene = ReplayScene(replay)
+    frame_ms = 1000 * speed / fps
+    frames = math.ceil(replay.duration / frame_ms) + 1 + round(hold * fps)
+    for i in range(frames):
+        scene.seek(i * frame_ms)
+        scene.draw(surface, scene.status_lines())
+        yield surface
+
+
+if __name__ == '__main__':
+    # python -m merge_sim.visualise REPLAY.mtr [--speed X]
+    speed = float(sys.argv[sys.argv.index("--speed") + 1]) if "--speed" in sys.argv else 1.0
+    play_replay(Replay.load(sys.argv[1]), speed)
@@ -0,0 +1,116 @@
+# --- Standard Libraries ---
+import hashlib
+
+# --- Globals / Shared State ---
+from .constants import BOARD_ROWS, BOARD_COLS
+
+MASK_64 = (1 << 64) - 1
+
+_piece_keys = {}
+
+
+def piece_key(row, col, name, star):
+    """
+    Stable 64-bit Zobrist key for a card at a star level on a cell.
+
+    Keys come from hashing the piece itself, so they are the same in every
+    process, run and Python version, and hashes can be stored or compared
+    across them.
+    """
+    piece = (row, col, name, star)
+    key = _piece_keys.get(piece)
+    if key is None:
+        digest = hashlib.blake2b(repr(piece).encode(), digest_size=8, person=b"merge-zobrist").digest()
+        key = _piece_keys[piece] = int.from_bytes(digest, "little")
+    return key
+
+
+def _top_side(key):
+    # Top-side pieces use their flipped home cell's key rotated by 32 bits. Rotation
+    # distributes over XOR, so a whole top-side board hash is the rotated home hash.
+    return ((key << 32) | (key >> 32)) & MASK_64
+
+
+class BoardHash:
+    """
+    Zobrist hash of a board, updated one piece at a time.
+
+    Each piece is (card name, star, side) on a cell. Placing and removing a
+    piece XORs its key in and out, and a move is a remove plus a place, so
+    every update is O(1). Boards are not folded onto mirror images: rows
+    are offset alternately, so a left-right mirror changes hex distances
+    (and with them ranges and paths), and the only distance-preserving
+    turn of the board, the 180 degree rotation, swaps the two sides.
+
+    A Player's hash is in its own grid's coordinates (all its pieces on the
+    bottom side). combine() turns two of them into the hash of the board
+    combine_grids() builds, with the second player flipped onto the top
+    side, without looking at a single cell. Cells already say which cards
+    are on the field, so the synergy-relevant composition needs no separate
+    term.
+
+    Args:
+        value (int): Hash of the board.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def toggle(self, pos, card, top=False):
+        """XOR a piece in or out: placing and removing are the same operation."""
+        row, col = pos
+        if top:
+            self.value ^= _top_side(piece_key(BOARD_ROWS - 1 - row, BOARD_COLS - 1 - col, card.name, card.star))
+        else:
+            self.value ^= piece_key(row, col, card.name, card.star)
+
+    add = toggle
+    remove = toggle
+
+    def move(self, old_pos, new_pos, card, top=False):
+        if old_pos is not None:
+            self.toggle(old_pos, card, top)
+        self.toggle(new_pos, card, top)
+
+    @property
+    def key(self):
+        """Key of the exact board, for caches."""
+        return self.value
+
+    def copy(self):
+        return BoardHash(self.value)
+
+    @classmethod
+    def combine(cls, bottom, top):
+        """Hash of the combined board, from the bottom and top players' own grid hashes."""
+        return cls(bottom.value ^ _top_side(top.value))
+
+    @classmethod
+    def from_grid(cls, grid, top_player=None, alive_only=False):
+        """
+        Hash built from scratch by scanning a grid.
+
+        Args:
+            grid (list): A Player.grid, or a combined grid.
+            top_player (Player, optional): Owner of the top-side units of a combined grid.
+            alive_only (bool): Skip dead units, as a battle's hash does.
+        """
+        board = cls()
+        for row, cells in enumerate(grid):
+            for col, unit in enumerate(cells):
+                if unit is not None and (unit.alive or not alive_only):
+                    board.toggle((row, col), unit.card, top_player is not None and unit.owner is top_player)
+        return board
+
+    def __eq__(self, other):
+        return isinstance(other, BoardHash) and self.value == other.value
+
+    def __repr__(self):
+        return f"BoardHash({self.value:#018x})"
+
+
+def combined_board_key(bottom_player, top_player):
+    """Key of the board combine_grids(bottom_player, top_player) would build."""
+    return BoardHash.combine(bottom_player.board_hash, top_player.board_hash).key
@@ -0,0 +1,248 @@
+# --- Standard Libraries ---
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # main_sim imports pygame in every worker
+
+# --- Random Streams ---
+from merge_sim.rng import RandomStream
+
+# --- Bots ---
+from merge_sim import bot
+
+# --- Combat Cache ---
+from merge_sim.combat_cache import CombatCache
+
+# --- Game Loop ---
+from main_sim import DEFAULT_LINEUP, create_players, placements, play_round
+
+MAX_ROUNDS = 20         # Same cap as main_sim
+DEFAULT_CHUNK = 16      # Games per worker task
+
+# Every *_bot_logic function in bot.py, by its short name ("greedy", "combo_seeker", ...)
+BOTS = {name[:-len("_bot_logic")]: fn for name, fn in vars(bot).items() if name.endswith("_bot_logic")}
+
+
+def build_lineup(bot_names):
+    """
+    Turns short bot names into a (player name, bot logic) lineup.
+
+    The standard lineup keeps main_sim's player names, so a tournament game
+    with seed N replays exactly with `main_sim.py --headless --seed N`.
+    Repeated bots get a seat suffix so player names stay unique.
+
+    Args:
+        bot_names (list): Short names from BOTS, one per seat.
+
+    Returns:
+        list: (player name, bot logic) per seat.
+    """
+    unknown = [name for name in bot_names if name not in BOTS]
+    if unknown:
+        raise ValueError(f"Unknown bot(s) {unknown}; choose from {sorted(BOTS)}")
+
+    lineup = [(name, BOTS[name]) for name in bot_names]
+    default_bots = [bot_logic for _, bot_logic in DEFAULT_LINEUP]
+    if [bot_logic for _, bot_logic in lineup] == default_bots:
+        return list(DEFAULT_LINEUP)
+    if len(set(bot_names)) < len(bot_names):
+        lineup = [(f"{name}#{seat + 1}", bot_logic) for seat, (name, bot_logic) in enumerate(lineup)]
+    return lineup
+
+
+def bot_name(bot_logic):
+    return bot_logic.__name__[:-len("_bot_logic")]
+
+
+def play_tournament_game(seed, bot_names, max_rounds=MAX_ROUNDS, event_driven=False, combat_cache=None):
+    """
+    Plays one headless game from RandomStream(seed) and ranks the seats.
+
+    Seats still alive at the end rank above eliminated ones, by HP. Eliminated
+    seats rank by how late they went out, then by HP. Equal seats share a
+    placement.
+
+    Args:
+        seed (int): The game's root seed.
+        bot_names (list): Short bot names, one per seat.
+        max_rounds (int): Last round to play.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+        combat_cache (CombatCache, optional): Sample each matchup's outcome from this cache instead of simulating it.
+
+    Returns:
+        dict: {"seed", "rounds", "seats": [{"bot", "player", "placement", "hp", "eliminated_round"}]},
+            plus "cache": {"hits", "misses"} of this game when a cache is given.
+    """
+    rng = RandomStream(seed)
+    players = create_players(rng, build_lineup(bot_names))
+    eliminated_round = {}
+    if combat_cache is not None:
+        hits, misses = combat_cache.hits, combat_cache.misses
+
+    rounds = 0
+    for round_num in range(1, max_rounds + 1):
+        if not play_round(players, round_num, headless=True, event_driven=event_driven, rng=rng,
+                          combat_cache=combat_cache):
+            break
+        rounds = round_num
+        for p in players:
+            if p.hp <= 0 and p not in eliminated_round:
+                eliminated_round[p] = round_num
+
+    placement = placements(players, eliminated_round)
+    seats = []
+    for p in players:
+        seats.append({
+            "bot": bot_name(p.bot_logic),
+            "player": p.name,
+            "placement": placement[p],
+            "hp": p.hp,
+            "eliminated_round": eliminated_round.get(p),
+        })
+    result = {"seed": seed, "rounds": rounds, "seats": seats}
+    if combat_cache is not None:
+        result["cache"] = {"hits": combat_cache.hits - hits, "misses": combat_cache.misses - misses}
+    return result
+
+
+def play_chunk(seeds, bot_names, max_rounds, event_driven, cache_samples=0):
+    """Worker task: play a chunk of games and return their results. The chunk's games share one combat cache."""
+    combat_cache = CombatCache(samples=cache_samples, event_driven=event_driven) if cache_samples else None
+    return [play_tournament_game(seed, bot_names, max_rounds, event_driven, combat_cache) for seed in seeds]
+
+
+class TournamentStats:
+    """Running placement and HP totals per bot."""
+
+    def __init__(self, seats):
+        self.seats = seats
+        self.games = 0
+        self.rounds = 0
+        self.bots = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, result):
+        self.games += 1
+        self.rounds += result["rounds"]
+        if "cache" in result:
+            self.cache_hits += result["cache"]["hits"]
+            self.cache_misses += result["cache"]["misses"]
+        for seat in result["seats"]:
+            stats = self.bots.setdefault(seat["bot"], {
+                "seats_played": 0,
+                "wins": 0,
+                "placement_total": 0,
+                "hp_total": 0,
+                "placements": [0] * self.seats,
+            })
+            stats["seats_played"] += 1
+            stats["wins"] += seat["placement"] == 1
+            stats["placement_total"] += seat["placement"]
+            stats["hp_total"] += seat["hp"]
+            stats["placements"][seat["placement"] - 1] += 1
+
+    def summary(self):
+        """Per-bot means and placement counts, best mean placement first."""
+        rows = {}
+        for name, stats in self.bots.items():
+            played = stats["seats_played"]
+            rows[name] = {
+                "seats_played": played,
+                "win_rate": round(stats["wins"] / played, 4),
+                "mean_placement": round(stats["placement_total"] / played, 3),
+                "mean_hp": round(stats["hp_total"] / played, 3),
+                "placements": stats["placements"],
+            }
+        return dict(sorted(rows.items(), key=lambda item: item[1]["mean_placement"]))
+
+    def format(self):
+        lines = [f"{self.games} games, {self.rounds / max(self.games, 1):.1f} rounds per game",
+                 f"{'bot':<14} {'seats':>6} {'win %':>7} {'mean place':>11} {'mean hp':>8}   placements"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<14} {row['seats_played']:>6} {row['win_rate'] * 100:>6.1f}% "
+                         f"{row['mean_placement']:>11.3f} {row['mean_hp']:>8.2f}   {row['placements']}")
+        lookups = self.cache_hits + self.cache_misses
+        if lookups:
+            lines.append(f"combat cache: {self.cache_hits} hits, {self.cache_misses} misses "
+                         f"({self.cache_hits / lookups:.1%} hit rate)")
+        return "\n".join(lines)
+
+
+def run_tournament(games, bot_names=None, seed=0, workers=None, chunk_size=DEFAULT_CHUNK,
+                   max_rounds=MAX_ROUNDS, event_driven=False, cache_samples=0, progress=True):
+    """
+    Plays `games` independent games over a process pool and aggregates them per bot.
+
+    Game i uses seed + i, so any single game can be replayed on its own.
+    Games go to the workers in chunks of chunk_size, and results are
+    aggregated as each chunk finishes, in whatever order that is; the totals
+    do not depend on it.
+
+    Args:
+        games (int): Number of games to play.
+        bot_names (list, optional): Short bot names per seat; the standard lineup if None.
+        seed (int): Seed of the first game.
+        workers (int, optional): Worker processes; os.cpu_count() if None, in-process if 1.
+        chunk_size (int): Games per worker task.
+        max_rounds (int): Last round of each game.
+        event_driven (bool): Step combat on scheduled events instead of every tick.
+        cache_samples (int): If set, settle matchups from a combat cache (one per chunk) of this many
+            simulated battles per board instead of simulating each one.
+        progress (bool): Print a line to stderr as each chunk finishes.
+
+    Returns:
+        TournamentStats: The aggregated results.
+    """
+    if bot_names is None:
+        bot_names = [bot_name(bot_logic) for _, bot_logic in DEFAULT_LINEUP]
+    build_lineup(bot_names)  # Fail on unknown bots before starting any workers
+
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(seed, seed + games))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    stats = TournamentStats(len(bot_names))
+    start = time.perf_counter()
+
+    def collect(results):
+        for result in results:
+            stats.add(result)
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(f"  {stats.games}/{games} games ({stats.games / elapsed:.1f}/s)", file=sys.stderr)
+
+    if workers == 1:
+        for chunk in chunks:
+            collect(play_chunk(chunk, bot_names, max_rounds, event_driven, cache_samples))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, chunk, bot_names, max_rounds, event_driven, cache_samples)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            collect(future.result())
+    return stats
+
+
+if __name__ == '__main__':
+    # --- OPTIONS ---
+    games = int(sys.argv[sys.argv.index("--games") + 1]) if "--games" in sys.argv else 100
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    chunk_size = int(sys.argv[sys.argv.index("--chunk") + 1]) if "--chunk" in sys.argv else DEFAULT_CHUNK
+    bot_names = sys.argv[sys.argv.index("--bots") + 1].split(",") if "--bots" in sys.argv else None
+    event_driven = "--events" in sys.argv  # Step combat on scheduled events instead of every tick
+    json_path = sys.argv[sys.argv.index("--json") + 1] if "--json" in sys.argv else None
+    # Sample matchups from a combat cache of this many simulated battles per board
+    cache_samples = int(sys.argv[sys.argv.index("--cache") + 1]) if "--cache" in sys.argv else 0
+
+    stats = run_tournament(games, bot_names, seed, workers, chunk_size, event_driven=event_driven,
+                           cache_samples=cache_samples)
+    print(stats.format())
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"games": stats.games, "seed": seed, "bots": stats.summary()}, f, indent=2)